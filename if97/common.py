@@ -0,0 +1,200 @@
+import math
+import numpy
+from collections import OrderedDict
+
+###########################################################
+#####             Array Handling Functions            #####
+###########################################################
+
+#### input conversion ####
+def asarray(x):
+    """ Float array of the given sequence; scalars are
+    returned unchanged so they keep the plain python path"""
+    if isinstance(x, (int, float)):
+        return x
+
+    return numpy.asarray(x, dtype=float)
+
+#### elementary functions ####
+def log(x):
+    """ Natural logarithm of scalars or arrays"""
+    if isinstance(x, (int, float)):
+        return math.log(x)
+
+    return numpy.log(x)
+def exp(x):
+    """ Exponential of scalars or arrays"""
+    if isinstance(x, (int, float)):
+        return math.exp(x)
+
+    return numpy.exp(x)
+def clip(x, lower, upper):
+    """ Limits scalars or arrays to the interval [lower, upper]"""
+    if isinstance(x, (int, float)):
+        return min(max(x, lower), upper)
+
+    return numpy.clip(x, lower, upper)
+
+#### input inspection ####
+def isarray(*args):
+    """ True if any of the (converted) inputs is an array"""
+    for x in args:
+        if isinstance(x, numpy.ndarray):
+            return True
+
+    return False
+
+###########################################################
+#####                 Caching Functions               #####
+###########################################################
+
+#### bounded caches ####
+class Cache(object):
+    """ Bounded least recently used cache of computed values, with
+    hit, miss and eviction counters"""
+    def __init__(self, maxsize = 1024):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = self.misses = self.evictions = 0
+
+    def lookup(self, key, compute):
+        """ Cached value of key, or compute(key) stored on a miss;
+        a cache of maxsize 0 stores nothing"""
+        try:
+            value = self.entries.pop(key)
+            self.hits += 1
+        except KeyError:
+            value = compute(key)
+            self.misses += 1
+            if self.maxsize <= 0:
+                return value
+            while len(self.entries) >= self.maxsize:
+                self.entries.popitem(last = False)
+                self.evictions += 1
+        self.entries[key] = value
+        return value
+    def clear(self):
+        """ Drops every entry and resets the counters"""
+        self.entries.clear()
+        self.hits = self.misses = self.evictions = 0
+    def info(self):
+        """ Counters and size of the cache"""
+        return {'hits': self.hits, 'misses': self.misses, 'evictions': self.evictions,
+                'size': len(self.entries), 'maxsize': self.maxsize}
+
+#### cache keys ####
+def quantize(x, rtol):
+    """ Representative of x on a logarithmic grid of relative spacing
+    rtol; x itself when rtol is 0 or x is zero or not finite"""
+    if rtol == 0 or x == 0 or not math.isfinite(x):
+        return x
+
+    step = math.log1p(rtol)
+    return math.copysign(math.exp(round(math.log(abs(x)) / step) * step), x)
+
+###########################################################
+#####             Term Evaluation Functions           #####
+###########################################################
+
+# arrays larger than this are evaluated block by block, which keeps
+# the powers of each block small (and in cache)
+BLOCK = 4096
+
+#### power ladders ####
+def ladder(exponents):
+    """ Plan for building the distinct powers in exponents by repeated
+    multiplication, walking outward from x**0 = 1; returns the step
+    powers needed and an (exponent, previous, step) rung per power"""
+    steps, rungs = set(), []
+    for sign in (1, -1):
+        previous = 0
+        for e in sorted(set(e for e in exponents if e * sign > 0), key = abs):
+            steps.add(e - previous)
+            rungs.append((e, previous, e - previous))
+            previous = e
+
+    return sorted(steps), rungs
+def power(x, e):
+    """ Variable name of x**e in the generated evaluators"""
+    return x + ('m' if e < 0 else 'p') + repr(abs(e)).replace('.', '_')
+
+#### term evaluators ####
+def evaluator(I, J, n, order = 2):
+    """ Compiled evaluator for the sum S of n * x**I * y**J; with
+    order = 2 it returns S, S_x, S_xx, S_y, S_yy, S_xy, the sum and
+    its first and second derivatives w.r.t. x and y.
+
+    The evaluator is straight-line code generated once at import: the
+    powers are built by ladders of multiplications, the terms are
+    grouped on I and the coefficient products are literals. The same
+    code serves python scalars and arrays."""
+    I = [int(Ii) if Ii == int(Ii) else Ii for Ii in I]
+    used = {'x': set([0]), 'y': set([0])}
+
+    def term(coefficient, x, e, *factors):
+        factors = ([] if coefficient is None else [repr(coefficient)]) + \
+                  ([] if e == 0 else [power(x, e)]) + list(factors)
+        used[x].add(e)
+        return ' * '.join(factors) or '1.0'
+    def combine(parts):
+        return ' + '.join(parts) or '0.0'
+
+    # sums over the terms of each group (on I), then over the groups
+    groups, lines = {}, []
+    for Ii, Ji, ni in zip(I, J, n):
+        groups.setdefault(Ii, []).append((Ji, ni))
+
+    sums = dict((name, []) for name in ['S', 'S_x', 'S_xx', 'S_y', 'S_yy', 'S_xy'])
+    for k, (Ii, terms) in enumerate(sorted(groups.items())):
+        lines.append('B%d = %s' % (k, combine([term(ni, 'y', Ji) for Ji, ni in terms])))
+        sums['S'].append(term(None, 'x', Ii, 'B%d' % k))
+        if order:
+            lines.append('B%d_y = %s' % (k, combine([term(ni * Ji, 'y', Ji - 1) for Ji, ni in terms if Ji])))
+            lines.append('B%d_yy = %s' % (k, combine([term(ni * Ji * (Ji - 1), 'y', Ji - 2) for Ji, ni in terms if Ji * (Ji - 1)])))
+            sums['S_y'].append(term(None, 'x', Ii, 'B%d_y' % k))
+            sums['S_yy'].append(term(None, 'x', Ii, 'B%d_yy' % k))
+            if Ii:
+                sums['S_x'].append(term(Ii, 'x', Ii - 1, 'B%d' % k))
+                sums['S_xy'].append(term(Ii, 'x', Ii - 1, 'B%d_y' % k))
+            if Ii * (Ii - 1):
+                sums['S_xx'].append(term(Ii * (Ii - 1), 'x', Ii - 2, 'B%d' % k))
+
+    results = ['S', 'S_x', 'S_xx', 'S_y', 'S_yy', 'S_xy'] if order else ['S']
+    lines += ['%s = %s' % (name, combine(sums[name])) for name in results]
+    lines += ['return ' + ', '.join(results)]
+
+    # ladders for the powers referenced above; a rung starting from
+    # x**0 is a step power itself, other steps are taken once
+    for x in ['y', 'x']:
+        steps, rungs = ladder(used[x])
+        shared = set(k for e, previous, k in rungs if previous != 0 and k != 1)
+        header = ['%s = %s**%r' % (power(x + 's', k), x, k) for k in steps if k in shared]
+        for e, previous, k in rungs:
+            step = x if k == 1 else power(x + 's', k) if k in shared else '%s**%r' % (x, k)
+            header.append('%s = %s' % (power(x, e), step if previous == 0 else power(x, previous) + ' * ' + step))
+        lines = header + lines
+    source = 'def evaluate(x, y):\n' + ''.join('    ' + line + '\n' for line in lines)
+
+    namespace = {}
+    exec(compile(source, '<if97 evaluator>', 'exec'), namespace)
+    kernel = namespace['evaluate']
+
+    def evaluate(x, y):
+        if isarray(x, y) and numpy.broadcast(x, y).size > BLOCK:
+            return blockwise(kernel, x, y)
+        return kernel(x, y)
+    evaluate.source = source
+    return evaluate
+def blockwise(kernel, x, y):
+    """ Evaluates arrays one block of BLOCK states at a time"""
+    x, y = numpy.broadcast_arrays(x, y)
+    shape = x.shape
+    x, y = x.ravel(), y.ravel()
+
+    # sums without terms come back as constants and are spread over the block
+    parts = [kernel(x[i:i + BLOCK], y[i:i + BLOCK]) for i in range(0, x.size, BLOCK)]
+    blocks = [x[i:i + BLOCK].shape for i in range(0, x.size, BLOCK)]
+    if isinstance(parts[0], tuple):
+        return tuple(numpy.concatenate([numpy.broadcast_to(p, b) for p, b in zip(part, blocks)]).reshape(shape)
+                     for part in zip(*parts))
+    return numpy.concatenate([numpy.broadcast_to(p, b) for p, b in zip(parts, blocks)]).reshape(shape)
@@ -1,22 +1,387 @@
-from if97 import region1, region2, region3, region4
+import bisect
+import contextlib
+import functools
+import math
+import numpy
+import threading
+from if97 import region1, region2, region3, region4, region5
+from if97.common import Cache, asarray, clip, isarray, quantize
+
+###########################################################
+#####                  Region Dispatch                #####
+###########################################################
+def _classify(X, Y, region, idRegion):
+    """ Broadcasts array inputs against each other and against their
+    region, which is identified in one pass when not given"""
+    X, Y = numpy.broadcast_arrays(X, Y)
+    if not isarray(region) and region == 0:
+        region = idRegion(X, Y)
+
+    return X, Y, numpy.broadcast_to(region, X.shape)
+def _dispatch(X, Y, region, idRegion, funcs):
+    """ Evaluates the region function (funcs, keyed on region) of each
+    state, NaN outside the given regions; array inputs are identified
+    in one pass and every region's function runs once on its own
+    subset, with the results scattered back in input order"""
+    X, Y = asarray(X), asarray(Y)
+
+    if not isarray(X, Y, region):
+        if region == 0:
+            region = idRegion(X, Y)
+
+        if region in funcs:
+            return funcs[region](X, Y)
+        return float('nan')
+
+    X, Y, region = _classify(X, Y, region, idRegion)
+
+    result = numpy.full(X.shape, numpy.nan)
+    for key, func in funcs.items():
+        mask = region == key
+        if mask.any():
+            result[mask] = func(X[mask], Y[mask])
+    return result
+def _dispatch_state(X, Y, region, idRegion, funcs):
+    """ Builds the State of each point from its region's properties
+    function (funcs, keyed on region); array inputs are split and
+    gathered as in _dispatch, one array per property"""
+    X, Y = asarray(X), asarray(Y)
+
+    if not isarray(X, Y, region):
+        if region == 0:
+            region = idRegion(X, Y)
+
+        if region in funcs:
+            return State(region = region, **funcs[region](X, Y))
+        return State(region = region)
+
+    X, Y, region = _classify(X, Y, region, idRegion)
+
+    props = dict((name, numpy.full(X.shape, numpy.nan)) for name in State.__slots__[1:])
+    for key, func in funcs.items():
+        mask = region == key
+        if mask.any():
+            for name, value in func(X[mask], Y[mask]).items():
+                props[name][mask] = value
+    return State(region = numpy.array(region), **props)
+def _dispatch_dict(X, Y, region, idRegion, funcs):
+    """ Evaluates the dict valued region function (funcs, keyed on
+    region) of each state; array inputs are split and gathered as in
+    _dispatch, one array per key with NaN outside the given regions"""
+    X, Y = asarray(X), asarray(Y)
+
+    if not isarray(X, Y, region):
+        if region == 0:
+            region = idRegion(X, Y)
+
+        if region in funcs:
+            return funcs[region](X, Y)
+        return {}
+
+    X, Y, region = _classify(X, Y, region, idRegion)
+
+    values = {}
+    for key, func in funcs.items():
+        mask = region == key
+        if mask.any():
+            for name, value in func(X[mask], Y[mask]).items():
+                if name not in values:
+                    values[name] = numpy.full(X.shape, numpy.nan)
+                values[name][mask] = value
+    return values
+def _batch(prop, X, Y, idRegion):
+    """ Evaluates the water property function prop of every state
+    without raising; returns the values and the region of each state,
+    with unsupported or out of range states NaN and region 0"""
+    X, Y = numpy.broadcast_arrays(asarray(X), asarray(Y))
+    region = idRegion(X, Y, strict = False)
+    values = prop(X, Y, region = region)
+
+    if isinstance(values, State):
+        return values, region[()]
+    return numpy.where(region == 0, numpy.nan, values)[()], region[()]
+
+def _resolve(X, Y, region, idRegion, valid, strict):
+    """ Region of each state from the region hints (0 for none); hints
+    are kept where valid confirms them, which only evaluates the hinted
+    region's boundaries, and the other states are identified"""
+    X, Y = asarray(X), asarray(Y)
+
+    if not isarray(X, Y, region):
+        if region != 0 and valid(X, Y, region):
+            return region
+        return idRegion(X, Y, strict)
+
+    X, Y = numpy.broadcast_arrays(X, Y)
+    region = numpy.array(numpy.broadcast_to(region, X.shape), dtype = int)
+    wrong = region == 0
+    for key in numpy.unique(region[~wrong]):
+        mask = region == key
+        wrong[mask] = ~valid(X[mask], Y[mask], key)
+    if wrong.any():
+        region[wrong] = idRegion(X[wrong], Y[wrong], strict)
+    return region[()]
+def _hinted(prop, X, Y, region, resolve):
+    """ Evaluates the water property function prop with the regions
+    resolved from the hints; returns the values and the region of
+    each state"""
+    region = resolve(X, Y, region)
+
+    return prop(X, Y, region = region), region
+def _sweep(prop, X, Y, idRegion, cuts):
+    """ Evaluates the water property function prop along a sweep, where
+    one of X, Y is fixed and the other monotone; the region boundaries
+    are located once on the swept array by cuts(fixed, ascending, axis)
+    and one state per contiguous piece is identified. Other inputs, or
+    sweeps cuts doesn't handle (None), are identified point by point.
+    Returns the values and the region of each state"""
+    X, Y = asarray(X), asarray(Y)
+    Xb, Yb = numpy.broadcast_arrays(X, Y)
+    region = None
+
+    if Xb.ndim == 1 and Xb.size > 1:
+        for axis, fixed, swept in [(1, Xb, Yb), (0, Yb, Xb)]:
+            step = numpy.diff(swept)
+            if (fixed == fixed[0]).all() and ((step >= 0).all() or (step <= 0).all()):
+                order = slice(None) if swept[-1] >= swept[0] else slice(None, None, -1)
+                points = cuts(float(fixed[0]), swept[order], axis)
+                if points is not None:
+                    region = numpy.empty(Xb.shape, dtype = int)
+                    Xs, Ys, rs = Xb[order], Yb[order], region[order]
+                    bounds = sorted(set([0, Xb.size] + [int(i) for i in points]))
+                    for a, b in zip(bounds[:-1], bounds[1:]):
+                        rs[a:b] = idRegion(float(Xs[a]), float(Ys[a]))
+                break
+
+    # the unbroadcast inputs keep the scalar paths of a fixed variable
+    if region is None:
+        region = idRegion(X, Y)
+    return prop(X, Y, region = region), region
+def _bisect(a, inside):
+    """ Number of leading entries of the ascending array a for which
+    the monotone (true, then false) predicate inside holds"""
+    lo, hi = 0, a.size
+    while lo < hi:
+        mid = (lo + hi) // 2
+        if inside(float(a[mid])):
+            lo = mid + 1
+        else:
+            hi = mid
+    return lo
+def _searched(a, bnd):
+    """ Positions in the ascending array a of the boundary values bnd,
+    from either side, so that every comparison with them is resolved"""
+    return numpy.concatenate([numpy.searchsorted(a, bnd, side = 'left'), numpy.searchsorted(a, bnd, side = 'right')])
+
+#### full state ####
+class State(object):
+    """ Every property of a state (region, P, T, quality x, g, v, u, s,
+    h, cp, cv, w, a, k); for array input each property is an array.
+    The quality is only defined in region 4 and NaN elsewhere"""
+    __slots__ = ('region', 'P', 'T', 'x', 'g', 'v', 'u', 's', 'h', 'cp', 'cv', 'w', 'a', 'k')
+
+    def __init__(self, **props):
+        for name in self.__slots__:
+            setattr(self, name, props.get(name, numpy.nan))
+    def __repr__(self):
+        return 'State(' + ', '.join(name + '=' + repr(getattr(self, name)) for name in self.__slots__) + ')'
+
+###########################################################
+#####                 Region Boundaries               #####
+###########################################################
+
+#### constant boundaries ####
+_constants = {}
+def boundary_constants():
+    """ Pressure independent boundaries of the region identification;
+    the table is built on first use and shared by every idRegion"""
+    if not _constants:
+        Pbnd4 = satP(region1.Tbnd01)
+        Pbndh1 = satP(region1.Tbnd13)
+        _constants.update({'Pbnd0':  region1.Pbnd0,
+                           'Pbnd1':  region1.Pbnd1,
+                           'Tbnd01': region1.Tbnd01,
+                           'Tbnd13': region1.Tbnd13,
+                           'Tbnd25': region2.Tbnd25,
+                           'Tbnd5':  region5.Tbnd5,
+                           'Pbnd5':  region5.Pbnd5,
+                           'Pbnd4':  Pbnd4,
+                           'Pbndh1': Pbndh1,
+                           'hbnd3f': region1.h(Pbndh1, region1.Tbnd13),
+                           'hbnd3g': region2.h(Pbndh1, region1.Tbnd13),
+                           'sbnd3f': region1.s(Pbndh1, region1.Tbnd13),
+                           'sbnd3g': region2.s(Pbndh1, region1.Tbnd13),
+                           'hbnd01': region1.h(Pbnd4, region1.Tbnd01),
+                           'hbnd25': region2.h(region1.Pbnd0, region2.Tbnd25),
+                           'hbnd5':  region5.h(region1.Pbnd0, region5.Tbnd5)})
+
+    return _constants
+
+#### pressure dependent boundaries ####
+# boundaries of the (P, h) and (P, s) identification that only depend
+# on pressure; they are interpolated from a table in log(P) and only
+# computed exactly for states within the table's tolerance of one,
+# which are kept per pressure for scalar input
+boundary_cache_h = Cache()
+boundary_cache_s = Cache()
+NBND = 2048
+_tables = {}
+def _boundary_table(compute):
+    """ Nodes in log(P), boundary values and tolerance of the piecewise
+    linear (monotone) interpolation of the boundaries compute(P); the
+    table is built on first use"""
+    if compute not in _tables:
+        bnd = boundary_constants()
+        logP = numpy.linspace(math.log(bnd['Pbnd0']), math.log(bnd['Pbnd1']), NBND)
+        mid = (logP[1:] + logP[:-1]) / 2
+        nodes, exact = compute(numpy.exp(logP)), compute(numpy.exp(mid))
+
+        # the largest error at the midpoints, with a margin, bounds the
+        # interpolation error of each boundary
+        tol = [4 * numpy.nanmax(abs(e - numpy.interp(mid, logP, y))) + 1e-9 * numpy.nanmax(abs(y))
+               for y, e in zip(nodes, exact)]
+
+        # scalars interpolate from python lists
+        _tables[compute] = (logP, nodes, tol, logP.tolist(), [y.tolist() for y in nodes])
+
+    return _tables[compute]
+def _boundaries(P, Y, compute, cache):
+    """ Boundaries compute(P) for classifying Y; interpolated unless Y
+    is within the tolerance of a boundary, where they are exact (from
+    the cache for scalars, once per distinct pressure for arrays)"""
+    logP, nodes, tol, xs, ys = _boundary_table(compute)
+
+    if not isarray(P, Y):
+        if P in cache.entries or not P > 0:
+            return cache.lookup(P, compute)
+
+        x = math.log(P)
+        i = min(max(bisect.bisect(xs, x), 1), NBND - 1)
+        w = min(max((x - xs[i - 1]) / (xs[i] - xs[i - 1]), 0.0), 1.0)
+        bnd = [y[i - 1] + w * (y[i] - y[i - 1]) for y in ys]
+        if any(abs(Y - b) <= t for b, t in zip(bnd, tol)):
+            return cache.lookup(P, compute)
+        return bnd
+
+    P, Y = numpy.broadcast_arrays(P, Y)
+    with numpy.errstate(invalid = 'ignore', divide = 'ignore'):
+        bnd = [numpy.interp(numpy.log(P), logP, y) for y in nodes]
+
+    near = numpy.zeros(P.shape, dtype = bool)
+    for b, t in zip(bnd, tol):
+        near |= abs(Y - b) <= t
+    if near.any():
+        distinct, inverse = numpy.unique(P[near], return_inverse = True)
+        for b, e in zip(bnd, compute(distinct)):
+            b[near] = e[inverse.ravel()]
+    return bnd
+def _boundary(P, Y, compute, cache, *ks):
+    """ Boundaries ks (indices into compute(P)) for classifying the
+    scalar Y, as in _boundaries but only interpolating those"""
+    logP, nodes, tol, xs, ys = _boundary_table(compute)
+
+    if P in cache.entries or not P > 0:
+        bnd = cache.lookup(P, compute)
+        return [bnd[k] for k in ks]
+
+    x = math.log(P)
+    i = min(max(bisect.bisect(xs, x), 1), NBND - 1)
+    w = min(max((x - xs[i - 1]) / (xs[i] - xs[i - 1]), 0.0), 1.0)
+    bnd = [ys[k][i - 1] + w * (ys[k][i] - ys[k][i - 1]) for k in ks]
+    if any(abs(Y - b) <= tol[k] for b, k in zip(bnd, ks)):
+        bnd = cache.lookup(P, compute)
+        return [bnd[k] for k in ks]
+    return bnd
+def _boundaries_h(P):
+    """ Enthalpy along T = 623.15 K (13), B23 (32), the saturated
+    liquid (14) and vapor (42) lines, T = 1073.15 K (25) and
+    T = 2273.15 K (5)"""
+    Tbnd32 = region3.bnd23T(clip(P, 16.5292, 100.0))
+    # saturation lines are only used below Pbndh1, region 5 below Pbnd5
+    Pbnd4  = clip(P, 0.0, boundary_constants()['Pbndh1'])
+    Tbnd4  = satT(Pbnd4)
+    Pbnd5  = clip(P, 0.0, region5.Pbnd5)
+
+    return region1.h(P, region1.Tbnd13), region2.h(P, Tbnd32), region1.h(Pbnd4, Tbnd4), region2.h(Pbnd4, Tbnd4), \
+           region2.h(P, region2.Tbnd25), region5.h(Pbnd5, region5.Tbnd5)
+def _boundaries_s(P):
+    """ Entropy along T = 273.16 K (01), T = 1073.15 K (25), T = 623.15 K
+    (13), B23 (32), the saturated liquid (14) and vapor (42) lines and
+    T = 2273.15 K (5)"""
+    Tbnd32 = region3.bnd23T(clip(P, 16.5292, 100.0))
+    # saturation lines are only used below Pbndh1, region 5 below Pbnd5
+    Pbnd4  = clip(P, 0.0, boundary_constants()['Pbndh1'])
+    Tbnd4  = satT(Pbnd4)
+    Pbnd5  = clip(P, 0.0, region5.Pbnd5)
+
+    return region1.s(P, region1.Tbnd01), region2.s(P, region2.Tbnd25), \
+           region1.s(P, region1.Tbnd13), region2.s(P, Tbnd32), region1.s(Pbnd4, Tbnd4), region2.s(Pbnd4, Tbnd4), \
+           region5.s(Pbnd5, region5.Tbnd5)
+
+#### region 3 two-phase dome ####
+def _region3(P, Y, name):
+    """ Region of the states (P, Y) between regions 1 and 2 above
+    Pbndh1, where Y is the property name (h or s): 3, or 4 within the
+    two-phase dome, between the saturated liquid and vapor of region 4
+    below the critical pressure"""
+    bnd = boundary_constants()
+    Yf, Yg = bnd[name + 'bnd3f'], bnd[name + 'bnd3g']
+
+    if isarray(P, Y):
+        P, Y = numpy.broadcast_arrays(P, Y)
+        region = numpy.full(P.shape, 3)
+        dome = (Y > Yf) & (Y < Yg) & (P < region3.Ps)
+        if dome.any():
+            distinct, inverse = numpy.unique(P[dome], return_inverse = True)
+            sat = region4.saturation(distinct)
+            Yd = Y[dome]
+            region[dome] = numpy.where((Yd > sat[name + 'f'][inverse.ravel()]) & (Yd < sat[name + 'g'][inverse.ravel()]), 4, 3)
+        return region
+
+    if not (Yf < Y < Yg) or not (P < region3.Ps):
+        return 3
+    sat = region4.saturation(P)
+    return 4 if sat[name + 'f'] < Y < sat[name + 'g'] else 3
+def _dome(X, a, name):
+    """ Positions in the ascending sweep a of the property name (h or s)
+    where the isobar X enters or leaves the two-phase dome of region 3"""
+    if not boundary_constants()['Pbndh1'] <= X < region3.Ps:
+        return numpy.empty(0, dtype = int)
+
+    return numpy.flatnonzero(numpy.diff(_region3(X, a, name))) + 1
 
 ###########################################################
 #####          Pressure-Temperature Formulation       #####
 ###########################################################
-def idRegion(P, T):
+def idRegion(P, T, strict = True):
     """Identification of region from IF97 specification
-    using pressure and temperature as primary varibles"""
+    using pressure and temperature as primary varibles;
+    unsupported states are region 0 unless strict"""
+    P, T = asarray(P), asarray(T)
 
     # Constant boundaries
-    Pbnd0  = region1.Pbnd0
-    Pbnd1  = region1.Pbnd1
-    Tbnd01 = region1.Tbnd01
-    Tbnd25 = region2.Tbnd25
-    Tbnd13 = region1.Tbnd13
+    bnd    = boundary_constants()
+    Pbnd0  = bnd['Pbnd0']
+    Pbnd1  = bnd['Pbnd1']
+    Tbnd01 = bnd['Tbnd01']
+    Tbnd25 = bnd['Tbnd25']
+    Tbnd13 = bnd['Tbnd13']
+    Tbnd5  = bnd['Tbnd5']
+    Pbnd5  = bnd['Pbnd5']
 
     # non-constant boundaries
-    Pbnd32 = region3.bnd23P(min(max(T, Tbnd13), 863.15))
-    Pbnd4  = satP(min(max(T, Tbnd01), Tbnd13))
+    Pbnd32 = region3.bnd23P(clip(T, Tbnd13, 863.15))
+    Pbnd4  = satP(clip(T, Tbnd01, Tbnd13))
+
+    # array inputs are classified in one pass
+    if isarray(P, T):
+        valid = (P >= Pbnd0) & (T >= Tbnd01) & (P <= Pbnd1) & (T <= Tbnd25)
+        five  = (P >= Pbnd0) & (T > Tbnd25) & (P <= Pbnd5) & (T <= Tbnd5)
+        region = numpy.select([valid & (T <= Tbnd13) & (P >= Pbnd4),
+                               valid & ((T < Tbnd13) | (P <= Pbnd32)),
+                               valid, five], [1, 2, 3, 5], 0)
+        assert region.all() or not strict, "Water properties not avalable!"
+        return region
 
     region = 0
 
@@ -26,271 +391,225 @@ def idRegion(P, T):
         elif (T < Tbnd13) or (P <= Pbnd32):
             region = 2
         else:
-            # region 3 via P,T relations not implemented
-            region = 0
-    assert (region is not 0), "Water properties not avalable!"
+            region = 3
+    elif (P >= Pbnd0) and (T > Tbnd25) and (P <= Pbnd5) and (T <= Tbnd5):
+        region = 5
+    assert (region != 0) or not strict, "Water properties not avalable!"
     return region
+def _valid(P, T, region):
+    """ True where region is the region of (P, T); scalars only evaluate
+    the boundaries of that region"""
+    bnd    = boundary_constants()
+    Tbnd01 = bnd['Tbnd01']
+    Tbnd13 = bnd['Tbnd13']
+
+    if isarray(P, T):
+        if region == 5:
+            return (P >= bnd['Pbnd0']) & (T > bnd['Tbnd25']) & (P <= bnd['Pbnd5']) & (T <= bnd['Tbnd5'])
+        inside = (P >= bnd['Pbnd0']) & (T >= Tbnd01) & (P <= bnd['Pbnd1']) & (T <= bnd['Tbnd25'])
+        Pbnd4  = satP(clip(T, Tbnd01, Tbnd13))
+        Pbnd32 = region3.bnd23P(clip(T, Tbnd13, 863.15))
+        if region == 1:
+            return inside & (T <= Tbnd13) & (P >= Pbnd4)
+        if region == 2:
+            return inside & ((T < Tbnd13) | (P <= Pbnd32)) & ((T > Tbnd13) | (P < Pbnd4))
+        if region == 3:
+            return inside & (T >= Tbnd13) & (P > Pbnd32) & ((T > Tbnd13) | (P < Pbnd4))
+        return inside & False
+
+    if region == 5:
+        return (bnd['Pbnd0'] <= P <= bnd['Pbnd5']) and (bnd['Tbnd25'] < T <= bnd['Tbnd5'])
+    if not ((bnd['Pbnd0'] <= P <= bnd['Pbnd1']) and (Tbnd01 <= T <= bnd['Tbnd25'])):
+        return False
+    if region == 1:
+        return (T <= Tbnd13) and (P >= satP(T))
+    if region == 2:
+        return ((T < Tbnd13) or (P <= region3.bnd23P(min(T, 863.15)))) and ((T > Tbnd13) or (P < satP(T)))
+    if region == 3:
+        return (T >= Tbnd13) and (P > region3.bnd23P(min(T, 863.15))) and ((T > Tbnd13) or (P < satP(T)))
+    return False
+
+def _cuts(X, a, axis):
+    """ Positions in the ascending sweep a where the region of (P, T)
+    may change, for an isobar (axis 1, a = T) or isotherm (axis 0, a = P)"""
+    bnd    = boundary_constants()
+    Tbnd01 = bnd['Tbnd01']
+    Tbnd13 = bnd['Tbnd13']
+
+    if axis == 0:
+        bnd = [bnd['Pbnd0'], bnd['Pbnd1'], bnd['Pbnd5'], satP(clip(X, Tbnd01, Tbnd13)), region3.bnd23P(clip(X, Tbnd13, 863.15))]
+        return _searched(a, bnd)
+
+    # saturation and B23 pressures both rise with temperature
+    return list(_searched(a, [Tbnd01, Tbnd13, bnd['Tbnd25'], bnd['Tbnd5']])) + \
+           [_bisect(a, lambda T: X >= satP(clip(T, Tbnd01, Tbnd13))),
+            _bisect(a, lambda T: X > region3.bnd23P(clip(T, Tbnd13, 863.15)))]
 
 #### water properties ####
 def g(P, T, region = 0):
     """Specific gibbs free energy [kJ / kg K]"""
-    if region is 0:
-        region = idRegion(P, T)
-
-    if region is 1:
-        return region1.g(P, T)
-    elif region is 2:
-        return region2.g(P, T)
-    else:
-        return 0.000
+
+    return _dispatch(P, T, region, idRegion, {1: region1.g, 2: region2.g, 3: region3.g_T, 5: region5.g})
 def v(P, T, region = 0):
     """Specific volume [m^3 / kg]"""
-    if region is 0:
-        region = idRegion(P, T)
-
-    if region is 1:
-        return region1.v(P, T)
-    elif region is 2:
-        return region2.v(P, T)
-    else:
-        return 0.000
+
+    return _dispatch(P, T, region, idRegion, {1: region1.v, 2: region2.v, 3: region3.v_T, 5: region5.v})
 def u(P, T, region = 0):
     """Specific internal energy [kJ / kg]"""
-    if region is 0:
-        region = idRegion(P, T)
-
-    if region is 1:
-        return region1.u(P, T)
-    elif region is 2:
-        return region2.u(P, T)
-    else:
-        return 0.000
+
+    return _dispatch(P, T, region, idRegion, {1: region1.u, 2: region2.u, 3: region3.u_T, 5: region5.u})
 def s(P, T, region = 0):
     """Specific entropy [kJ / kg K]"""
-    if region is 0:
-        region = idRegion(P, T)
-
-    if region is 1:
-        return region1.s(P, T)
-    elif region is 2:
-        return region2.s(P, T)
-    else:
-        return 0.000
+
+    return _dispatch(P, T, region, idRegion, {1: region1.s, 2: region2.s, 3: region3.s_T, 5: region5.s})
 def h(P, T, region = 0):
     """Specific enthalpy [kJ / kg]"""
-    if region is 0:
-        region = idRegion(P, T)
-
-    if region is 1:
-        return region1.h(P, T)
-    elif region is 2:
-        return region2.h(P, T)
-    else:
-        return 0.000
+
+    return _dispatch(P, T, region, idRegion, {1: region1.h, 2: region2.h, 3: region3.h_T, 5: region5.h})
 def cp(P, T, region = 0):
     """ Specific isobaric heat capacity [kJ / kg K]"""
-    if region is 0:
-        region = idRegion(P, T)
-
-    if region is 1:
-        return region1.cp(P, T)
-    elif region is 2:
-        return region2.cp(P, T)
-    else:
-        return 0.000
+
+    return _dispatch(P, T, region, idRegion, {1: region1.cp, 2: region2.cp, 3: region3.cp_T, 5: region5.cp})
 def cv(P, T, region = 0):
     """ Specific isochoric heat capacity [kJ / kg K]"""
-    if region is 0:
-        region = idRegion(P, T)
-
-    if region is 1:
-        return region1.cv(P, T)
-    elif region is 2:
-        return region2.cv(P, T)
-    else:
-        return 0.000
+
+    return _dispatch(P, T, region, idRegion, {1: region1.cv, 2: region2.cv, 3: region3.cv_T, 5: region5.cv})
 def w(P, T, region = 0):
     """ Speed of sound [m / s]"""
-    if region is 0:
-        region = idRegion(P, T)
-
-    if region is 1:
-        return region1.w(P, T)
-    elif region is 2:
-        return region2.w(P, T)
-    else:
-        return 0.000
+
+    return _dispatch(P, T, region, idRegion, {1: region1.w, 2: region2.w, 3: region3.w_T, 5: region5.w})
 def a(P, T, region = 0):
     """Isobaric cubic expansion coefficient [1 / K]"""
-    if region is 0:
-        region = idRegion(P, T)
-
-    if region is 1:
-        return region1.a(P, T)
-    elif region is 2:
-        return region2.a(P, T)
-    else:
-        return 0.000
+
+    return _dispatch(P, T, region, idRegion, {1: region1.a, 2: region2.a, 3: region3.a_T, 5: region5.a})
 def k(P, T, region = 0):
     """Isothermal compressibility [kg / kJ]"""
-    if region is 0:
-        region = idRegion(P, T)
 
-    if region is 1:
-        return region1.k(P, T)
-    elif region is 2:
-        return region2.k(P, T)
-    else:
-        return 0.000
+    return _dispatch(P, T, region, idRegion, {1: region1.k, 2: region2.k, 3: region3.k_T, 5: region5.k})
+def state(P, T, region = 0):
+    """ Every property at (P, T) from one region identification and
+    a single sweep of the region's kernel; see State"""
+
+    return _dispatch_state(P, T, region, idRegion, {1: region1.properties, 2: region2.properties, 3: region3.properties_T, 5: region5.properties})
+def props(P, T, names = None, region = 0):
+    """ The properties names (default all of State) at (P, T) as a dict,
+    from one region identification and one fused sweep; see state"""
+    values = state(P, T, region)
+
+    return dict((name, getattr(values, name)) for name in (names or State.__slots__[1:]))
+def batch(prop, P, T):
+    """ Batch evaluation of prop (e.g. v or state) at (P, T)
+    which never raises; returns (values, region) where unsupported
+    states are NaN and region 0"""
+
+    return _batch(prop, P, T, idRegion)
+def resolve(P, T, region = 0, strict = True):
+    """ Region of each state (P, T) given per-state region hints;
+    correct hints are kept after a check of their own boundaries and
+    only the states with a wrong or no hint (0) are identified"""
+
+    return _resolve(P, T, region, idRegion, _valid, strict)
+def hinted(prop, P, T, region = 0):
+    """ Evaluation of prop (e.g. v or state) at (P, T) with the
+    region hints checked by resolve; returns (values, region), so
+    the regions can be carried forward as the next hints"""
+
+    return _hinted(prop, P, T, region, resolve)
+def sweep(prop, P, T):
+    """ Evaluation of prop (e.g. h or state) along an isobar of
+    monotone T or an isotherm of monotone P, locating the region
+    boundaries once on the sweep instead of identifying every state;
+    returns (values, region)"""
+
+    return _sweep(prop, P, T, idRegion, _cuts)
 
 #### water property derivatives ####
 def dgdP(P, T, region = 0):
     """ Derivative of specific gibbs free energy [kJ m^3 / kg kJ]
     w.r.t pressure at constant temperature"""
-    if region is 0:
-        region = idRegion(P, T)
-
-    if region is 1:
-        return region1.dgdP(P, T)
-    elif region is 2:
-        return region2.dgdP(P, T)
-    else:
-        return 0.000
+
+    return _dispatch(P, T, region, idRegion, {1: region1.dgdP, 2: region2.dgdP, 3: region3.dgdP_T, 5: region5.dgdP})
 def dvdP(P, T, region = 0):
     """ Derivative of specific volume [m^3 m^3 / kg kJ]
     w.r.t pressure at constant temperature"""
-    if region is 0:
-        region = idRegion(P, T)
-
-    if region is 1:
-        return region1.dvdP(P, T)
-    elif region is 2:
-        return region2.dvdP(P, T)
-    else:
-        return 0.000
+
+    return _dispatch(P, T, region, idRegion, {1: region1.dvdP, 2: region2.dvdP, 3: region3.dvdP_T, 5: region5.dvdP})
 def dudP(P, T, region = 0):
     """ Derivative of specific internal energy [kJ m^3 / kg kJ]
     w.r.t pressure at constant temperature"""
-    if region is 0:
-        region = idRegion(P, T)
-
-    if region is 1:
-        return region1.dudP(P, T)
-    elif region is 2:
-        return region2.dudP(P, T)
-    else:
-        return 0.000
+
+    return _dispatch(P, T, region, idRegion, {1: region1.dudP, 2: region2.dudP, 3: region3.dudP_T, 5: region5.dudP})
 def dsdP(P, T, region = 0):
     """ Derivative of specific entropy [kJ m^3 / kg K kJ]
     w.r.t pressure at constant temperature"""
-    if region is 0:
-        region = idRegion(P, T)
-
-    if region is 1:
-        return region1.dsdP(P, T)
-    elif region is 2:
-        return region2.dsdP(P, T)
-    else:
-        return 0.000
+
+    return _dispatch(P, T, region, idRegion, {1: region1.dsdP, 2: region2.dsdP, 3: region3.dsdP_T, 5: region5.dsdP})
 def dhdP(P, T, region = 0):
     """ Derivative of specific enthalpy [kJ m^3 / kg kJ]
     w.r.t pressure at constant temperature"""
-    if region is 0:
-        region = idRegion(P, T)
 
-    if region is 1:
-        return region1.dhdP(P, T)
-    elif region is 2:
-        return region2.dhdP(P, T)
-    else:
-        return 0.000
+    return _dispatch(P, T, region, idRegion, {1: region1.dhdP, 2: region2.dhdP, 3: region3.dhdP_T, 5: region5.dhdP})
 
 def dgdT(P, T, region = 0):
     """ Derivative of specific gibbs free energy [kJ / kg K]
     w.r.t temperature at constant pressure"""
-    if region is 0:
-        region = idRegion(P, T)
-
-    if region is 1:
-        return region1.dgdT(P, T)
-    elif region is 2:
-        return region2.dgdT(P, T)
-    else:
-        return 0.000
+
+    return _dispatch(P, T, region, idRegion, {1: region1.dgdT, 2: region2.dgdT, 3: region3.dgdT_T, 5: region5.dgdT})
 def dvdT(P, T, region = 0):
     """ Derivative of specific volume [m^3 / kg K]
     w.r.t temperature at constant pressure"""
-    if region is 0:
-        region = idRegion(P, T)
-
-    if region is 1:
-        return region1.dvdT(P, T)
-    elif region is 2:
-        return region2.dvdT(P, T)
-    else:
-        return 0.000
+
+    return _dispatch(P, T, region, idRegion, {1: region1.dvdT, 2: region2.dvdT, 3: region3.dvdT_T, 5: region5.dvdT})
 def dudT(P, T, region = 0):
     """ Derivative of specific internal energy [kJ / kg K]
     w.r.t temperature at constant pressure"""
-    if region is 0:
-        region = idRegion(P, T)
-
-    if region is 1:
-        return region1.dudT(P, T)
-    elif region is 2:
-        return region2.dudT(P, T)
-    else:
-        return 0.000
+
+    return _dispatch(P, T, region, idRegion, {1: region1.dudT, 2: region2.dudT, 3: region3.dudT_T, 5: region5.dudT})
 def dsdT(P, T, region = 0):
     """ Derivative of specific entropy [kJ / kg K K]
     w.r.t temperature at constant pressure"""
-    if region is 0:
-        region = idRegion(P, T)
-
-    if region is 1:
-        return region1.dsdT(P, T)
-    elif region is 2:
-        return region2.dsdT(P, T)
-    else:
-        return 0.000
+
+    return _dispatch(P, T, region, idRegion, {1: region1.dsdT, 2: region2.dsdT, 3: region3.dsdT_T, 5: region5.dsdT})
 def dhdT(P, T, region = 0):
     """ Derivative of specific enthalpy [kJ / kg K]
     w.r.t temperature at constant pressure"""
-    if region is 0:
-        region = idRegion(P, T)
 
-    if region is 1:
-        return region1.dhdT(P, T)
-    elif region is 2:
-        return region2.dhdT(P, T)
-    else:
-        return 0.000
+    return _dispatch(P, T, region, idRegion, {1: region1.dhdT, 2: region2.dhdT, 3: region3.dhdT_T, 5: region5.dhdT})
 
 ###########################################################
 #####          Pressure-Enthalpy Formulation          #####
 ###########################################################
-def idRegion_h(P, h):
+def idRegion_h(P, h, strict = True):
     """Identification of region from IF97 specification
-    using pressure and enthalpy as primary variables"""
-
-    # supporting boundaries
-    Tbnd01 = region1.Tbnd01
-    Pbnd4  = satP(Tbnd01)
-    Tbnd25 = region2.Tbnd25
-    Tbnd13 = region1.Tbnd13
-    Tbnd32 = region3.bnd23T(min(max(P, 16.5292), 100.0))
-    Tbnd4  = satT(P)
+    using pressure and enthalpy as primary variables;
+    unsupported states are region 0 unless strict"""
+    P, h = asarray(P), asarray(h)
 
     # Enthalpy- pressure boundaries
-    Pbnd0  = region1.Pbnd0
-    Pbnd1  = region1.Pbnd1 
-    hbnd01 = region1.h(Pbnd4, Tbnd01)
-    hbnd25 = region2.h(Pbnd0, Tbnd25)
-    Pbndh1 = satP(Tbnd13)
-    hbnd13 = region1.h(P, Tbnd13)
-    hbnd32 = region2.h(P, Tbnd32)
-    hbnd14 = region1.h(P, Tbnd4)
-    hbnd42 = region2.h(P, Tbnd4)
+    bnd    = boundary_constants()
+    Pbnd0  = bnd['Pbnd0']
+    Pbnd1  = bnd['Pbnd1']
+    Pbnd5  = bnd['Pbnd5']
+    hbnd01 = bnd['hbnd01']
+    Pbndh1 = bnd['Pbndh1']
+    hbnd13, hbnd32, hbnd14, hbnd42, hbnd25, hbnd5 = _boundaries(P, h, _boundaries_h, boundary_cache_h)
+
+    # array inputs are classified in one pass
+    if isarray(P, h):
+        valid = (P >= Pbnd0) & (h >= hbnd01) & (P <= Pbnd1) & (h <= hbnd25)
+        high = valid & (P >= Pbndh1)
+        low  = valid & (P < Pbndh1)
+        five = (P >= Pbnd0) & (h > hbnd25) & (P <= Pbnd5) & (h <= hbnd5)
+        region = numpy.select([high & (h <= hbnd13), high & (h >= hbnd32), high,
+                               low & (h <= hbnd14), low & (h >= hbnd42), low, five], [1, 2, 3, 1, 2, 4, 5], 0)
+
+        # the two-phase dome reaches into region 3 up to the critical point
+        P, h = numpy.broadcast_arrays(P, h)
+        three = region == 3
+        if three.any():
+            region[three] = _region3(P[three], h[three], 'h')
+        assert region.all() or not strict, "Water properties not avalable!"
+        return region
 
     region = 0
 
@@ -301,8 +620,7 @@ def idRegion_h(P, h):
             elif (h >= hbnd32):
                 region = 2
             else:
-                # region 3 via P,h relations not implemented
-                region = 0
+                region = _region3(P, h, 'h')
         else:
             if (h <= hbnd14):
                 region = 1
@@ -310,337 +628,247 @@ def idRegion_h(P, h):
                 region = 2
             else:
                 region = 4
-    assert (region is not 0), "Water properties not avalable!"
+    elif (P >= Pbnd0) and (h > hbnd25) and (P <= Pbnd5) and (h <= hbnd5):
+        region = 5
+    assert (region != 0) or not strict, "Water properties not avalable!"
     return region
+def _valid_h(P, h, region):
+    """ True where region is the region of (P, h); scalars only evaluate
+    the boundaries of that region"""
+    bnd    = boundary_constants()
+    Pbndh1 = bnd['Pbndh1']
+
+    if isarray(P, h):
+        hbnd13, hbnd32, hbnd14, hbnd42, hbnd25, hbnd5 = _boundaries(P, h, _boundaries_h, boundary_cache_h)
+        if region == 5:
+            return (P >= bnd['Pbnd0']) & (h > hbnd25) & (P <= bnd['Pbnd5']) & (h <= hbnd5)
+        inside = (P >= bnd['Pbnd0']) & (h >= bnd['hbnd01']) & (P <= bnd['Pbnd1']) & (h <= hbnd25)
+        if region == 1:
+            return inside & (((P >= Pbndh1) & (h <= hbnd13)) | ((P < Pbndh1) & (h <= hbnd14)))
+        if region == 2:
+            return inside & (((P >= Pbndh1) & (h >= hbnd32)) | ((P < Pbndh1) & (h >= hbnd42)))
+        if region == 3:
+            P, h = numpy.broadcast_arrays(P, h)
+            three = inside & (P >= Pbndh1) & (h > hbnd13) & (h < hbnd32)
+            three[three] = _region3(P[three], h[three], 'h') == 3
+            return three
+        if region == 4:
+            P, h = numpy.broadcast_arrays(P, h)
+            four = inside & (P >= Pbndh1) & (h > hbnd13) & (h < hbnd32)
+            four[four] = _region3(P[four], h[four], 'h') == 4
+            return four | (inside & (P < Pbndh1) & (h > hbnd14) & (h < hbnd42))
+        return inside & False
+
+    if region == 5:
+        if not (bnd['Pbnd0'] <= P <= bnd['Pbnd5']):
+            return False
+        hbnd25, hbnd5 = _boundary(P, h, _boundaries_h, boundary_cache_h, 4, 5)
+        return hbnd25 < h <= hbnd5
+    if not ((bnd['Pbnd0'] <= P <= bnd['Pbnd1']) and (bnd['hbnd01'] <= h <= bnd['hbnd25'])):
+        return False
+    if region == 1:
+        hbnd1, = _boundary(P, h, _boundaries_h, boundary_cache_h, 0 if P >= Pbndh1 else 2)
+        return h <= hbnd1
+    if region == 2:
+        hbnd2, hbnd25 = _boundary(P, h, _boundaries_h, boundary_cache_h, 1 if P >= Pbndh1 else 3, 4)
+        return hbnd2 <= h <= hbnd25
+    if region in (3, 4) and P >= Pbndh1:
+        hbnd13, hbnd32 = _boundary(P, h, _boundaries_h, boundary_cache_h, 0, 1)
+        return (hbnd13 < h < hbnd32) and _region3(P, h, 'h') == region
+    if region == 4 and P < Pbndh1:
+        hbnd14, hbnd42 = _boundary(P, h, _boundaries_h, boundary_cache_h, 2, 3)
+        return hbnd14 < h < hbnd42
+    return False
+
+def _cuts_h(X, a, axis):
+    """ Positions in the ascending sweep a where the region of (P, h)
+    may change, for an isobar (axis 1, a = h); None otherwise"""
+    if axis == 0:
+        return None
+
+    points = _searched(a, [boundary_constants()['hbnd01']] + list(boundary_cache_h.lookup(X, _boundaries_h)))
+    return numpy.concatenate([points, _dome(X, a, 'h')])
 
 #### water properties ####
 def g_h(P, h, region = 0):
     """Specific gibbs free energy [kJ / kg]"""
-    if region is 0:
-        region = idRegion_h(P, h)
-
-    if region is 1:
-        return region1.g_h(P, h)
-    elif region is 2:
-        return region2.g_h(P, h)
-    elif region is 4:
-        return region4.g_h(P, h)
-    else:
-        return 0.000
+
+    return _dispatch(P, h, region, idRegion_h, {1: region1.g_h, 2: region2.g_h, 3: region3.g_h, 4: region4.g_h, 5: region5.g_h})
 def v_h(P, h, region = 0):
     """Specific volume [m^3 / kg]"""
-    if region is 0:
-        region = idRegion_h(P, h)
-
-    if region is 1:
-        return region1.v_h(P, h)
-    elif region is 2:
-        return region2.v_h(P, h)
-    elif region is 4:
-        return region4.v_h(P, h)
-    else:
-        return 0.000
+
+    return _dispatch(P, h, region, idRegion_h, {1: region1.v_h, 2: region2.v_h, 3: region3.v_h, 4: region4.v_h, 5: region5.v_h})
 def u_h(P, h, region = 0):
     """Specific internal energy [kJ / kg]"""
-    if region is 0:
-        region = idRegion_h(P, h)
-
-    if region is 1:
-        return region1.u_h(P, h)
-    elif region is 2:
-        return region2.u_h(P, h)
-    elif region is 4:
-        return region4.u_h(P, h)
-    else:
-        return 0.000
+
+    return _dispatch(P, h, region, idRegion_h, {1: region1.u_h, 2: region2.u_h, 3: region3.u_h, 4: region4.u_h, 5: region5.u_h})
 def s_h(P, h, region = 0):
     """Specific entropy [kJ / kg K]"""
-    if region is 0:
-        region = idRegion_h(P, h)
-
-    if region is 1:
-        return region1.s_h(P, h)
-    elif region is 2:
-        return region2.s_h(P, h)
-    elif region is 4:
-        return region4.s_h(P, h)
-    else:
-        return 0.000
+
+    return _dispatch(P, h, region, idRegion_h, {1: region1.s_h, 2: region2.s_h, 3: region3.s_h, 4: region4.s_h, 5: region5.s_h})
 def T_h(P, h, region = 0):
     """ Temperature [K]"""
-    if region is 0:
-        region = idRegion_h(P, h)
-
-    if region is 1:
-        return region1.T_h(P, h)
-    elif region is 2:
-        return region2.T_h(P, h)
-    elif region is 4:
-        return region4.satT(P)
-    else:
-        return 0.000
+
+    return _dispatch(P, h, region, idRegion_h, {1: region1.T_h, 2: region2.T_h, 3: region3.T_h, 4: lambda P, h: region4.satT(P), 5: region5.T_h})
 def cp_h(P, h, region = 0):
     """ Specific isobaric heat capacity [kJ / kg K]"""
-    if region is 0:
-        region = idRegion_h(P, h)
-
-    if region is 1:
-        return region1.cp_h(P, h)
-    elif region is 2:
-        return region2.cp_h(P, h)
-    elif region is 4:
-        return region4.cp_h(P, h)
-    else:
-        return 0.000
+
+    return _dispatch(P, h, region, idRegion_h, {1: region1.cp_h, 2: region2.cp_h, 3: region3.cp_h, 4: region4.cp_h, 5: region5.cp_h})
 def cv_h(P, h, region = 0):
     """ Specific isochoric heat capacity [kJ / kg K]"""
-    if region is 0:
-        region = idRegion_h(P, h)
-
-    if region is 1:
-        return region1.cv_h(P, h)
-    elif region is 2:
-        return region2.cv_h(P, h)
-    elif region is 4:
-        return region4.cv_h(P, h)
-    else:
-        return 0.000
+
+    return _dispatch(P, h, region, idRegion_h, {1: region1.cv_h, 2: region2.cv_h, 3: region3.cv_h, 4: region4.cv_h, 5: region5.cv_h})
 def w_h(P, h, region = 0):
     """ Speed of sound [m / s]"""
-    if region is 0:
-        region = idRegion_h(P, h)
-
-    if region is 1:
-        return region1.w_h(P, h)
-    elif region is 2:
-        return region2.w_h(P, h)
-    elif region is 4:
-        return region4.w_h(P, h)
-    else:
-        return 0.000
+
+    return _dispatch(P, h, region, idRegion_h, {1: region1.w_h, 2: region2.w_h, 3: region3.w_h, 4: region4.w_h, 5: region5.w_h})
 def a_h(P, h, region = 0):
     """Isobaric cubic expansion coefficient [1 / K]"""
-    if region is 0:
-        region = idRegion_h(P, h)
-
-    if region is 1:
-        return region1.a_h(P, h)
-    elif region is 2:
-        return region2.a_h(P, h)
-    elif region is 4:
-        return region4.a_h(P, h)
-    else:
-        return 0.000
+
+    return _dispatch(P, h, region, idRegion_h, {1: region1.a_h, 2: region2.a_h, 3: region3.a_h, 4: region4.a_h, 5: region5.a_h})
 def k_h(P, h, region = 0):
     """Isothermal compressibility [kg / kJ]"""
-    if region is 0:
-        region = idRegion_h(P, h)
-
-    if region is 1:
-        return region1.k_h(P, h)
-    elif region is 2:
-        return region2.k_h(P, h)
-    elif region is 4:
-        return region4.k_h(P, h)
-    else:
-        return 0.000
+
+    return _dispatch(P, h, region, idRegion_h, {1: region1.k_h, 2: region2.k_h, 3: region3.k_h, 4: region4.k_h, 5: region5.k_h})
+def state_h(P, h, region = 0):
+    """ Every property at (P, h) from one region identification and
+    a single sweep of the region's kernel; see State"""
+
+    return _dispatch_state(P, h, region, idRegion_h, {1: region1.properties_h, 2: region2.properties_h, 3: region3.properties_h, 4: region4.properties_h, 5: region5.properties_h})
+def props_h(P, h, names = None, region = 0):
+    """ The properties names (default all of State) at (P, h) as a dict,
+    from one region identification and one fused sweep; see state_h"""
+    values = state_h(P, h, region)
+
+    return dict((name, getattr(values, name)) for name in (names or State.__slots__[1:]))
+def batch_h(prop, P, h):
+    """ Batch evaluation of prop (e.g. v_h or state_h) at (P, h)
+    which never raises; returns (values, region) where unsupported
+    states are NaN and region 0"""
+
+    return _batch(prop, P, h, idRegion_h)
+def resolve_h(P, h, region = 0, strict = True):
+    """ Region of each state (P, h) given per-state region hints;
+    correct hints are kept after a check of their own boundaries and
+    only the states with a wrong or no hint (0) are identified"""
+
+    return _resolve(P, h, region, idRegion_h, _valid_h, strict)
+def hinted_h(prop, P, h, region = 0):
+    """ Evaluation of prop (e.g. v_h or state_h) at (P, h) with the
+    region hints checked by resolve_h; returns (values, region), so
+    the regions can be carried forward as the next hints"""
+
+    return _hinted(prop, P, h, region, resolve_h)
+def sweep_h(prop, P, h):
+    """ Evaluation of prop (e.g. T_h or state_h) along an isobar of
+    monotone h, locating the region boundaries once on the sweep
+    instead of identifying every state (other inputs are identified
+    point by point); returns (values, region)"""
+
+    return _sweep(prop, P, h, idRegion_h, _cuts_h)
 
 #### water property derivatives ####
 def dgdP_h(P, h, region = 0):
     """ Derivative of specific gibbs free energy [kJ m^3 / kg kJ]
     w.r.t pressure at constant specific enthalpy"""
-    if region is 0:
-        region = idRegion_h(P, h)
-
-    if region is 1:
-        return region1.dgdP_h(P, h)
-    elif region is 2:
-        return region2.dgdP_h(P, h)
-    elif region is 4:
-        return region4.dgdP_h(P, h)
-    else:
-        return 0.000
+
+    return _dispatch(P, h, region, idRegion_h, {1: region1.dgdP_h, 2: region2.dgdP_h, 3: region3.dgdP_h, 4: region4.dgdP_h, 5: region5.dgdP_h})
 def dvdP_h(P, h, region = 0):
     """ Derivative of specific volume [m^3 m^3 / kg kJ]
     w.r.t pressure at constant specific enthalpy"""
-    if region is 0:
-        region = idRegion_h(P, h)
-
-    if region is 1:
-        return region1.dvdp_h(P, h)
-    elif region is 2:
-        return region2.dvdP_h(P, h)
-    elif region is 4:
-        return region4.dvdP_h(P, h)
-    else:
-        return 0.000
+
+    return _dispatch(P, h, region, idRegion_h, {1: region1.dvdP_h, 2: region2.dvdP_h, 3: region3.dvdP_h, 4: region4.dvdP_h, 5: region5.dvdP_h})
 def dudP_h(P, h, region = 0):
     """ Derivative of specific internal energy [kJ m^3 / kg kJ]
     w.r.t pressure at constant specific enthalpy"""
-    if region is 0:
-        region = idRegion_h(P, h)
-
-    if region is 1:
-        return region1.dudP_h(P, h)
-    elif region is 2:
-        return region2.dudP_h(P, h)
-    elif region is 4:
-        return region4.dudP_h(P, h)
-    else:
-        return 0.000
+
+    return _dispatch(P, h, region, idRegion_h, {1: region1.dudP_h, 2: region2.dudP_h, 3: region3.dudP_h, 4: region4.dudP_h, 5: region5.dudP_h})
 def dsdP_h(P, h, region = 0):
     """ Derivative of specific entropy [kJ m^3 / kg K kJ]
     w.r.t pressure at constant specific enthalpy"""
-    if region is 0:
-        region = idRegion_h(P, h)
-
-    if region is 1:
-        return region1.dsdP_h(P, h)
-    elif region is 2:
-        return region2.dsdP_h(P, h)
-    elif region is 4:
-        return region4.dsdP_h(P, h)
-    else:
-        return 0.000
+
+    return _dispatch(P, h, region, idRegion_h, {1: region1.dsdP_h, 2: region2.dsdP_h, 3: region3.dsdP_h, 4: region4.dsdP_h, 5: region5.dsdP_h})
 def dhdP_h(P, h, region = 0):
     """ Derivative of specific enthalpy [kJ m^3 / kg kJ]
     w.r.t pressure at constant specific enthalpy"""
-    if region is 0:
-        region = idRegion_h(P, h)
-
-    if region is 1:
-        return 0.000
-    elif region is 2:
-        return 0.000
-    elif region is 4:
-        return region4.dhdP_h(P, h)
-    else:
-        return 0.000
+
+    return _dispatch(P, h, region, idRegion_h, {1: lambda P, h: 0.000, 2: lambda P, h: 0.000, 3: lambda P, h: 0.000, 4: region4.dhdP_h, 5: lambda P, h: 0.000})
 def dTdP_h(P, h, region = 0):
     """ Derivative of Temperature [K m^3 / kJ]
     w.r.t pressure at constant specific enthalpy"""
-    if region is 0:
-        region = idRegion_h(P, h)
-
-    if region is 1:
-        return region1.dTdP_h(P, h)
-    elif region is 2:
-        return region2.dTdP_h(P, h)
-    elif region is 4:
-        return region4.dTsdP(P)
-    else:
-        return 0.000
+
+    return _dispatch(P, h, region, idRegion_h, {1: region1.dTdP_h, 2: region2.dTdP_h, 3: region3.dTdP_h, 4: lambda P, h: region4.dTsdP(P), 5: region5.dTdP_h})
 
 def dgdh_h(P, h, region = 0):
     """ Derivative of specific gibbs free energy [kJ kg / kg kJ]
     w.r.t specific enthalpy at constant pressure"""
-    if region is 0:
-        region = idRegion_h(P, h)
-
-    if region is 1:
-        return region1.dgdh_h(P, h)
-    elif region is 2:
-        return region2.dgdh_h(P, h)
-    elif region is 4:
-        return region4.dgdh_h(P, h)
-    else:
-        return 0.000
+
+    return _dispatch(P, h, region, idRegion_h, {1: region1.dgdh_h, 2: region2.dgdh_h, 3: region3.dgdh_h, 4: region4.dgdh_h, 5: region5.dgdh_h})
 def dvdh_h(P, h, region = 0):
     """ Derivative of specific volume [m^3 kg / kg kJ]
     w.r.t specific enthalpy at constant pressure"""
-    if region is 0:
-        region = idRegion_h(P, h)
-
-    if region is 1:
-        return region1.dvdh_h(P, h)
-    elif region is 2:
-        return region2.dvdh_h(P, h)
-    elif region is 4:
-        return region4.dvdh_h(P, h)
-    else:
-        return 0.000
+
+    return _dispatch(P, h, region, idRegion_h, {1: region1.dvdh_h, 2: region2.dvdh_h, 3: region3.dvdh_h, 4: region4.dvdh_h, 5: region5.dvdh_h})
 def dudh_h(P, h, region = 0):
     """ Derivative of specific internal energy [kJ kg / kg kJ]
     w.r.t specific enthalpy at constant pressure"""
-    if region is 0:
-        region = idRegion_h(P, h)
-
-    if region is 1:
-        return region1.dudh_h(P, h)
-    elif region is 2:
-        return region2.dudh_h(P, h)
-    elif region is 4:
-        return region4.dudh_h(P, h)
-    else:
-        return 0.000
+
+    return _dispatch(P, h, region, idRegion_h, {1: region1.dudh_h, 2: region2.dudh_h, 3: region3.dudh_h, 4: region4.dudh_h, 5: region5.dudh_h})
 def dsdh_h(P, h, region = 0):
     """ Derivative of specific entropy [kJ kg / kg K kJ]
     w.r.t specific enthalpy at constant pressure"""
-    if region is 0:
-        region = idRegion_h(P, h)
-
-    if region is 1:
-        return region1.dsdh_h(P, h)
-    elif region is 2:
-        return region2.dsdh_h(P, h)
-    elif region is 4:
-        return region4.dsdh_h(P, h)
-    else:
-        return 0.000
+
+    return _dispatch(P, h, region, idRegion_h, {1: region1.dsdh_h, 2: region2.dsdh_h, 3: region3.dsdh_h, 4: region4.dsdh_h, 5: region5.dsdh_h})
 def dhdh_h(P, h, region = 0):
     """ Derivative of specific enthalpy [kJ kg / kg kJ]
     w.r.t specific enthalpy at constant pressure"""
-    if region is 0:
-        region = idRegion_h(P, h)
-
-    if region is 1:
-        return 1.000
-    elif region is 2:
-        return 1.000
-    elif region is 4:
-        return 1.000
-    else:
-        return 0.000
+
+    return _dispatch(P, h, region, idRegion_h, {1: lambda P, h: 1.000, 2: lambda P, h: 1.000, 3: lambda P, h: 1.000, 4: lambda P, h: 1.000, 5: lambda P, h: 1.000})
 def dTdh_h(P, h, region = 0):
     """ Derivative of Temperature [K kg / kJ]
     w.r.t specific enthalpy at constant pressure"""
-    if region is 0:
-        region = idRegion_h(P, h)
-
-    if region is 1:
-        return region1.dTdh_h(P, h)
-    elif region is 2:
-        return region2.dTdh_h(P, h)
-    elif region is 4:
-        return 0.000
-    else:
-        return 0.000
+
+    return _dispatch(P, h, region, idRegion_h, {1: region1.dTdh_h, 2: region2.dTdh_h, 3: region3.dTdh_h, 4: lambda P, h: 0.000, 5: region5.dTdh_h})
+def derivatives_h(P, h, region = 0):
+    """ Every derivative above (of g, v, u, s, h and T) as a dict keyed
+    on the function names, from one region identification and one
+    fused evaluation of the region's derivatives"""
+
+    return _dispatch_dict(P, h, region, idRegion_h, {1: region1.derivatives_h, 2: region2.derivatives_h, 3: region3.derivatives_h, 4: region4.derivatives_h, 5: region5.derivatives_h})
 
 ###########################################################
 #####           Pressure-Entropy Formulation          #####
 ###########################################################
-def idRegion_s(P, s):
+def idRegion_s(P, s, strict = True):
     """Identification of region from IF97 specification
-    using pressure and enthalpy as primary variables"""
-
-    # supporting boundaries
-    Tbnd01 = region1.Tbnd01
-    Pbnd4  = satP(Tbnd01)
-    Tbnd25 = region2.Tbnd25
-    Tbnd13 = region1.Tbnd13
-    Tbnd32 = region3.bnd23T(min(max(P, 16.5292), 100.0))
-    Tbnd4  = satT(P)
-
-    # Enthalpy- pressure boundaries
-    Pbnd0  = region1.Pbnd0
-    Pbnd1  = region1.Pbnd1 
-    sbnd01 = region1.s(P, Tbnd01)
-    sbnd25 = region2.s(P, Tbnd25)
-    Pbndh1 = satP(Tbnd13)
-    sbnd13 = region1.s(P, Tbnd13)
-    sbnd32 = region2.s(P, Tbnd32)
-    sbnd14 = region1.s(P, Tbnd4)
-    sbnd42 = region2.s(P, Tbnd4)
+    using pressure and entropy as primary variables;
+    unsupported states are region 0 unless strict"""
+    P, s = asarray(P), asarray(s)
+
+    # Entropy- pressure boundaries
+    bnd    = boundary_constants()
+    Pbnd0  = bnd['Pbnd0']
+    Pbnd1  = bnd['Pbnd1']
+    Pbnd5  = bnd['Pbnd5']
+    Pbndh1 = bnd['Pbndh1']
+    sbnd01, sbnd25, sbnd13, sbnd32, sbnd14, sbnd42, sbnd5 = _boundaries(P, s, _boundaries_s, boundary_cache_s)
+
+    # array inputs are classified in one pass
+    if isarray(P, s):
+        valid = (P >= Pbnd0) & (s >= sbnd01) & (P <= Pbnd1) & (s <= sbnd25)
+        high = valid & (P >= Pbndh1)
+        low  = valid & (P < Pbndh1)
+        five = (P >= Pbnd0) & (s > sbnd25) & (P <= Pbnd5) & (s <= sbnd5)
+        region = numpy.select([high & (s <= sbnd13), high & (s >= sbnd32), high,
+                               low & (s <= sbnd14), low & (s >= sbnd42), low, five], [1, 2, 3, 1, 2, 4, 5], 0)
+
+        # the two-phase dome reaches into region 3 up to the critical point
+        P, s = numpy.broadcast_arrays(P, s)
+        three = region == 3
+        if three.any():
+            region[three] = _region3(P[three], s[three], 's')
+        assert region.all() or not strict, "Water properties not avalable!"
+        return region
 
     region = 0
 
@@ -651,8 +879,7 @@ def idRegion_s(P, s):
             elif (s >= sbnd32):
                 region = 2
             else:
-                # region 3 via P,h relations not implemented
-                region = 0
+                region = _region3(P, s, 's')
         else:
             if (s <= sbnd14):
                 region = 1
@@ -660,311 +887,305 @@ def idRegion_s(P, s):
                 region = 2
             else:
                 region = 4
-    assert (region is not 0), "Water properties not avalable!"
+    elif (P >= Pbnd0) and (s > sbnd25) and (P <= Pbnd5) and (s <= sbnd5):
+        region = 5
+    assert (region != 0) or not strict, "Water properties not avalable!"
     return region
+def _valid_s(P, s, region):
+    """ True where region is the region of (P, s); scalars only evaluate
+    the boundaries of that region"""
+    bnd    = boundary_constants()
+    Pbndh1 = bnd['Pbndh1']
+
+    if isarray(P, s):
+        sbnd01, sbnd25, sbnd13, sbnd32, sbnd14, sbnd42, sbnd5 = _boundaries(P, s, _boundaries_s, boundary_cache_s)
+        if region == 5:
+            return (P >= bnd['Pbnd0']) & (s > sbnd25) & (P <= bnd['Pbnd5']) & (s <= sbnd5)
+        inside = (P >= bnd['Pbnd0']) & (s >= sbnd01) & (P <= bnd['Pbnd1']) & (s <= sbnd25)
+        if region == 1:
+            return inside & (((P >= Pbndh1) & (s <= sbnd13)) | ((P < Pbndh1) & (s <= sbnd14)))
+        if region == 2:
+            return inside & (((P >= Pbndh1) & (s >= sbnd32)) | ((P < Pbndh1) & (s >= sbnd42)))
+        if region == 3:
+            P, s = numpy.broadcast_arrays(P, s)
+            three = inside & (P >= Pbndh1) & (s > sbnd13) & (s < sbnd32)
+            three[three] = _region3(P[three], s[three], 's') == 3
+            return three
+        if region == 4:
+            P, s = numpy.broadcast_arrays(P, s)
+            four = inside & (P >= Pbndh1) & (s > sbnd13) & (s < sbnd32)
+            four[four] = _region3(P[four], s[four], 's') == 4
+            return four | (inside & (P < Pbndh1) & (s > sbnd14) & (s < sbnd42))
+        return inside & False
+
+    # the saturated vapor line (42) lies below the 1073.15 K isotherm
+    # (25), but the saturated liquid line (14) may fall below the
+    # 273.16 K isotherm (01) near Pbnd0
+    if region == 5:
+        if not (bnd['Pbnd0'] <= P <= bnd['Pbnd5']):
+            return False
+        sbnd25, sbnd5 = _boundary(P, s, _boundaries_s, boundary_cache_s, 1, 6)
+        return sbnd25 < s <= sbnd5
+    if not (bnd['Pbnd0'] <= P <= bnd['Pbnd1']):
+        return False
+    if region == 1:
+        sbnd01, sbnd1 = _boundary(P, s, _boundaries_s, boundary_cache_s, 0, 2 if P >= Pbndh1 else 4)
+        return sbnd01 <= s <= sbnd1
+    if region == 2:
+        sbnd25, sbnd2 = _boundary(P, s, _boundaries_s, boundary_cache_s, 1, 3 if P >= Pbndh1 else 5)
+        return sbnd2 <= s <= sbnd25
+    if region in (3, 4) and P >= Pbndh1:
+        sbnd13, sbnd32 = _boundary(P, s, _boundaries_s, boundary_cache_s, 2, 3)
+        return (sbnd13 < s < sbnd32) and _region3(P, s, 's') == region
+    if region == 4 and P < Pbndh1:
+        sbnd01, sbnd14, sbnd42 = _boundary(P, s, _boundaries_s, boundary_cache_s, 0, 4, 5)
+        return (sbnd14 < s < sbnd42) and (s >= sbnd01)
+    return False
+
+def _cuts_s(X, a, axis):
+    """ Positions in the ascending sweep a where the region of (P, s)
+    may change, for an isobar (axis 1, a = s); None otherwise"""
+    if axis == 0:
+        return None
+
+    points = _searched(a, list(boundary_cache_s.lookup(X, _boundaries_s)))
+    return numpy.concatenate([points, _dome(X, a, 's')])
 
 #### water properties ####
 def g_s(P, s, region = 0):
     """Specific gibbs free energy [kJ / kg]"""
-    if region is 0:
-        region = idRegion_s(P, s)
-
-    if region is 1:
-        return region1.g_s(P, s)
-    elif region is 2:
-        return region2.g_s(P, s)
-    elif region is 4:
-        return region4.g_s(P, s)
-    else:
-        return 0.000
+
+    return _dispatch(P, s, region, idRegion_s, {1: region1.g_s, 2: region2.g_s, 3: region3.g_s, 4: region4.g_s, 5: region5.g_s})
 def v_s(P, s, region = 0):
     """Specific volume [m^3 / kg]"""
-    if region is 0:
-        region = idRegion_s(P, s)
-
-    if region is 1:
-        return region1.v_s(P, s)
-    elif region is 2:
-        return region2.v_s(P, s)
-    elif region is 4:
-        return region4.v_s(P, s)
-    else:
-        return 0.000
+
+    return _dispatch(P, s, region, idRegion_s, {1: region1.v_s, 2: region2.v_s, 3: region3.v_s, 4: region4.v_s, 5: region5.v_s})
 def u_s(P, s, region = 0):
     """Specific internal energy [kJ / kg]"""
-    if region is 0:
-        region = idRegion_s(P, s)
-
-    if region is 1:
-        return region1.u_s(P, s)
-    elif region is 2:
-        return region2.u_s(P, s)
-    elif region is 4:
-        return region4.u_s(P, s)
-    else:
-        return 0.000
+
+    return _dispatch(P, s, region, idRegion_s, {1: region1.u_s, 2: region2.u_s, 3: region3.u_s, 4: region4.u_s, 5: region5.u_s})
 def T_s(P, s, region = 0):
     """ Temperature [K]"""
-    if region is 0:
-        region = idRegion_s(P, s)
-
-    if region is 1:
-        return region1.T_s(P, s)
-    elif region is 2:
-        return region2.T_s(P, s)
-    elif region is 4:
-        return region4.satT(P)
-    else:
-        return 0.000
+
+    return _dispatch(P, s, region, idRegion_s, {1: region1.T_s, 2: region2.T_s, 3: region3.T_s, 4: lambda P, s: region4.satT(P), 5: region5.T_s})
 def h_s(P, s, region = 0):
     """Specific entropy [kJ / kg]"""
-    if region is 0:
-        region = idRegion_s(P, s)
-
-    if region is 1:
-        return region1.h_s(P, s)
-    elif region is 2:
-        return region2.h_s(P, s)
-    elif region is 4:
-        return region4.h_s(P, s)
-    else:
-        return 0.000
+
+    return _dispatch(P, s, region, idRegion_s, {1: region1.h_s, 2: region2.h_s, 3: region3.h_s, 4: region4.h_s, 5: region5.h_s})
 def cp_s(P, s, region = 0):
     """ Specific isobaric heat capacity [kJ / kg K]"""
-    if region is 0:
-        region = idRegion_s(P, s)
-
-    if region is 1:
-        return region1.cp_s(P, s)
-    elif region is 2:
-        return region2.cp_s(P, s)
-    elif region is 4:
-        return region4.cp_s(P, s)
-    else:
-        return 0.000
+
+    return _dispatch(P, s, region, idRegion_s, {1: region1.cp_s, 2: region2.cp_s, 3: region3.cp_s, 4: region4.cp_s, 5: region5.cp_s})
 def cv_s(P, s, region = 0):
     """ Specific isochoric heat capacity [kJ / kg K]"""
-    if region is 0:
-        region = idRegion_s(P, s)
-
-    if region is 1:
-        return region1.cv_s(P, s)
-    elif region is 2:
-        return region2.cv_s(P, s)
-    elif region is 4:
-        return region4.cv_s(P, s)
-    else:
-        return 0.000
+
+    return _dispatch(P, s, region, idRegion_s, {1: region1.cv_s, 2: region2.cv_s, 3: region3.cv_s, 4: region4.cv_s, 5: region5.cv_s})
 def w_s(P, s, region = 0):
     """ Speed of sound [m / s]"""
-    if region is 0:
-        region = idRegion_s(P, s)
-
-    if region is 1:
-        return region1.w_s(P, s)
-    elif region is 2:
-        return region2.w_s(P, s)
-    elif region is 4:
-        return region4.w_s(P, s)
-    else:
-        return 0.000
+
+    return _dispatch(P, s, region, idRegion_s, {1: region1.w_s, 2: region2.w_s, 3: region3.w_s, 4: region4.w_s, 5: region5.w_s})
 def a_s(P, s, region = 0):
     """Isobaric cubic expansion coefficient [1 / K]"""
-    if region is 0:
-        region = idRegion_s(P, s)
-
-    if region is 1:
-        return region1.a_s(P, s)
-    elif region is 2:
-        return region2.a_s(P, s)
-    elif region is 4:
-        return region4.a_s(P, s)
-    else:
-        return 0.000
+
+    return _dispatch(P, s, region, idRegion_s, {1: region1.a_s, 2: region2.a_s, 3: region3.a_s, 4: region4.a_s, 5: region5.a_s})
 def k_s(P, s, region = 0):
     """Isothermal compressibility [kg / kJ]"""
-    if region is 0:
-        region = idRegion_s(P, s)
-
-    if region is 1:
-        return region1.k_s(P, s)
-    elif region is 2:
-        return region2.k_s(P, s)
-    elif region is 4:
-        return region4.k_s(P, s)
-    else:
-        return 0.000
+
+    return _dispatch(P, s, region, idRegion_s, {1: region1.k_s, 2: region2.k_s, 3: region3.k_s, 4: region4.k_s, 5: region5.k_s})
+def state_s(P, s, region = 0):
+    """ Every property at (P, s) from one region identification and
+    a single sweep of the region's kernel; see State"""
+
+    return _dispatch_state(P, s, region, idRegion_s, {1: region1.properties_s, 2: region2.properties_s, 3: region3.properties_s, 4: region4.properties_s, 5: region5.properties_s})
+def props_s(P, s, names = None, region = 0):
+    """ The properties names (default all of State) at (P, s) as a dict,
+    from one region identification and one fused sweep; see state_s"""
+    values = state_s(P, s, region)
+
+    return dict((name, getattr(values, name)) for name in (names or State.__slots__[1:]))
+def batch_s(prop, P, s):
+    """ Batch evaluation of prop (e.g. v_s or state_s) at (P, s)
+    which never raises; returns (values, region) where unsupported
+    states are NaN and region 0"""
+
+    return _batch(prop, P, s, idRegion_s)
+def resolve_s(P, s, region = 0, strict = True):
+    """ Region of each state (P, s) given per-state region hints;
+    correct hints are kept after a check of their own boundaries and
+    only the states with a wrong or no hint (0) are identified"""
+
+    return _resolve(P, s, region, idRegion_s, _valid_s, strict)
+def hinted_s(prop, P, s, region = 0):
+    """ Evaluation of prop (e.g. v_s or state_s) at (P, s) with the
+    region hints checked by resolve_s; returns (values, region), so
+    the regions can be carried forward as the next hints"""
+
+    return _hinted(prop, P, s, region, resolve_s)
+def sweep_s(prop, P, s):
+    """ Evaluation of prop (e.g. T_s or state_s) along an isobar of
+    monotone s, locating the region boundaries once on the sweep
+    instead of identifying every state (other inputs are identified
+    point by point); returns (values, region)"""
+
+    return _sweep(prop, P, s, idRegion_s, _cuts_s)
 
 #### water property derivatives ####
 def dgdP_s(P, s, region = 0):
     """ Derivative of specific gibbs free energy [kJ m^3 / kg kJ]
     w.r.t pressure at constant specific entropy"""
-    if region is 0:
-        region = idRegion_s(P, s)
-
-    if region is 1:
-        return region1.dgdP_s(P, s)
-    elif region is 2:
-        return region2.dgdP_s(P, s)
-    elif region is 4:
-        return region4.dgdP_s(P, s)
-    else:
-        return 0.000
+
+    return _dispatch(P, s, region, idRegion_s, {1: region1.dgdP_s, 2: region2.dgdP_s, 3: region3.dgdP_s, 4: region4.dgdP_s, 5: region5.dgdP_s})
 def dvdP_s(P, s, region = 0):
     """ Derivative of specific volume [m^3 m^3 / kg kJ]
     w.r.t pressure at constant specific entropy"""
-    if region is 0:
-        region = idRegion_s(P, s)
-
-    if region is 1:
-        return region1.dvdP_s(P, s)
-    elif region is 2:
-        return region2.dvdP_s(P, s)
-    elif region is 4:
-        return region4.dvdP_s(P, s)
-    else:
-        return 0.000
+
+    return _dispatch(P, s, region, idRegion_s, {1: region1.dvdP_s, 2: region2.dvdP_s, 3: region3.dvdP_s, 4: region4.dvdP_s, 5: region5.dvdP_s})
 def dudP_s(P, s, region = 0):
     """ Derivative of specific internal energy [kJ m^3 / kg kJ]
     w.r.t pressure at constant specific entropy"""
-    if region is 0:
-        region = idRegion_s(P, s)
-
-    if region is 1:
-        return region1.dudP_s(P, s)
-    elif region is 2:
-        return region2.dudP_s(P, s)
-    elif region is 4:
-        return region4.dudP_s(P, s)
-    else:
-        return 0.000
+
+    return _dispatch(P, s, region, idRegion_s, {1: region1.dudP_s, 2: region2.dudP_s, 3: region3.dudP_s, 4: region4.dudP_s, 5: region5.dudP_s})
 def dsdP_s(P, s, region = 0):
     """ Derivative of specific entropy [kJ m^3 / kg K kJ]
     w.r.t pressure at constant specific/equilibrium entropy"""
-    if region is 0:
-        region = idRegion_s(P, s)
-
-    if region is 1:
-        return 0.000
-    elif region is 2:
-        return 0.000
-    elif region is 4:
-        return region4.dsdP_s(P, s)
-    else:
-        return 0.000
+
+    return _dispatch(P, s, region, idRegion_s, {1: lambda P, s: 0.000, 2: lambda P, s: 0.000, 3: lambda P, s: 0.000, 4: region4.dsdP_s, 5: lambda P, s: 0.000})
 def dhdP_s(P, s, region = 0):
     """ Derivative of specific enthalpy [kJ m^3 / kg kJ]
     w.r.t pressure at constant specific entropy"""
-    if region is 0:
-        region = idRegion_s(P, s)
-
-    if region is 1:
-        return region1.dhdP_s(P, s)
-    elif region is 2:
-        return region2.dhdP_s(P, s)
-    elif region is 4:
-        return region4.dhdP_s(P, s)
-    else:
-        return 0.000
+
+    return _dispatch(P, s, region, idRegion_s, {1: region1.dhdP_s, 2: region2.dhdP_s, 3: region3.dhdP_s, 4: region4.dhdP_s, 5: region5.dhdP_s})
 def dTdP_s(P, s, region = 0):
     """ Derivative of Temperature [K m^3 / kJ]
     w.r.t pressure at constant specific entropy"""
-    if region is 0:
-        region = idRegion_s(P, s)
-
-    if region is 1:
-        return region1.dTdP_s(P, s)
-    elif region is 2:
-        return region2.dTdP_s(P, s)
-    elif region is 4:
-        return region4.dTsdP(P)
-    else:
-        return 0.000
+
+    return _dispatch(P, s, region, idRegion_s, {1: region1.dTdP_s, 2: region2.dTdP_s, 3: region3.dTdP_s, 4: lambda P, s: region4.dTsdP(P), 5: region5.dTdP_s})
 
 def dgds_s(P, s, region = 0):
     """ Derivative of specific gibbs free energy [kJ kg K / kg kJ]
     w.r.t specific entropy at constant pressure"""
-    if region is 0:
-        region = idRegion_s(P, s)
-
-    if region is 1:
-        return region1.dgds_s(P, s)
-    elif region is 2:
-        return region2.dgds_s(P, s)
-    elif region is 4:
-        return region4.dgds_s(P, s)
-    else:
-        return 0.000
+
+    return _dispatch(P, s, region, idRegion_s, {1: region1.dgds_s, 2: region2.dgds_s, 3: region3.dgds_s, 4: region4.dgds_s, 5: region5.dgds_s})
 def dvds_s(P, s, region = 0):
     """ Derivative of specific volume [m^3 kg K / kg kJ]
     w.r.t specific entropy at constant pressure"""
-    if region is 0:
-        region = idRegion_s(P, s)
-
-    if region is 1:
-        return region1.dvds_s(P, s)
-    elif region is 2:
-        return region2.dvds_s(P, s)
-    elif region is 4:
-        return region4.dvds_s(P, s)
-    else:
-        return 0.000
+
+    return _dispatch(P, s, region, idRegion_s, {1: region1.dvds_s, 2: region2.dvds_s, 3: region3.dvds_s, 4: region4.dvds_s, 5: region5.dvds_s})
 def duds_s(P, s, region = 0):
     """ Derivative of specific internal energy [kJ kg K / kg kJ]
     w.r.t specific entropy at constant pressure"""
-    if region is 0:
-        region = idRegion_s(P, s)
-
-    if region is 1:
-        return region1.duds_s(P, s)
-    elif region is 2:
-        return region2.duds_s(P, s)
-    elif region is 4:
-        return region4.duds_s(P, s)
-    else:
-        return 0.000
+
+    return _dispatch(P, s, region, idRegion_s, {1: region1.duds_s, 2: region2.duds_s, 3: region3.duds_s, 4: region4.duds_s, 5: region5.duds_s})
 def dsds_s(P, s, region = 0):
     """ Derivative of specific entropy [kJ kg K / kg K kJ]
     w.r.t specific entropy at constant pressure"""
-    if region is 0:
-        region = idRegion_s(P, s)
-
-    if region is 1:
-        return 1.000
-    elif region is 2:
-        return 1.000
-    elif region is 4:
-        return 1.000
-    else:
-        return 0.000
+
+    return _dispatch(P, s, region, idRegion_s, {1: lambda P, s: 1.000, 2: lambda P, s: 1.000, 3: lambda P, s: 1.000, 4: lambda P, s: 1.000, 5: lambda P, s: 1.000})
 def dhds_s(P, s, region = 0):
     """ Derivative of specific enthalpy [kJ kg K / kg kJ]
     w.r.t specific entropy at constant pressure"""
-    if region is 0:
-        region = idRegion_s(P, s)
-
-    if region is 1:
-        return region1.dhds_s(P, s)
-    elif region is 2:
-        return region2.dhds_s(P, s)
-    elif region is 4:
-        return region4.dhds_s(P, s)
-    else:
-        return 0.000
+
+    return _dispatch(P, s, region, idRegion_s, {1: region1.dhds_s, 2: region2.dhds_s, 3: region3.dhds_s, 4: region4.dhds_s, 5: region5.dhds_s})
 def dTds_s(P, s, region = 0):
     """ Derivative of Temperature [K kg K / kJ]
     w.r.t enthalpy at constant pressure"""
-    if region is 0:
-        region = idRegion_s(P, s)
-
-    if region is 1:
-        return region1.dTds_s(P, s)
-    elif region is 2:
-        return region2.dTds_s(P, s)
-    elif region is 4:
-        return 0.000
-    else:
-        return 0.000
+
+    return _dispatch(P, s, region, idRegion_s, {1: region1.dTds_s, 2: region2.dTds_s, 3: region3.dTds_s, 4: lambda P, s: 0.000, 5: region5.dTds_s})
+def derivatives_s(P, s, region = 0):
+    """ Every derivative above (of g, v, u, s, h and T) as a dict keyed
+    on the function names, from one region identification and one
+    fused evaluation of the region's derivatives"""
+
+    return _dispatch_dict(P, s, region, idRegion_s, {1: region1.derivatives_s, 2: region2.derivatives_s, 3: region3.derivatives_s, 4: region4.derivatives_s, 5: region5.derivatives_s})
+
+###########################################################
+#####           Enthalpy-Entropy Formulation          #####
+###########################################################
+
+# a state is in region 1 or 2 when the backward pressure of that region
+# is in range (within PTOL_hs), has that region in (P, h) and gives back
+# s within STOL_hs; the tolerances cover the error of the backward
+# equations, not the two-phase states between the regions; states next
+# to saturation may fall just inside the dome in (P, h), which is
+# accepted within a quality of XTOL_hs of that region's side
+PTOL_hs = 1.0e-3   #[-]
+STOL_hs = 2.0e-3   #[kJ / kg K]
+XTOL_hs = 1.0e-3   #[-]
+
+def idRegion_hs(h, s, strict = True):
+    """Identification of region (1 or 2) using enthalpy and entropy
+    as primary variables; other states are region 0 unless strict"""
+    h, s = asarray(h), asarray(s)
+
+    # array inputs only check region 2 for the states not in region 1
+    if isarray(h, s):
+        h, s = numpy.broadcast_arrays(h, s)
+        region = numpy.where(_valid_hs(h, s, 1), 1, 0)
+        rest = region == 0
+        if rest.any():
+            region[rest] = numpy.where(_valid_hs(h[rest], s[rest], 2), 2, 0)
+        assert region.all() or not strict, "Water properties not avalable!"
+        return region
+
+    region = 0
+
+    if _valid_hs(h, s, 1):
+        region = 1
+    elif _valid_hs(h, s, 2):
+        region = 2
+    assert (region != 0) or not strict, "Water properties not avalable!"
+    return region
+def _valid_hs(h, s, region):
+    """ True where region (1 or 2) is the region of (h, s), from the
+    backward pressure of that region alone"""
+    bnd = boundary_constants()
+    module = {1: region1, 2: region2}.get(region)
+
+    if module is None:
+        return numpy.zeros(numpy.broadcast(h, s).shape, dtype = bool) if isarray(h, s) else False
+
+    with numpy.errstate(all = 'ignore'):
+        P = module.P_hs(h, s)
+        inside = (P >= bnd['Pbnd0'] * (1 - PTOL_hs)) & (P <= bnd['Pbnd1'] * (1 + PTOL_hs))
+        if not isarray(inside) and not inside:
+            return False
+
+        P = clip(P, bnd['Pbnd0'], bnd['Pbnd1'])
+        Pregion = idRegion_h(P, h, strict = False)
+        edge = Pregion == 4
+        if isarray(edge):
+            edge[edge] = abs(region4.x_h(P[edge], h[edge]) - (region - 1)) <= XTOL_hs
+        elif edge:
+            edge = abs(region4.x_h(P, h) - (region - 1)) <= XTOL_hs
+        return inside & ((Pregion == region) | edge) & (abs(module.s_h(P, h) - s) <= STOL_hs)
+
+#### water properties ####
+def P_hs(h, s, region = 0):
+    """ Pressure [MPa]"""
+
+    return _dispatch(h, s, region, idRegion_hs, {1: region1.P_hs, 2: region2.P_hs})
+def T_hs(h, s, region = 0):
+    """ Temperature [K]"""
+
+    return _dispatch(h, s, region, idRegion_hs, {1: region1.T_hs, 2: region2.T_hs})
+def state_hs(h, s, region = 0):
+    """ Every property at (h, s) from one region identification, the
+    backward pressure and temperature and a single sweep of the
+    region's kernel; see State"""
+
+    return _dispatch_state(h, s, region, idRegion_hs, {1: region1.properties_hs, 2: region2.properties_hs})
+def props_hs(h, s, names = None, region = 0):
+    """ The properties names (default all of State) at (h, s) as a dict,
+    from one region identification and one fused sweep; see state_hs"""
+    values = state_hs(h, s, region)
+
+    return dict((name, getattr(values, name)) for name in (names or State.__slots__[1:]))
+def batch_hs(prop, h, s):
+    """ Batch evaluation of prop (e.g. P_hs or state_hs) at (h, s)
+    which never raises; returns (values, region) where unsupported
+    states are NaN and region 0"""
+
+    return _batch(prop, h, s, idRegion_hs)
 
 ###########################################################
 #####     Pressure Only (Saturation) Formulation      #####
@@ -1217,4 +1438,108 @@ def dhfgdP(P):
     """ Derivative of Specific enthalpy [kJ m^3 / kg kJ]
     w.r.t. pressure; saturation rise of"""
 
-    return region4.dhfgdP(P)
\ No newline at end of file
+    return region4.dhfgdP(P)
+
+###########################################################
+#####                   Memoization                   #####
+###########################################################
+
+#### memo caches ####
+# opt-in memoization of scalar calls, one bounded cache per family of
+# functions; with a relative tolerance rtol the state variables are
+# quantized onto a logarithmic grid and every call within a grid cell
+# returns the value at the cell's representative state. Off by default,
+# so results are exact unless enabled
+memo_caches = {'PT': Cache(), 'Ph': Cache(), 'Ps': Cache(), 'hs': Cache(), 'sat': Cache()}
+_memo = {'enabled': False, 'rtol': 0.0}
+
+# depth of memoized evaluations on each thread; nested calls (e.g.
+# idRegion to satP) are evaluated exactly
+_nesting = threading.local()
+
+def enable_memo(maxsize = 1024, rtol = 0.0):
+    """ Turns memoization on with empty caches of maxsize entries each,
+    quantizing state variables to the relative tolerance rtol; caches
+    of maxsize 0 only count the calls"""
+    assert maxsize >= 0, "Memo cache size must not be negative!"
+    for cache in memo_caches.values():
+        cache.maxsize = maxsize
+        cache.clear()
+    _memo.update(enabled = True, rtol = rtol)
+def disable_memo():
+    """ Turns memoization off and empties the caches"""
+    _memo.update(enabled = False, rtol = 0.0)
+    for cache in memo_caches.values():
+        cache.clear()
+def clear_memo():
+    """ Empties the caches and resets their counters"""
+    for cache in memo_caches.values():
+        cache.clear()
+def memo_info():
+    """ Hit, miss and eviction counters and size of each family's cache"""
+    return dict((family, cache.info()) for family, cache in memo_caches.items())
+@contextlib.contextmanager
+def memoize(maxsize = 1024, rtol = 0.0):
+    """ Context manager enabling memoization for a block of code; the
+    previous settings are restored (and the caches emptied) on exit"""
+    previous = dict(_memo, maxsize = memo_caches['PT'].maxsize)
+    enable_memo(maxsize, rtol)
+    try:
+        yield memo_caches
+    finally:
+        disable_memo()
+        for cache in memo_caches.values():
+            cache.maxsize = previous['maxsize']
+        if previous['enabled']:
+            enable_memo(previous['maxsize'], previous['rtol'])
+
+#### memoized functions ####
+def _copy(value):
+    """ Copy of a cached dict or State, so callers can't alter the cache"""
+    if isinstance(value, dict):
+        return dict(value)
+    if isinstance(value, State):
+        return State(**dict((name, getattr(value, name)) for name in State.__slots__))
+    return value
+def _memoized(func, family, nstate):
+    """ Wraps func so scalar calls go through its family's cache when
+    memoization is enabled; the first nstate arguments are the state
+    variables and are quantized, array calls are never cached"""
+    cache = memo_caches[family]
+
+    def evaluate(key):
+        _nesting.depth = getattr(_nesting, 'depth', 0) + 1
+        try:
+            return func(*key[1], **dict(key[2]))
+        finally:
+            _nesting.depth -= 1
+
+    @functools.wraps(func)
+    def memoized(*args, **kwargs):
+        if not _memo['enabled'] or getattr(_nesting, 'depth', 0):
+            return func(*args, **kwargs)
+        for x in args[:nstate]:
+            if not isinstance(x, (int, float)):
+                return func(*args, **kwargs)
+        if isarray(*args[nstate:]) or isarray(*kwargs.values()):
+            return func(*args, **kwargs)
+
+        rtol = _memo['rtol']
+        key = [quantize(x, rtol) for x in args[:nstate]] + \
+              [tuple(x) if isinstance(x, list) else x for x in args[nstate:]]
+        options = [(name, tuple(x) if isinstance(x, list) else x) for name, x in sorted(kwargs.items())]
+        return _copy(cache.lookup((func.__name__, tuple(key), tuple(options)), evaluate))
+    return memoized
+
+# every public function of the state variables is rebound to its
+# memoized wrapper, with the family read from its argument names
+for _name, _func in list(globals().items()):
+    if _name.startswith('_') or _name.startswith('batch') or not isinstance(_func, type(_memoized)) \
+       or _func.__module__ != __name__:
+        continue
+    _args = _func.__code__.co_varnames[:2]
+    if _args in [('P', 'T'), ('P', 'h'), ('P', 's'), ('h', 's')]:
+        globals()[_name] = _memoized(_func, _args[0] + _args[1], 2)
+    elif _args[:1] in [('P',), ('T',)] and _func.__code__.co_argcount == 1:
+        globals()[_name] = _memoized(_func, 'sat', 1)
+del _name, _func, _args
@@ -1,3 +1,5 @@
+from if97.common import asarray, evaluator
+
 ###########################################################
 #####       Constants and Dimensionless Functions     #####
 ###########################################################
@@ -40,71 +42,116 @@ Ps_bs = 1.0        #[Mpa]
 Ts_bs = 1.0        #[K]
 ss_bs = 1.0        #[kJ / kg K]
 
+# constants and non-dimenionalization;
+# Region 1, backwards equations for (h, s)
+I_hs = [0, 0, 0, 0, 0, 0, 0,  0, 1, 1, 1, 1, 2, 2,  2, 3, 4, 4, 5]
+J_hs = [0, 1, 2, 4, 5, 6, 8, 14, 0, 1, 4, 6, 0, 1, 10, 4, 1, 4, 0]
+n_hs = [-0.691997014660582,    -0.183612548787560e2, -0.928332409297335e1,  0.659639569909906e2, -0.162060388912024e2,   0.450620017338667e3,
+         0.854680678224170e3,   0.607523214001162e4,  0.326487682621856e2, -0.269408844582931e2, -0.319947848334300e3,  -0.928354307043320e3,
+         0.303634537455249e2,  -0.650540422444146e2, -0.430991316516130e4, -0.747512324096068e3,  0.730000345529245e3,   0.114284032569021e4,
+        -0.436407041874559e3]
+Ps_hs = 100.0      #[Mpa]
+hs_hs = 3400.0     #[kJ / kg]
+ss_hs = 7.6        #[kJ / kg K]
+
 # boundaries defining Region 1
 Tbnd01 = 273.16     #[K]
 Tbnd13 = 623.15     #[K]
 Pbnd0  = 1.0e-6     #[MPa]
 Pbnd1  = 100        #[MPa]
 
+# term evaluators of the forward and backward equations
+gamma_series = evaluator(I, J, n)
+bh_series    = evaluator(I_bh, J_bh, n_bh, order = 0)
+bs_series    = evaluator(I_bs, J_bs, n_bs, order = 0)
+hs_series    = evaluator(I_hs, J_hs, n_hs, order = 0)
+
 #### dimensionless functions ####
 def gamma(pi, tau):
     """ Dimensionless form for the specific Gibbs free energy"""
+    x = 7.1 - pi
+    y = tau - 1.222
+
     sum = 0
     for Ii, Ji, ni in zip(I, J, n):
-        sum += ni * (7.1 - pi)**Ii * (tau - 1.222)**Ji
+        sum += ni * x**Ii * y**Ji
     return sum
 def gamma_pi(pi, tau):
     """ Derivative of dimensionless form for the 
         specific Gibbs free energy w.r.t. dimensionless 
         pressure (pi)"""
+    x = 7.1 - pi
+    y = tau - 1.222
+
     sum = 0
     for Ii, Ji, ni in zip(I, J, n):
-        sum += -ni * Ii * (7.1 - pi)**(Ii - 1) * (tau - 1.222)**Ji
+        sum += -ni * Ii * x**(Ii - 1) * y**Ji
     return sum
 def gamma_pipi(pi, tau):
     """ Derivative (second) of dimensionless form for the 
         specific Gibbs free energy w.r.t. dimensionless 
         pressure (pi)"""   
+    x = 7.1 - pi
+    y = tau - 1.222
+
     sum = 0
     for Ii, Ji, ni in zip(I, J, n):
-        sum += ni * Ii * (Ii - 1) * (7.1 - pi)**(Ii - 2) * (tau - 1.222)**Ji
+        sum += ni * Ii * (Ii - 1) * x**(Ii - 2) * y**Ji
     return sum
 def gamma_tau(pi, tau):
     """ Derivative of dimensionless form for the 
         specific Gibbs free energy w.r.t. dimensionless 
         temperature (tau)"""
+    x = 7.1 - pi
+    y = tau - 1.222
+
     sum = 0
     for Ii, Ji, ni in zip(I, J, n):
-        sum += ni * (7.1 - pi)**Ii * Ji * (tau - 1.222)**(Ji - 1)
+        sum += ni * x**Ii * Ji * y**(Ji - 1)
     return sum
 def gamma_tautau(pi, tau):
     """ Derivative (second) of dimensionless form for the 
         specific Gibbs free energy w.r.t. dimensionless 
         temperature (tau)"""
+    x = 7.1 - pi
+    y = tau - 1.222
+
     sum = 0
     for Ii, Ji, ni in zip(I, J, n):
-        sum += ni * (7.1 - pi)**Ii * Ji * (Ji - 1) * (tau - 1.222)**(Ji - 2)
+        sum += ni * x**Ii * Ji * (Ji - 1) * y**(Ji - 2)
     return sum
 def gamma_pitau(pi, tau):
     """ Derivative (second) of dimensionless form for the 
         specific Gibbs free energy w.r.t. dimensionless 
         pressure (pi) and temperature (tau)"""
+    x = 7.1 - pi
+    y = tau - 1.222
+
     sum = 0
     for Ii, Ji, ni in zip(I, J, n):
-        sum += -ni * Ii * (7.1 - pi)**(Ii - 1) * Ji * (tau - 1.222)**(Ji - 1)
+        sum += -ni * Ii * x**(Ii - 1) * Ji * y**(Ji - 1)
     return sum
+def gammas(pi, tau):
+    """ Dimensionless form for the specific Gibbs free energy and
+        its first and second derivatives w.r.t. dimensionless 
+        pressure (pi) and temperature (tau), evaluated together 
+        from shared powers of each term;
+        returns gamma, gamma_pi, gamma_pipi, gamma_tau, gamma_tautau, gamma_pitau"""
+    G, G_x, G_xx, G_tau, G_tautau, G_xtau = gamma_series(7.1 - pi, tau - 1.222)
+
+    return G, -G_x, G_xx, G_tau, G_tautau, -G_xtau
 def theta_T(pi, eta):
     """ Dimensionless form for the temperature as a function of pressure and enthalpy"""
-    sum = 0
-    for Ii, Ji, ni in zip(I_bh, J_bh, n_bh):
-        sum += ni * pi**Ii * (eta + 1.0)**Ji
-    return sum
+
+    return bh_series(pi, eta + 1.0)
 def theta_s(pi, sigma):
     """ Dimensionless form for the temperature as a function of pressure and entropy"""
-    sum = 0
-    for Ii, Ji, ni in zip(I_bs, J_bs, n_bs):
-        sum += ni * pi**Ii * (sigma + 2.0)**Ji
-    return sum
+
+    return bs_series(pi, sigma + 2.0)
+def pi_hs(eta, sigma):
+    """ Dimensionless form for the pressure as a function of enthalpy and entropy"""
+
+    return hs_series(eta + 0.05, sigma + 0.05)
 
 ###########################################################
 #####          Pressure-Temperature Formulation       #####
@@ -113,64 +160,103 @@ def theta_s(pi, sigma):
 #### region 1 properties ####
 def g(P, T):
     """ Specific gibbs free energy [kJ / kg]"""
+    P, T = asarray(P), asarray(T)
     pi = P / Ps
     tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau = gammas(pi, tau)
 
-    return gamma(pi, tau) * R * T
+    return G * R * T
 def v(P, T):
     """ Specific volume [m^3 / kg]"""
+    P, T = asarray(P), asarray(T)
     pi = P / Ps
     tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau = gammas(pi, tau)
 
-    return pi * gamma_pi(pi, tau) * R * T / (P * 10**6 / 1000)
+    return pi * G_pi * R * T / (P * 10**6 / 1000)
 def u(P, T):
     """ Specific internal energy [kJ / kg]"""
+    P, T = asarray(P), asarray(T)
     pi = P / Ps
     tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau = gammas(pi, tau)
 
-    return (tau * gamma_tau(pi, tau) - pi * gamma_pi(pi, tau)) * R * T    
+    return (tau * G_tau - pi * G_pi) * R * T    
 def s(P, T):
     """ Specific entropy [kJ / kg K]"""
+    P, T = asarray(P), asarray(T)
     pi = P / Ps
     tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau = gammas(pi, tau)
 
-    return (tau * gamma_tau(pi, tau) - gamma(pi, tau)) * R
+    return (tau * G_tau - G) * R
 def h(P, T):
     """ Specific enthalpy [kJ / kg]"""
+    P, T = asarray(P), asarray(T)
     pi = P / Ps
     tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau = gammas(pi, tau)
 
-    return tau * gamma_tau(pi, tau) * R * T
+    return tau * G_tau * R * T
 def cp(P, T):
     """ Specific isobaric heat capacity [kJ / kg K]"""
+    P, T = asarray(P), asarray(T)
     pi = P / Ps
     tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau = gammas(pi, tau)
 
-    return -tau**2 * gamma_tautau(pi, tau) * R
+    return -tau**2 * G_tautau * R
 def cv(P, T):
     """ Specific isochoric heat capacity [kJ / kg K]"""
+    P, T = asarray(P), asarray(T)
     pi = P / Ps
     tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau = gammas(pi, tau)
 
-    return (-tau**2 * gamma_tautau(pi, tau) + (gamma_pi(pi, tau) - tau * gamma_pitau(pi, tau))**2 / gamma_pipi(pi, tau)) * R
+    return (-tau**2 * G_tautau + (G_pi - tau * G_pitau)**2 / G_pipi) * R
 def w(P, T):
     """ Speed of sound [m / s]"""
+    P, T = asarray(P), asarray(T)
     pi = P / Ps
     tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau = gammas(pi, tau)
 
-    return (gamma_pi(pi, tau)**2 * R * T * 1000 / ((gamma_pi(pi, tau) - tau * gamma_pitau(pi, tau))**2 / (tau**2 * gamma_tautau(pi, tau)) - gamma_pipi(pi, tau)))**0.5
+    return (G_pi**2 * R * T * 1000 / ((G_pi - tau * G_pitau)**2 / (tau**2 * G_tautau) - G_pipi))**0.5
 def a(P, T):
     """Isobaric cubic expansion coefficient [1 / K]"""
+    P, T = asarray(P), asarray(T)
     pi = P / Ps
     tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau = gammas(pi, tau)
 
-    return (1 - tau * gamma_pitau(pi, tau) / gamma_pi(pi, tau)) / T
+    return (1 - tau * G_pitau / G_pi) / T
 def k(P, T):
     """Isothermal compressibility [kg / kJ]"""
+    P, T = asarray(P), asarray(T)
     pi = P / Ps
     tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau = gammas(pi, tau)
 
-    return -(pi * gamma_pipi(pi, tau) / gamma_pi(pi, tau)) / (P * 10**6 / 1000)
+    return -(pi * G_pipi / G_pi) / (P * 10**6 / 1000)
+def properties(P, T):
+    """ Every property above evaluated from a single sweep of
+    gamma; returned as a dict keyed on the property names"""
+    P, T = asarray(P), asarray(T)
+    pi = P / Ps
+    tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau = gammas(pi, tau)
+
+    return {'P': P, 'T': T,
+            'g': G * R * T,
+            'v': pi * G_pi * R * T / (P * 10**6 / 1000),
+            'u': (tau * G_tau - pi * G_pi) * R * T,
+            's': (tau * G_tau - G) * R,
+            'h': tau * G_tau * R * T,
+            'cp': -tau**2 * G_tautau * R,
+            'cv': (-tau**2 * G_tautau + (G_pi - tau * G_pitau)**2 / G_pipi) * R,
+            'w': (G_pi**2 * R * T * 1000 / ((G_pi - tau * G_pitau)**2 / (tau**2 * G_tautau) - G_pipi))**0.5,
+            'a': (1 - tau * G_pitau / G_pi) / T,
+            'k': -(pi * G_pipi / G_pi) / (P * 10**6 / 1000)}
 
 #### region 1 property derivatives ####
 def dgdP(P, T):
@@ -186,6 +272,7 @@ def dvdP(P, T):
 def dudP(P, T):
     """ Derivative of specific internal energy [kJ m^3 / kg kJ]
     w.r.t pressure at constant temperature"""
+    P, T = asarray(P), asarray(T)
 
     return v(P, T) * ((P * 10**6 / 1000) * k(P, T) - T * a(P, T))
 def dsdP(P, T):
@@ -196,6 +283,7 @@ def dsdP(P, T):
 def dhdP(P, T):
     """ Derivative of specific enthalpy [kJ m^3 / kg kJ]
     w.r.t pressure at constant temperature"""
+    P, T = asarray(P), asarray(T)
 
     return v(P, T) * (1 - T * a(P, T))
 
@@ -212,11 +300,13 @@ def dvdT(P, T):
 def dudT(P, T):
     """ Derivative of specific internal energy [kJ / kg K]
     w.r.t temperature at constant pressure"""
+    P, T = asarray(P), asarray(T)
 
     return cp(P, T) - (P * 10**6 / 1000) * v(P, T) * a(P, T)
 def dsdT(P, T):
     """ Derivative of specific entropy [kJ / kg K K]
     w.r.t temperature at constant pressure"""
+    P, T = asarray(P), asarray(T)
 
     return cp(P, T) / T
 def dhdT(P, T):
@@ -224,6 +314,20 @@ def dhdT(P, T):
     w.r.t temperature at constant pressure"""
 
     return cp(P, T)
+def derivatives(P, T):
+    """ Every derivative above, and those of temperature, from a single
+    sweep of gamma; returned as a dict keyed on the function names"""
+    props = properties(P, T)
+    P, T = props['P'], props['T']
+    v, s, cp, a, k = props['v'], props['s'], props['cp'], props['a'], props['k']
+    Pk = P * 10**6 / 1000
+
+    return {'dgdP': v,                     'dgdT': -s,
+            'dvdP': -v * k,                'dvdT': v * a,
+            'dudP': v * (Pk * k - T * a),  'dudT': cp - Pk * v * a,
+            'dsdP': -v * a,                'dsdT': cp / T,
+            'dhdP': v * (1 - T * a),       'dhdT': cp,
+            'dTdP': 0.0,                   'dTdT': 1.0}
 
 ###########################################################
 #####          Pressure-Enthalpy Formulation          #####
@@ -248,6 +352,7 @@ def s_h(P, h):
     return s(P, T_h(P, h))
 def T_h(P, h):
     """ Temperature [K]"""
+    P, h = asarray(P), asarray(h)
     pi = P / Ps_bh
     eta = h / hs_bh
 
@@ -272,69 +377,76 @@ def k_h(P, h):
     """Isothermal compressibility [kg / kJ]"""
 
     return k(P, T_h(P, h))
+def properties_h(P, h):
+    """ Every property above evaluated from a single sweep of gamma"""
+
+    return properties(P, T_h(P, h))
 
 #### region 1 property derivatives ####
 def dgdP_h(P, h):
     """ Derivative of specific gibbs free energy [kJ m^3 / kg kJ]
     w.r.t pressure at constant specific enthalpy"""
-    T = T_h(P, h)
 
-    return (dgdP(P, T) * dhdT(P, T) - dgdT(P, T) * dhdP(P, T)) / dhdT(P, T)
+    return derivatives_h(P, h)['dgdP_h']
 def dvdP_h(P, h):
     """ Derivative of specific volume [m^3 m^3 / kg kJ]
     w.r.t pressure at constant specific enthalpy"""
-    T = T_h(P, h)
 
-    return (dvdP(P, T) * dhdT(P, T) - dvdT(P, T) * dhdP(P, T)) / dhdT(P, T)
+    return derivatives_h(P, h)['dvdP_h']
 def dudP_h(P, h):
     """ Derivative of specific internal energy [kJ m^3 / kg kJ]
     w.r.t pressure at constant specific enthalpy"""
-    T = T_h(P, h)
 
-    return (dudP(P, T) * dhdT(P, T) - dudT(P, T) * dhdP(P, T)) / dhdT(P, T)
+    return derivatives_h(P, h)['dudP_h']
 def dsdP_h(P, h):
     """ Derivative of specific entropy [kJ m^3 / kg K kJ]
     w.r.t pressure at constant specific enthalpy"""
-    T = T_h(P, h)
 
-    return (dsdP(P, T) * dhdT(P, T) - dsdT(P, T) * dhdP(P, T)) / dhdT(P, T)
+    return derivatives_h(P, h)['dsdP_h']
 def dTdP_h(P, h):
     """ Derivative of Temperature [K m^3 / kJ]
     w.r.t pressure at constant specific enthalpy"""
-    T = T_h(P, h)
 
-    return -dhdP(P, T) / dhdT(P, T)
+    return derivatives_h(P, h)['dTdP_h']
 
 def dgdh_h(P, h):
     """ Derivative of specific gibbs free energy [kJ kg / kg kJ]
     w.r.t specific enthalpy at constant pressure"""
-    T = T_h(P, h)
 
-    return dgdT(P, T) / dhdT(P, T)
+    return derivatives_h(P, h)['dgdh_h']
 def dvdh_h(P, h):
     """ Derivative of specific volume [m^3 kg / kg kJ]
     w.r.t specific enthalpy at constant pressure"""
-    T = T_h(P, h)
 
-    return dvdT(P, T) / dhdT(P, T)
+    return derivatives_h(P, h)['dvdh_h']
 def dudh_h(P, h):
     """ Derivative of specific internal energy [kJ kg / kg kJ]
     w.r.t specific enthalpy at constant pressure"""
-    T = T_h(P, h)
 
-    return dudT(P, T) / dhdT(P, T)
+    return derivatives_h(P, h)['dudh_h']
 def dsdh_h(P, h):
     """ Derivative of specific entropy [kJ kg / kg K kJ]
     w.r.t specific enthalpy at constant pressure"""
-    T = T_h(P, h)
 
-    return dsdT(P, T) / dhdT(P, T)
+    return derivatives_h(P, h)['dsdh_h']
 def dTdh_h(P, h):
     """ Derivative of Temperature [K kg / kJ]
     w.r.t specific enthalpy at constant pressure"""
-    T = T_h(P, h)
 
-    return 1 / dhdT(P, T)
+    return derivatives_h(P, h)['dTdh_h']
+def derivatives_h(P, h):
+    """ Derivatives of g, v, u, s, h and T w.r.t. pressure at constant
+    enthalpy and w.r.t. enthalpy at constant pressure, from one
+    backward temperature and one derivatives sweep; returned as a
+    dict keyed on the function names"""
+    P, h = asarray(P), asarray(h)
+    d = derivatives(P, T_h(P, h))
+
+    jacobian = {}
+    for X in ['g', 'v', 'u', 's', 'h', 'T']:
+        jacobian['d' + X + 'dP_h'] = (d['d' + X + 'dP'] * d['dhdT'] - d['d' + X + 'dT'] * d['dhdP']) / d['dhdT']
+        jacobian['d' + X + 'dh_h'] = d['d' + X + 'dT'] / d['dhdT']
+    return jacobian
 
 ###########################################################
 #####           Pressure-Entropy Formulation          #####
@@ -355,6 +467,7 @@ def u_s(P, s):
     return u(P, T_s(P, s))   
 def T_s(P, s):
     """ Temperature [K]"""
+    P, s = asarray(P), asarray(s)
     pi = P / Ps_bs
     sigma = s / ss_bs
 
@@ -383,66 +496,97 @@ def k_s(P, s):
     """Isothermal compressibility [kg / kJ]"""
 
     return k(P, T_s(P, s))
+def properties_s(P, s):
+    """ Every property above evaluated from a single sweep of gamma"""
+
+    return properties(P, T_s(P, s))
 
 #### region 1 property derivatives ####
 def dgdP_s(P, s):
     """ Derivative of specific gibbs free energy [kJ m^3 / kg kJ]
     w.r.t pressure at constant specific entropy"""
-    T = T_s(P, s)
 
-    return (dgdP(P, T) * dsdT(P, T) - dgdT(P, T) * dsdP(P, T)) / dsdT(P, T)
+    return derivatives_s(P, s)['dgdP_s']
 def dvdP_s(P, s):
     """ Derivative of specific volume [m^3 m^3 / kg kJ]
     w.r.t pressure at constant specific entropy"""
-    T = T_s(P, s)
 
-    return (dvdP(P, T) * dsdT(P, T) - dvdT(P, T) * dsdP(P, T)) / dsdT(P, T)
+    return derivatives_s(P, s)['dvdP_s']
 def dudP_s(P, s):
     """ Derivative of specific internal energy [kJ m^3 / kg kJ]
     w.r.t pressure at constant specific entropy"""
-    T = T_s(P, s)
 
-    return (dudP(P, T) * dsdT(P, T) - dudT(P, T) * dsdP(P, T)) / dsdT(P, T)
+    return derivatives_s(P, s)['dudP_s']
 def dTdP_s(P, s):
     """ Derivative of Temperature [K m^3 / kJ]
     w.r.t pressure at constant specific entropy"""
-    T = T_s(P, s)
 
-    return -dsdP(P, T) / dsdT(P, T)
+    return derivatives_s(P, s)['dTdP_s']
 def dhdP_s(P, s):
     """ Derivative of specific enthalpy [kJ m^3 / kg kJ]
     w.r.t pressure at constant specific entropy"""
-    T = T_s(P, s)
 
-    return (dhdP(P, T) * dsdT(P, T) - dhdT(P, T) * dsdP(P, T)) / dsdT(P, T)
+    return derivatives_s(P, s)['dhdP_s']
 
 def dgds_s(P, s):
     """ Derivative of specific gibbs free energy [kJ kg K / kg kJ]
     w.r.t specific entropy at constant pressure"""
-    T = T_s(P, s)
 
-    return dgdT(P, T) / dsdT(P, T)
+    return derivatives_s(P, s)['dgds_s']
 def dvds_s(P, s):
     """ Derivative of specific volume [m^3 kg K / kg kJ]
     w.r.t specific entropy at constant pressure"""
-    T = T_s(P, s)
 
-    return dvdT(P, T) / dsdT(P, T)
+    return derivatives_s(P, s)['dvds_s']
 def duds_s(P, s):
     """ Derivative of specific internal energy [kJ kg K / kg kJ]
     w.r.t specific entropy at constant pressure"""
-    T = T_s(P, s)
 
-    return dudT(P, T) / dsdT(P, T)
+    return derivatives_s(P, s)['duds_s']
 def dTds_s(P, s):
     """ Derivative of Temperature [K kg K/ kJ]
     w.r.t specific entropy at constant pressure"""
-    T = T_s(P, s)
 
-    return 1 / dsdT(P, T)
+    return derivatives_s(P, s)['dTds_s']
 def dhds_s(P, s):
     """ Derivative of specific enthalpy [kJ kg K / kg kJ]
     w.r.t specific entropy at constant pressure"""
-    T = T_s(P, s)
 
-    return dhdT(P, T) / dsdT(P, T)
\ No newline at end of file
+    return derivatives_s(P, s)['dhds_s']
+def derivatives_s(P, s):
+    """ Derivatives of g, v, u, s, h and T w.r.t. pressure at constant
+    entropy and w.r.t. entropy at constant pressure, from one
+    backward temperature and one derivatives sweep; returned as a
+    dict keyed on the function names"""
+    P, s = asarray(P), asarray(s)
+    d = derivatives(P, T_s(P, s))
+
+    jacobian = {}
+    for X in ['g', 'v', 'u', 's', 'h', 'T']:
+        jacobian['d' + X + 'dP_s'] = (d['d' + X + 'dP'] * d['dsdT'] - d['d' + X + 'dT'] * d['dsdP']) / d['dsdT']
+        jacobian['d' + X + 'ds_s'] = d['d' + X + 'dT'] / d['dsdT']
+    return jacobian
+
+###########################################################
+#####           Enthalpy-Entropy Formulation          #####
+###########################################################
+
+#### region 1 properties ####
+def P_hs(h, s):
+    """ Pressure [MPa]"""
+    h, s = asarray(h), asarray(s)
+    eta = h / hs_hs
+    sigma = s / ss_hs
+
+    return pi_hs(eta, sigma) * Ps_hs
+def T_hs(h, s):
+    """ Temperature [K]"""
+
+    return T_h(P_hs(h, s), h)
+def properties_hs(h, s):
+    """ Every property above at the backward pressure and temperature,
+    from a single sweep of gamma"""
+    h, s = asarray(h), asarray(s)
+    P = P_hs(h, s)
+
+    return properties(P, T_h(P, h))
@@ -1,4 +1,5 @@
-from math import log
+import numpy
+from if97.common import asarray, evaluator, isarray, log
 
 ###########################################################
 #####       Constants and Dimensionless Functions     #####
@@ -102,13 +103,60 @@ ss_bsa = 2.0     #[kJ / kg K]
 ss_bsb = 0.7853  #[kJ / kg K]
 ss_bsc = 2.9251  #[kJ / kg K]
 
+# constants and non-dimenionalization;
+# Region 2, backwards equations for (h, s)
+Ia_hs = [0, 0, 0,  0,  0,  0, 1, 1, 1, 1, 1, 1,  1,  1,  1,  1, 2,  2,  2, 3, 3, 3, 3,  3,  4, 5,  5, 6, 7]
+Ja_hs = [1, 3, 6, 16, 20, 22, 0, 1, 2, 3, 5, 6, 10, 16, 20, 22, 3, 16, 20, 0, 2, 3, 6, 16, 16, 3, 16, 3, 1]
+na_hs = [-0.182575361923032e-1, -0.125229548799536,    0.592290437320145,    0.604769706185122e1,  0.238624965444474e3, -0.298639090222922e3,
+          0.512250813040750e-1, -0.437266515606486,    0.413336902999504,   -0.516468254574773e1, -0.557014838445711e1,  0.128555037824478e2,
+          0.114144108953290e2,  -0.119504225652714e3,  -0.284777985961560e4,  0.431757846408006e4,  0.112894040802650e1,  0.197409186206319e4,
+          0.151612444706087e4,   0.141324451421235e-1,  0.585501282219601,   -0.297258075863012e1,  0.594567314847319e1, -0.623656565798905e4,
+          0.965986235133332e4,   0.681500934948134e1,  -0.633207286824997e4,  -0.558919224465760e1,  0.400645798472063e-1]
+Ib_hs = [0, 0, 0, 0, 0, 1, 1, 1, 1, 1,  1, 2, 2,  2, 3, 3, 3,  3, 4,  4, 5,  5, 6, 6,  6, 7,  7, 8, 8,  8,  8, 12, 14]
+Jb_hs = [0, 1, 2, 4, 8, 0, 1, 2, 3, 5, 12, 1, 6, 18, 0, 1, 7, 12, 1, 16, 1, 12, 1, 8, 18, 1, 16, 1, 3, 14, 18, 10, 16]
+nb_hs = [ 0.801496989929495e-1, -0.543862807146111,    0.337455597421283,    0.890555451157450e1,  0.313840736431485e3,  0.797367065977789,
+         -0.121616973556240e1,   0.872803386937477e1,  -0.169769781757602e2,  -0.186552827328416e3,  0.951159274344237e5, -0.189168510120494e2,
+         -0.433407037194840e4,   0.543212633012715e9,   0.144793408386013,    0.128024559637516e3, -0.672309534071268e5,  0.336972380095287e8,
+         -0.586634196762720e3,  -0.221403224769889e11,  0.171606668708389e4,  -0.570817595806302e9, -0.312109693178482e4, -0.207841384633010e7,
+          0.305605946157786e13,  0.322157004314333e4,   0.326810259797295e12, -0.144104158934487e4,  0.410694867802691e3,  0.109077066873024e12,
+         -0.247964654258893e14,  0.188801906865134e10, -0.123651009018773e15]
+Ic_hs = [0, 0, 0, 0, 0, 0, 1, 1, 1, 1,  1, 2, 2, 2,  2,  2, 3, 3, 3,  3,  3,  4, 5, 5, 5,  5, 6,  6, 10, 12, 16]
+Jc_hs = [0, 1, 2, 3, 4, 8, 0, 2, 5, 8, 14, 2, 3, 7, 10, 18, 0, 5, 8, 16, 18, 18, 1, 4, 6, 14, 8, 18,  7,  7, 10]
+nc_hs = [ 0.112225607199012,    -0.339005953606712e1,  -0.320503911730094e2,  -0.197597305104900e3, -0.407693861553446e3,  0.132943775222331e5,
+          0.170846839774007e1,   0.373694198142245e2,   0.358144365815434e4,   0.423014446424664e6, -0.751071025760063e9,  0.523446127607898e2,
+         -0.228351290812417e3,  -0.960652417056937e6,  -0.807059292526074e8,   0.162698017225669e13, 0.772465073604171,    0.463929973837746e5,
+         -0.137317885134128e8,   0.170470392630512e13, -0.251104628187308e14,  0.317748830835520e14, 0.538685623675312e2, -0.553089094625169e5,
+         -0.102861522421405e7,   0.204249418756234e13,  0.273918446626977e9,  -0.263963146312685e16, -0.107890854108088e10, -0.296492620980124e11,
+         -0.111754907323424e16]
+Ps_hsa = 4.0     #[Mpa]
+Ps_hsb = 100.0   #[Mpa]
+Ps_hsc = 100.0   #[Mpa]
+hs_hsa = 4200.0  #[kJ / kg]
+hs_hsb = 4100.0  #[kJ / kg]
+hs_hsc = 3500.0  #[kJ / kg]
+ss_hsa = 12.0    #[kJ / kg K]
+ss_hsb = 7.9     #[kJ / kg K]
+ss_hsc = 5.9     #[kJ / kg K]
+
+# boundary between subregions 2a and 2b for (h, s)
+nbnd_hs = [-0.349898083432139e4, 0.257560716905876e4, -0.421073558227969e3, 0.276349063799944e2]
+
 # Boundaries defining Region 2, and subregions 2a, 2b, 2c
 def bnd2b2c(P):
     """ Boundary between region 2b and 2c"""
+    P = asarray(P)
     pi = P / Ps_br
     eta = n[3] + ((pi - n[4]) / n[2])**0.5 
     return eta * hs_br
 def idRegion_h(P, h):
+    """ Subregion 2a (1), 2b (2) or 2c (3) of the backward
+    equations using pressure and enthalpy"""
+    if isarray(P, h):
+        P, h = numpy.broadcast_arrays(P, h)
+        with numpy.errstate(invalid = 'ignore'):
+            hbnd = bnd2b2c(P)
+        return numpy.select([P <= 4.0, P <= 6.54670, h >= hbnd], [1, 2, 2], 3)
+
     if P <= 4.0:
         return 1
     elif P <= 6.54670:
@@ -118,6 +166,12 @@ def idRegion_h(P, h):
     else:
         return 3
 def idRegion_s(P, s):
+    """ Subregion 2a (1), 2b (2) or 2c (3) of the backward
+    equations using pressure and entropy"""
+    if isarray(P, s):
+        P, s = numpy.broadcast_arrays(P, s)
+        return numpy.select([P <= 4.0, P <= 6.54670, s >= 5.85], [1, 2, 2], 3)
+
     if P <= 4.0:
         return 1
     elif P <= 6.54670:
@@ -126,8 +180,41 @@ def idRegion_s(P, s):
         return 2
     else:
         return 3
+def bnd2a2b_hs(s):
+    """ Boundary enthalpy between subregions 2a and 2b
+    of the backward equations using enthalpy and entropy"""
+    s = asarray(s)
+
+    return nbnd_hs[0] + nbnd_hs[1] * s + nbnd_hs[2] * s**2 + nbnd_hs[3] * s**3
+def idRegion_hs(h, s):
+    """ Subregion 2a (1), 2b (2) or 2c (3) of the backward
+    equations using enthalpy and entropy"""
+    if isarray(h, s):
+        h, s = numpy.broadcast_arrays(h, s)
+        return numpy.select([h <= bnd2a2b_hs(s), s >= 5.85], [1, 2], 3)
+
+    if h <= bnd2a2b_hs(s):
+        return 1
+    elif s >= 5.85:
+        return 2
+    else:
+        return 3
 Tbnd25 = 1073.15
 
+# term evaluators of the forward and backward equations;
+# the ideal-gas part is a series in tau alone
+gamma0_series = evaluator([0] * len(J0), J0, n0)
+gammaR_series = evaluator(Ir, Jr, nr)
+ah_series = evaluator(Ia_h, Ja_h, na_h, order = 0)
+bh_series = evaluator(Ib_h, Jb_h, nb_h, order = 0)
+ch_series = evaluator(Ic_h, Jc_h, nc_h, order = 0)
+as_series = evaluator(Ia_s, Ja_s, na_s, order = 0)
+bs_series = evaluator(Ib_s, Jb_s, nb_s, order = 0)
+cs_series = evaluator(Ic_s, Jc_s, nc_s, order = 0)
+ahs_series = evaluator(Ia_hs, Ja_hs, na_hs, order = 0)
+bhs_series = evaluator(Ib_hs, Jb_hs, nb_hs, order = 0)
+chs_series = evaluator(Ic_hs, Jc_hs, nc_hs, order = 0)
+
 #### dimensionless functions ####
 def gamma(pi, tau):
     """ Dimensionless form for the specific Gibbs free energy"""
@@ -214,27 +301,34 @@ def gammaR_pitau(pi, tau):
     for Ii, Ji, ni in zip(Ir, Jr, nr):
         sum += ni * Ii * pi**(Ii - 1) * Ji * (tau - 0.5)**(Ji - 1)
     return sum
+def gammas(pi, tau):
+    """ Dimensionless form for the specific Gibbs free energy and
+        its first and second derivatives w.r.t. dimensionless 
+        pressure (pi) and temperature (tau), evaluated together 
+        from shared powers of the ideal-gas and residual terms;
+        returns gamma, gamma_pi, gamma_pipi, gamma_tau, gamma_tautau, gamma_pitau,
+        and the residual parts gammaR_pi, gammaR_pipi, gammaR_pitau"""
+    G0, G0_x, G0_xx, G0_tau, G0_tautau, G0_xtau = gamma0_series(1.0, tau)
+    GR, GR_pi, GR_pipi, GR_tau, GR_tautau, GR_pitau = gammaR_series(pi, tau - 0.5)
+    G0 += log(pi)
+
+    return G0 + GR, 1 / pi + GR_pi, -1 / pi**2 + GR_pipi, G0_tau + GR_tau, G0_tautau + GR_tautau, GR_pitau, \
+           GR_pi, GR_pipi, GR_pitau
 def theta2a_h(pi, eta):
     """ Dimensionless form for the temperature 
         as a function of pressure and enthalpy (2a)"""
-    sum = 0
-    for Ii, Ji, ni in zip(Ia_h, Ja_h, na_h):
-        sum += ni * pi**Ii * (eta - 2.1)**Ji
-    return sum
+
+    return ah_series(pi, eta - 2.1)
 def theta2b_h(pi, eta):
     """ Dimensionless form for the temperature 
         as a function of pressure and enthalpy (2b)"""
-    sum = 0
-    for Ii, Ji, ni in zip(Ib_h, Jb_h, nb_h):
-        sum += ni * (pi - 2)**Ii * (eta - 2.6)**Ji
-    return sum
+
+    return bh_series(pi - 2, eta - 2.6)
 def theta2c_h(pi, eta):
     """ Dimensionless form for the temperature 
         as a function of pressure and enthalpy (2c)"""
-    sum = 0
-    for Ii, Ji, ni in zip(Ic_h, Jc_h, nc_h):
-        sum += ni * (pi + 25)**Ii * (eta - 1.8)**Ji
-    return sum
+
+    return ch_series(pi + 25, eta - 1.8)
 def theta_h(pi, eta):
     """ Dimensionless form for the temperature 
         as a function of pressure and enthalpy"""
@@ -242,33 +336,37 @@ def theta_h(pi, eta):
     h = eta * hs_bh
     region = idRegion_h(P, h)
 
-    if region is 1:
+    # array inputs evaluate each subregion on its own slice
+    if isarray(region):
+        pi, eta = numpy.broadcast_arrays(pi, eta)
+        theta = numpy.empty(region.shape)
+        for key, subregion in [(1, theta2a_h), (2, theta2b_h), (3, theta2c_h)]:
+            mask = region == key
+            if mask.any():
+                theta[mask] = subregion(pi[mask], eta[mask])
+        return theta
+
+    if region == 1:
         return theta2a_h(pi, eta)
-    elif region is 2:
+    elif region == 2:
         return theta2b_h(pi, eta)
     else:
         return theta2c_h(pi, eta)
 def theta2a_s(pi, sigma):
     """ Dimensionless form for the temperature 
         as a function of pressure and entropy (2a)"""
-    sum = 0
-    for Ii, Ji, ni in zip(Ia_s, Ja_s, na_s):
-        sum += ni * pi**Ii * (sigma - 2)**Ji
-    return sum
+
+    return as_series(pi, sigma - 2)
 def theta2b_s(pi, sigma):
     """ Dimensionless form for the temperature 
         as a function of pressure and entropy (2b)"""
-    sum = 0
-    for Ii, Ji, ni in zip(Ib_s, Jb_s, nb_s):
-        sum += ni * pi**Ii * (10 - sigma)**Ji
-    return sum
+
+    return bs_series(pi, 10 - sigma)
 def theta2c_s(pi, sigma):
     """ Dimensionless form for the temperature 
         as a function of pressure and entropy (2c)"""
-    sum = 0
-    for Ii, Ji, ni in zip(Ic_s, Jc_s, nc_s):
-        sum += ni * pi**Ii * (2 - sigma)**Ji
-    return sum
+
+    return cs_series(pi, 2 - sigma)
 def theta_s(pi, sigma):
     """ Dimensionless form for the temperature 
         as a function of pressure and entropy"""
@@ -276,12 +374,37 @@ def theta_s(pi, sigma):
     s = sigma * ss_bsa
     region = idRegion_s(P, s)
 
-    if region is 1:
+    # array inputs evaluate each subregion on its own slice
+    if isarray(region):
+        pi, sigma, s = numpy.broadcast_arrays(pi, sigma, s)
+        theta = numpy.empty(region.shape)
+        for key, subregion, reduced in [(1, theta2a_s, sigma), (2, theta2b_s, s / ss_bsb), (3, theta2c_s, s / ss_bsc)]:
+            mask = region == key
+            if mask.any():
+                theta[mask] = subregion(pi[mask], reduced[mask])
+        return theta
+
+    if region == 1:
         return theta2a_s(pi, sigma)
-    elif region is 2:
+    elif region == 2:
         return theta2b_s(pi, s / ss_bsb)
     else:
         return theta2c_s(pi, s / ss_bsc)
+def pi2a_hs(eta, sigma):
+    """ Dimensionless form for the pressure 
+        as a function of enthalpy and entropy (2a)"""
+
+    return ahs_series(eta - 0.5, sigma - 1.2)**4
+def pi2b_hs(eta, sigma):
+    """ Dimensionless form for the pressure 
+        as a function of enthalpy and entropy (2b)"""
+
+    return bhs_series(eta - 0.6, sigma - 1.01)**4
+def pi2c_hs(eta, sigma):
+    """ Dimensionless form for the pressure 
+        as a function of enthalpy and entropy (2c)"""
+
+    return chs_series(eta - 0.7, sigma - 1.1)**4
 
 ###########################################################
 #####          Pressure-Temperature Formulation       #####
@@ -290,64 +413,103 @@ def theta_s(pi, sigma):
 #### region 2 properties ####
 def g(P, T):
     """ Specific Gibbs free energy [kJ / kg]"""
+    P, T = asarray(P), asarray(T)
     pi = P / Ps
     tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau, GR_pi, GR_pipi, GR_pitau = gammas(pi, tau)
 
-    return gamma(pi, tau) * R * T
+    return G * R * T
 def v(P, T):
     """ Specific volume [m^3 / kg]"""
+    P, T = asarray(P), asarray(T)
     pi = P / Ps
     tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau, GR_pi, GR_pipi, GR_pitau = gammas(pi, tau)
 
-    return pi * gamma_pi(pi, tau) * R * T / (P * 10**6 / 1000)
+    return pi * G_pi * R * T / (P * 10**6 / 1000)
 def u(P, T):
     """ Specific internal energy [kJ / kg]"""
+    P, T = asarray(P), asarray(T)
     pi = P / Ps
     tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau, GR_pi, GR_pipi, GR_pitau = gammas(pi, tau)
 
-    return (tau * gamma_tau(pi, tau) - pi * gamma_pi(pi, tau)) * R * T    
+    return (tau * G_tau - pi * G_pi) * R * T    
 def s(P, T):
     """ Specific entropy [kJ / kg K]"""
+    P, T = asarray(P), asarray(T)
     pi = P / Ps
     tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau, GR_pi, GR_pipi, GR_pitau = gammas(pi, tau)
 
-    return (tau * gamma_tau(pi, tau) - gamma(pi, tau)) * R
+    return (tau * G_tau - G) * R
 def h(P, T):
     """ Specific enthalpy [kJ / kg]"""
+    P, T = asarray(P), asarray(T)
     pi = P / Ps
     tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau, GR_pi, GR_pipi, GR_pitau = gammas(pi, tau)
 
-    return tau * gamma_tau(pi, tau) * R * T
+    return tau * G_tau * R * T
 def cp(P, T):
     """ Specific isobaric heat capacity [kJ / kg K]"""
+    P, T = asarray(P), asarray(T)
     pi = P / Ps
     tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau, GR_pi, GR_pipi, GR_pitau = gammas(pi, tau)
 
-    return -tau**2 * gamma_tautau(pi, tau) * R
+    return -tau**2 * G_tautau * R
 def cv(P, T):
     """ Specific isochoric heat capacity [kJ / kg K]"""
+    P, T = asarray(P), asarray(T)
     pi = P / Ps
     tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau, GR_pi, GR_pipi, GR_pitau = gammas(pi, tau)
 
-    return (-tau**2 * gamma_tautau(pi, tau) - (1 + pi * gammaR_pi(pi, tau) - tau * gammaR_pitau(pi, tau))**2 / (1 - pi**2 * gammaR_pipi(pi, tau))) * R
+    return (-tau**2 * G_tautau - (1 + pi * GR_pi - tau * pi * GR_pitau)**2 / (1 - pi**2 * GR_pipi)) * R
 def w(P, T):
     """ Speed of sound [m / s]"""
+    P, T = asarray(P), asarray(T)
     pi = P / Ps
     tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau, GR_pi, GR_pipi, GR_pitau = gammas(pi, tau)
 
-    return (R * T * 1000 * (1 + 2 * pi * gammaR_pi(pi, tau) + pi**2 * gammaR_pi(pi, tau)**2) / ((1 - pi**2 * gammaR_pipi(pi, tau)) + (1 + pi * gammaR_pi(pi, tau) - tau * pi * gamma_pitau(pi, tau))**2 / (tau**2 * gamma_tautau(pi, tau))))**0.5
+    return (R * T * 1000 * (1 + 2 * pi * GR_pi + pi**2 * GR_pi**2) / ((1 - pi**2 * GR_pipi) + (1 + pi * GR_pi - tau * pi * G_pitau)**2 / (tau**2 * G_tautau)))**0.5
 def a(P, T):
     """Isobaric cubic expansion coefficient [1 / K]"""
+    P, T = asarray(P), asarray(T)
     pi = P / Ps
     tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau, GR_pi, GR_pipi, GR_pitau = gammas(pi, tau)
 
-    return ((1 + pi * gammaR_pi(pi, tau) - tau * pi* gammaR_pitau(pi, tau)) / (1 + pi * gammaR_pi(pi, tau))) / T
+    return ((1 + pi * GR_pi - tau * pi * GR_pitau) / (1 + pi * GR_pi)) / T
 def k(P, T):
     """Isothermal compressibility [kg / kJ]"""
+    P, T = asarray(P), asarray(T)
     pi = P / Ps
     tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau, GR_pi, GR_pipi, GR_pitau = gammas(pi, tau)
 
-    return ((1 - pi**2 * gammaR_pipi(pi, tau)) / (1 + pi * gammaR_pi(pi, tau))) / (P * 10**6 / 1000)
+    return ((1 - pi**2 * GR_pipi) / (1 + pi * GR_pi)) / (P * 10**6 / 1000)
+def properties(P, T):
+    """ Every property above evaluated from a single sweep of
+    gamma; returned as a dict keyed on the property names"""
+    P, T = asarray(P), asarray(T)
+    pi = P / Ps
+    tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau, GR_pi, GR_pipi, GR_pitau = gammas(pi, tau)
+
+    return {'P': P, 'T': T,
+            'g': G * R * T,
+            'v': pi * G_pi * R * T / (P * 10**6 / 1000),
+            'u': (tau * G_tau - pi * G_pi) * R * T,
+            's': (tau * G_tau - G) * R,
+            'h': tau * G_tau * R * T,
+            'cp': -tau**2 * G_tautau * R,
+            'cv': (-tau**2 * G_tautau - (1 + pi * GR_pi - tau * pi * GR_pitau)**2 / (1 - pi**2 * GR_pipi)) * R,
+            'w': (R * T * 1000 * (1 + 2 * pi * GR_pi + pi**2 * GR_pi**2) / ((1 - pi**2 * GR_pipi) + (1 + pi * GR_pi - tau * pi * G_pitau)**2 / (tau**2 * G_tautau)))**0.5,
+            'a': ((1 + pi * GR_pi - tau * pi * GR_pitau) / (1 + pi * GR_pi)) / T,
+            'k': ((1 - pi**2 * GR_pipi) / (1 + pi * GR_pi)) / (P * 10**6 / 1000)}
 
 #### region 2 property derivatives ####
 def dgdP(P, T):
@@ -363,6 +525,7 @@ def dvdP(P, T):
 def dudP(P, T):
     """ Derivative of specific internal energy [kJ m^3 / kg kJ]
     w.r.t pressure at constant temperature"""
+    P, T = asarray(P), asarray(T)
 
     return v(P, T) * ((P * 10**6 / 1000) * k(P, T) - T * a(P, T))
 def dsdP(P, T):
@@ -373,6 +536,7 @@ def dsdP(P, T):
 def dhdP(P, T):
     """ Derivative of specific enthalpy [kJ m^3 / kg kJ]
     w.r.t pressure at constant temperature"""
+    P, T = asarray(P), asarray(T)
 
     return v(P, T) * (1 - T * a(P, T))
 
@@ -389,11 +553,13 @@ def dvdT(P, T):
 def dudT(P, T):
     """ Derivative of specific internal energy [kJ / kg K]
     w.r.t temperature at constant pressure"""
+    P, T = asarray(P), asarray(T)
 
     return cp(P, T) - (P * 10**6 / 1000) * v(P, T) * a(P, T)
 def dsdT(P, T):
     """ Derivative of specific entropy [kJ / kg K K]
     w.r.t temperature at constant pressure"""
+    P, T = asarray(P), asarray(T)
 
     return cp(P, T) / T
 def dhdT(P, T):
@@ -401,6 +567,20 @@ def dhdT(P, T):
     w.r.t temperature at constant pressure"""
 
     return cp(P, T)
+def derivatives(P, T):
+    """ Every derivative above, and those of temperature, from a single
+    sweep of gamma; returned as a dict keyed on the function names"""
+    props = properties(P, T)
+    P, T = props['P'], props['T']
+    v, s, cp, a, k = props['v'], props['s'], props['cp'], props['a'], props['k']
+    Pk = P * 10**6 / 1000
+
+    return {'dgdP': v,                     'dgdT': -s,
+            'dvdP': -v * k,                'dvdT': v * a,
+            'dudP': v * (Pk * k - T * a),  'dudT': cp - Pk * v * a,
+            'dsdP': -v * a,                'dsdT': cp / T,
+            'dhdP': v * (1 - T * a),       'dhdT': cp,
+            'dTdP': 0.0,                   'dTdT': 1.0}
 
 ###########################################################
 #####          Pressure-Enthalpy Formulation          #####
@@ -425,6 +605,7 @@ def s_h(P, h):
     return s(P, T_h(P, h))
 def T_h(P, h):
     """ Temperature [K]"""
+    P, h = asarray(P), asarray(h)
     pi = P / Ps_bh
     eta = h / hs_bh
 
@@ -449,69 +630,76 @@ def k_h(P, h):
     """Isothermal compressibility [kg / kJ]"""
 
     return k(P, T_h(P, h))
+def properties_h(P, h):
+    """ Every property above evaluated from a single sweep of gamma"""
+
+    return properties(P, T_h(P, h))
 
 #### region 2 property derivatives ####
 def dgdP_h(P, h):
     """ Derivative of specific gibbs free energy [kJ m^3 / kg kJ]
     w.r.t pressure at constant specific enthalpy"""
-    T = T_h(P, h)
 
-    return (dgdP(P, T) * dhdT(P, T) - dgdT(P, T) * dhdP(P, T)) / dhdT(P, T)
+    return derivatives_h(P, h)['dgdP_h']
 def dvdP_h(P, h):
     """ Derivative of specific volume [m^3 m^3 / kg kJ]
     w.r.t pressure at constant specific enthalpy"""
-    T = T_h(P, h)
 
-    return (dvdP(P, T) * dhdT(P, T) - dvdT(P, T) * dhdP(P, T)) / dhdT(P, T)
+    return derivatives_h(P, h)['dvdP_h']
 def dudP_h(P, h):
     """ Derivative of specific internal energy [kJ m^3 / kg kJ]
     w.r.t pressure at constant specific enthalpy"""
-    T = T_h(P, h)
 
-    return (dudP(P, T) * dhdT(P, T) - dudT(P, T) * dhdP(P, T)) / dhdT(P, T)
+    return derivatives_h(P, h)['dudP_h']
 def dsdP_h(P, h):
     """ Derivative of specific entropy [kJ m^3 / kg K kJ]
     w.r.t pressure at constant specific enthalpy"""
-    T = T_h(P, h)
 
-    return (dsdP(P, T) * dhdT(P, T) - dsdT(P, T) * dhdP(P, T)) / dhdT(P, T)
+    return derivatives_h(P, h)['dsdP_h']
 def dTdP_h(P, h):
     """ Derivative of Temperature [K m^3 / kJ]
     w.r.t pressure at constant specific enthalpy"""
-    T = T_h(P, h)
 
-    return -dhdP(P, T) / dhdT(P, T)
+    return derivatives_h(P, h)['dTdP_h']
 
 def dgdh_h(P, h):
     """ Derivative of specific gibbs free energy [kJ kg / kg kJ]
     w.r.t specific enthalpy at constant pressure"""
-    T = T_h(P, h)
 
-    return dgdT(P, T) / dhdT(P, T)
+    return derivatives_h(P, h)['dgdh_h']
 def dvdh_h(P, h):
     """ Derivative of specific volume [m^3 kg / kg kJ]
     w.r.t specific enthalpy at constant pressure"""
-    T = T_h(P, h)
 
-    return dvdT(P, T) / dhdT(P, T)
+    return derivatives_h(P, h)['dvdh_h']
 def dudh_h(P, h):
     """ Derivative of specific internal energy [kJ kg / kg kJ]
     w.r.t specific enthalpy at constant pressure"""
-    T = T_h(P, h)
 
-    return dudT(P, T) / dhdT(P, T)
+    return derivatives_h(P, h)['dudh_h']
 def dsdh_h(P, h):
     """ Derivative of specific entropy [kJ kg / kg K kJ]
     w.r.t specific enthalpy at constant pressure"""
-    T = T_h(P, h)
 
-    return dsdT(P, T) / dhdT(P, T)
+    return derivatives_h(P, h)['dsdh_h']
 def dTdh_h(P, h):
     """ Derivative of Temperature [K kg / kJ]
     w.r.t specific enthalpy at constant pressure"""
-    T = T_h(P, h)
 
-    return 1 / dhdT(P, T)
+    return derivatives_h(P, h)['dTdh_h']
+def derivatives_h(P, h):
+    """ Derivatives of g, v, u, s, h and T w.r.t. pressure at constant
+    enthalpy and w.r.t. enthalpy at constant pressure, from one
+    backward temperature and one derivatives sweep; returned as a
+    dict keyed on the function names"""
+    P, h = asarray(P), asarray(h)
+    d = derivatives(P, T_h(P, h))
+
+    jacobian = {}
+    for X in ['g', 'v', 'u', 's', 'h', 'T']:
+        jacobian['d' + X + 'dP_h'] = (d['d' + X + 'dP'] * d['dhdT'] - d['d' + X + 'dT'] * d['dhdP']) / d['dhdT']
+        jacobian['d' + X + 'dh_h'] = d['d' + X + 'dT'] / d['dhdT']
+    return jacobian
 
 ###########################################################
 #####           Pressure-Entropy Formulation          #####
@@ -532,6 +720,7 @@ def u_s(P, s):
     return u(P, T_s(P, s))   
 def T_s(P, s):
     """ Temperature [K]"""
+    P, s = asarray(P), asarray(s)
     pi = P / Ps_bs
     sigma = s / ss_bsa
 
@@ -560,66 +749,108 @@ def k_s(P, s):
     """Isothermal compressibility [kg / kJ]"""
 
     return k(P, T_s(P, s))
+def properties_s(P, s):
+    """ Every property above evaluated from a single sweep of gamma"""
+
+    return properties(P, T_s(P, s))
 
 #### region 2 property derivatives ####
 def dgdP_s(P, s):
     """ Derivative of specific gibbs free energy [kJ m^3 / kg kJ]
     w.r.t pressure at constant specific entropy"""
-    T = T_s(P, s)
 
-    return (dgdP(P, T) * dsdT(P, T) - dgdT(P, T) * dsdP(P, T)) / dsdT(P, T)
+    return derivatives_s(P, s)['dgdP_s']
 def dvdP_s(P, s):
     """ Derivative of specific volume [m^3 m^3 / kg kJ]
     w.r.t pressure at constant specific entropy"""
-    T = T_s(P, s)
 
-    return (dvdP(P, T) * dsdT(P, T) - dvdT(P, T) * dsdP(P, T)) / dsdT(P, T)
+    return derivatives_s(P, s)['dvdP_s']
 def dudP_s(P, s):
     """ Derivative of specific internal energy [kJ m^3 / kg kJ]
     w.r.t pressure at constant specific entropy"""
-    T = T_s(P, s)
 
-    return (dudP(P, T) * dsdT(P, T) - dudT(P, T) * dsdP(P, T)) / dsdT(P, T)
+    return derivatives_s(P, s)['dudP_s']
 def dTdP_s(P, s):
     """ Derivative of Temperature [K m^3 / kJ]
     w.r.t pressure at constant specific entropy"""
-    T = T_s(P, s)
 
-    return -dsdP(P, T) / dsdT(P, T)
+    return derivatives_s(P, s)['dTdP_s']
 def dhdP_s(P, s):
     """ Derivative of specific entropy [kJ m^3 / kg kJ]
     w.r.t pressure at constant specific entropy"""
-    T = T_s(P, s)
 
-    return (dhdP(P, T) * dsdT(P, T) - dhdT(P, T) * dsdP(P, T)) / dsdT(P, T)
+    return derivatives_s(P, s)['dhdP_s']
 
 def dgds_s(P, s):
     """ Derivative of specific gibbs free energy [kJ kg K / kg kJ]
     w.r.t specific entropy at constant pressure"""
-    T = T_s(P, s)
 
-    return dgdT(P, T) / dsdT(P, T)
+    return derivatives_s(P, s)['dgds_s']
 def dvds_s(P, s):
     """ Derivative of specific volume [m^3 kg K/ kg kJ]
     w.r.t specific entropy at constant pressure"""
-    T = T_s(P, s)
 
-    return dvdT(P, T) / dsdT(P, T)
+    return derivatives_s(P, s)['dvds_s']
 def duds_s(P, s):
     """ Derivative of specific internal energy [kJ kg K/ kg kJ]
     w.r.t specific entropy at constant pressure"""
-    T = T_s(P, s)
 
-    return dudT(P, T) / dsdT(P, T)
+    return derivatives_s(P, s)['duds_s']
 def dTds_s(P, s):
     """ Derivative of Temperature [K kg K / kJ]
     w.r.t specific entropy at constant pressure"""
-    T = T_s(P, s)
 
-    return 1 / dsdT(P, T)
+    return derivatives_s(P, s)['dTds_s']
 def dhds_s(P, s):
     """ Derivative of specific enthalpy [kJ kg K / kg kJ]
     w.r.t specific entropy at constant pressure"""
-    T = T_s(P, s)
 
-    return dhdT(P, T) / dsdT(P, T)
\ No newline at end of file
+    return derivatives_s(P, s)['dhds_s']
+def derivatives_s(P, s):
+    """ Derivatives of g, v, u, s, h and T w.r.t. pressure at constant
+    entropy and w.r.t. entropy at constant pressure, from one
+    backward temperature and one derivatives sweep; returned as a
+    dict keyed on the function names"""
+    P, s = asarray(P), asarray(s)
+    d = derivatives(P, T_s(P, s))
+
+    jacobian = {}
+    for X in ['g', 'v', 'u', 's', 'h', 'T']:
+        jacobian['d' + X + 'dP_s'] = (d['d' + X + 'dP'] * d['dsdT'] - d['d' + X + 'dT'] * d['dsdP']) / d['dsdT']
+        jacobian['d' + X + 'ds_s'] = d['d' + X + 'dT'] / d['dsdT']
+    return jacobian
+
+###########################################################
+#####           Enthalpy-Entropy Formulation          #####
+###########################################################
+
+#### region 2 properties ####
+def P_hs(h, s):
+    """ Pressure [MPa]"""
+    h, s = asarray(h), asarray(s)
+    region = idRegion_hs(h, s)
+    subregions = {1: (pi2a_hs, Ps_hsa, hs_hsa, ss_hsa), 2: (pi2b_hs, Ps_hsb, hs_hsb, ss_hsb), 3: (pi2c_hs, Ps_hsc, hs_hsc, ss_hsc)}
+
+    # array inputs evaluate each subregion on its own slice
+    if isarray(region):
+        h, s = numpy.broadcast_arrays(h, s)
+        P = numpy.empty(region.shape)
+        for key, (subregion, Ps_hs, hs_hs, ss_hs) in subregions.items():
+            mask = region == key
+            if mask.any():
+                P[mask] = subregion(h[mask] / hs_hs, s[mask] / ss_hs) * Ps_hs
+        return P
+
+    subregion, Ps_hs, hs_hs, ss_hs = subregions[region]
+    return subregion(h / hs_hs, s / ss_hs) * Ps_hs
+def T_hs(h, s):
+    """ Temperature [K]"""
+
+    return T_h(P_hs(h, s), h)
+def properties_hs(h, s):
+    """ Every property above at the backward pressure and temperature,
+    from a single sweep of gamma"""
+    h, s = asarray(h), asarray(s)
+    P = P_hs(h, s)
+
+    return properties(P, T_h(P, h))
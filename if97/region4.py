@@ -1,4 +1,6 @@
-from if97 import region1, region2
+import numpy
+from if97 import region1, region2, region3
+from if97.common import Cache, asarray, evaluator, isarray
 
 ###########################################################
 #####       Constants and Dimensionless Functions     #####
@@ -12,6 +14,48 @@ n = [ 0.11670521452767e+04, -0.72421316703206e+06, -0.17073846940092e+02, 0.1202
 Pb = 1.0    #[Mpa]
 Tb = 1.0    #[K]
 
+# constants for the saturation pressure of region 3 by enthalpy
+Ih_3sat = [0, 1, 1, 1, 1, 5, 7, 8, 14, 20, 22, 24, 28, 36]
+Jh_3sat = [0, 1, 3, 4, 36, 3, 0, 24, 16, 16, 3, 18, 8, 24]
+nh_3sat = [ 0.600073641753024,    -0.936203654849857e1,   0.246590798594147e2,  -0.107014222858224e3,  -0.915821315805768e14,
+           -0.862332011700662e4,  -0.235837344740032e2,   0.252304969384128e18, -0.389718771997719e19, -0.333775713645296e23,
+            0.356499469636328e11, -0.148547544720641e27,  0.330611514838798e19,  0.813641294467829e38]
+
+# constants for the saturation pressure of region 3 by entropy
+Is_3sat = [0, 1, 1, 4, 12, 12, 16, 24, 28, 32]
+Js_3sat = [0, 1, 32, 7, 4, 14, 36, 10, 0, 18]
+ns_3sat = [ 0.639767553612785,    -0.129727445396014e2,  -0.224595125848403e16,  0.177466741801846e7,   0.717079349571538e10,
+           -0.378829107169011e18, -0.955586736431328e35,  0.187269814676188e24,  0.119254746466473e12,  0.110649277244882e37]
+
+# constants for the saturation temperature by enthalpy and entropy
+I_Tsat = [0, 0, 0, 1, 1, 1, 1, 2, 2, 2, 3, 3, 3, 3, 4, 4, 5, 5, 5, 5, 6, 6, 6, 8, 10, 10, 12, 14, 14, 16, 16, 18, 18, 18, 20, 28]
+J_Tsat = [0, 3, 12, 0, 1, 2, 5, 0, 5, 8, 0, 2, 3, 4, 0, 1, 1, 2, 4, 16, 6, 8, 22, 1, 20, 36, 24, 1, 28, 12, 32, 14, 22, 36, 24, 36]
+n_Tsat = [ 0.179882673606601,    -0.267507455199603,     0.116276722612600e1,   0.147545428713616,    -0.512871635973248,
+           0.421333567697984,     0.563749522189870,     0.429274443819153,    -0.335704552142140e1,   0.108890916499278e2,
+          -0.248483390456012,     0.304153221906390,    -0.494819763939905,     0.107551674933261e1,   0.733888415457688e-1,
+           0.140170545411085e-1, -0.106110975998808,     0.168324361811875e-1,  0.125028363714877e1,   0.101316840309509e4,
+          -0.151791558000712e1,   0.524277865990866e2,   0.230495545563912e5,   0.249459806365456e-1,  0.210796467412137e7,
+           0.366836848613065e9,  -0.144814105365163e9,  -0.179276373003590e-2,  0.489955602100459e10,  0.471262212070518e3,
+          -0.829294390198652e11, -0.171545662263191e4,   0.355777682973575e7,   0.586062760258436e12, -0.129887635078195e8,
+           0.317247449371057e11]
+
+# non-dimensionalization for the saturation boundary equations
+Ps_3sat = 22.0      #[Mpa]
+hs_3sat = 2600.0    #[kJ / kg]
+ss_3sat = 5.2       #[kJ / kg K]
+Ts_hs   = 550.0     #[K]
+hs_hs   = 2800.0    #[kJ / kg]
+ss_hs   = 9.2       #[kJ / kg K]
+
+# upper end of the temperature band above 623.15 K over which the
+# saturated states of regions 1 and 2 are blended into those of region 3
+Tbnd3b = 628.15     #[K]
+
+# compiled term evaluators
+h3sat_series = evaluator(Ih_3sat, Jh_3sat, nh_3sat, order = 0)
+s3sat_series = evaluator(Is_3sat, Js_3sat, ns_3sat, order = 0)
+Tsat_series  = evaluator(I_Tsat, J_Tsat, n_Tsat, order = 0)
+
 ###########################################################
 #####                Saturation Curves                #####
 ###########################################################
@@ -19,6 +63,7 @@ Tb = 1.0    #[K]
 #### saturation curves ####
 def satP(T):
     """ Saturation pressure as a function of temperature [MPa]"""
+    T = asarray(T)
     v = T / Tb + n[8] / ((T / Tb) - n[9])
 
     A = v**2 + n[0] * v + n[1]
@@ -28,6 +73,7 @@ def satP(T):
     return Pb * (2 * C / (-B + (B**2 - 4 * A * C)**0.5))**4
 def satT(P):
     """ Saturation Temperature as a function of pressure [K]"""
+    P = asarray(P)
     b = (P / Pb)**0.25
 
     E = b**2 + n[2] * b + n[5]
@@ -41,6 +87,7 @@ def satT(P):
 def dTsdP(P):
     """ Derivative of saturation temperature [K m^3 / kJ]
     w.r.t pressure """
+    P = asarray(P)
     b = (P / Pb)**0.25
 
     E = b**2 + n[2] * b + n[5]
@@ -61,6 +108,7 @@ def dTsdP(P):
 def dPsdT(T):
     """ Derivative of saturation pressure [P / K]
     w.r.t temperature """
+    T = asarray(T)
     v = T / Tb + n[8] / ((T / Tb) - n[9])
 
     A = v**2 + n[0] * v + n[1]
@@ -78,6 +126,176 @@ def dPsdT(T):
     return 64 * Pb * C**3 * (C * Bp + Cp * (-B + (B**2 - 4 * A * C)**0.5) + C * (2 * C * Ap - B * Bp + 2 * A * Cp) / (B**2 - 4 * A * C)**0.5) / \
                 (-B + (B**2 - 4 * A * C)**0.5)**5
 
+#### saturation boundary equations ####
+def p3sat_h(h):
+    """ Saturation pressure [MPa] of the saturated liquid or vapor of
+    enthalpy h, between h'(623.15 K) and h''(623.15 K)"""
+    eta = asarray(h) / hs_3sat
+
+    return Ps_3sat * h3sat_series(eta - 1.02, eta - 0.608)
+def p3sat_s(s):
+    """ Saturation pressure [MPa] of the saturated liquid or vapor of
+    entropy s, between s'(623.15 K) and s''(623.15 K)"""
+    sigma = asarray(s) / ss_3sat
+
+    return Ps_3sat * s3sat_series(sigma - 1.03, sigma - 0.699)
+def Tsat_hs(h, s):
+    """ Saturation temperature [K] of the two-phase mixture of enthalpy
+    h and entropy s, for s at or above s''(623.15 K)"""
+    eta, sigma = asarray(h) / hs_hs, asarray(s) / ss_hs
+
+    return Ts_hs * Tsat_series(eta - 0.119, sigma - 1.07)
+
+###########################################################
+#####             Saturation State Bundle             #####
+###########################################################
+
+# properties of the saturated phases and their derivatives along saturation
+names = ('g', 'v', 'u', 's', 'h', 'cp', 'cv', 'w', 'a', 'k')
+slopes = ('dgdP', 'dvdP', 'dudP', 'dsdP', 'dhdP')
+def _along(props, T, Tp, Pk):
+    """ Adds the derivatives along saturation to the properties props
+    of a phase, as d/dP + d/dT * dTs/dP from the identities of the
+    region modules"""
+    v, s, cp, a, k = props['v'], props['s'], props['cp'], props['a'], props['k']
+    props.update(dgdP = v - s * Tp,
+                 dvdP = -v * k + v * a * Tp,
+                 dudP = v * (Pk * k - T * a) + (cp - Pk * v * a) * Tp,
+                 dsdP = -v * a + cp / T * Tp,
+                 dhdP = v * (1 - T * a) + cp * Tp)
+    return props
+def _phases12(P, T, Tp):
+    """ Saturated liquid and vapor properties from regions 1 and 2"""
+    Pk = P * 10**6 / 1000
+
+    return _along(region1.properties(P, T), T, Tp, Pk), _along(region2.properties(P, T), T, Tp, Pk)
+def _volume(P, T, v):
+    """ Specific volume [m^3 / kg] of region 3 at P and T, by Newton's
+    method on its pressure from the estimate v; it converges
+    quadratically, so a step of 1e-9 leaves v exact to round-off"""
+    for i in range(50):
+        dv = (P - region3.P(v, T)) / region3.dPdv(v, T)
+        v = v + dv
+        if numpy.max(abs(dv / v)) <= 1e-9:
+            break
+    return v
+def _phases3(P, T, Tp):
+    """ Saturated liquid and vapor properties in region 3, at the
+    volumes where its own pressure is P on either side of T = satT(P),
+    starting from the backward equations v(P, T)"""
+    Pk = P * 10**6 / 1000
+
+    return [_along(region3._properties(P, _volume(P, T, region3.v_T(P, Tv)), T), T, Tp, Pk)
+            for Tv in (T, numpy.nextafter(T, numpy.inf))]
+def _phasesB(P, T, Tp):
+    """ Saturated liquid and vapor properties between 623.15 K and
+    Tbnd3b, blended from regions 1 and 2 into region 3 with a weight
+    (and its slope along saturation) that is smooth at either end"""
+    t = (T - region1.Tbnd13) / (Tbnd3b - region1.Tbnd13)
+    w = t**2 * (3 - 2 * t)
+    wp = 6 * t * (1 - t) * Tp / (Tbnd3b - region1.Tbnd13)
+
+    phases = []
+    for low, high in zip(_phases12(P, T, Tp), _phases3(P, T, Tp)):
+        props = dict((name, (1 - w) * low[name] + w * high[name]) for name in names + slopes)
+        for name in slopes:
+            props[name] += wp * (high[name[1:-2]] - low[name[1:-2]])
+        phases.append(props)
+    return phases
+def _phasesT(P, T, Tp):
+    """ Saturated liquid and vapor properties extrapolated beyond the
+    critical pressure, from the region 3 backward equations v(P, T) on
+    either side of T = satT(P)"""
+    Pk = P * 10**6 / 1000
+
+    return _along(region3.properties_T(P, T), T, Tp, Pk), \
+           _along(region3.properties_T(P, numpy.nextafter(T, numpy.inf)), T, Tp, Pk)
+def _phases(P, T, Tp):
+    """ Saturated liquid and vapor properties and derivatives at P and
+    T = satT(P), from regions 1 and 2 up to 623.15 K, blended into
+    region 3 up to Tbnd3b, from region 3 above it and extrapolated
+    beyond the critical pressure, where arrays evaluate each part on
+    its own slice"""
+    if not isarray(P):
+        if T <= region1.Tbnd13:
+            return _phases12(P, T, Tp)
+        if T < Tbnd3b:
+            return _phasesB(P, T, Tp)
+        return _phases3(P, T, Tp) if P <= region3.Ps else _phasesT(P, T, Tp)
+
+    low, band, high = T <= region1.Tbnd13, T < Tbnd3b, P > region3.Ps
+    parts = [(low, _phases12), (band & ~low, _phasesB), (~band & ~high, _phases3), (high, _phasesT)]
+    for mask, func in parts:
+        if mask.all():
+            return func(P, T, Tp)
+
+    phases = [dict((name, numpy.empty(P.shape)) for name in names + slopes) for phase in 'fg']
+    for mask, func in parts:
+        if mask.any():
+            for props, part in zip(phases, func(P[mask], T[mask], Tp[mask])):
+                for name in names + slopes:
+                    props[name][mask] = part[name]
+    return phases
+
+# saturation states of scalar pressures, kept per pressure
+saturation_cache = Cache()
+def _saturation(P):
+    """ Saturation temperature and slope, the saturated liquid (f) and
+    vapor (g) properties and their derivatives along saturation, keyed
+    on the names of the functions below; one satT and one kernel
+    sweep per phase, after locating the volumes of region 3"""
+    T = satT(P)
+    Tp = dTsdP(P)
+
+    sat = {'satT': T, 'dTsdP': Tp}
+    for phase, props in zip('fg', _phases(P, T, Tp)):
+        for name in names:
+            sat[name + phase] = props[name]
+        for name in slopes:
+            sat[name[:2] + phase + name[2:]] = props[name]
+    return sat
+def _bundle(P):
+    """ Saturation state bundle at P (see _saturation); scalar
+    pressures are served from saturation_cache, whose entries the
+    functions below share and must not alter"""
+    P = asarray(P)
+    if isarray(P):
+        return _saturation(P)
+
+    return saturation_cache.lookup(P, _saturation)
+def saturation(P):
+    """ Saturation state bundle at P (see _saturation), as a dict of
+    its own"""
+
+    return dict(_bundle(P))
+def _mixture(P, y, name):
+    """ Saturation bundle at P and the quality of the mixture whose
+    property name (h or s) is y"""
+    sat = _bundle(P)
+
+    return sat, (y - sat[name + 'f']) / (sat[name + 'g'] - sat[name + 'f'])
+def _dxdP(sat, y, name):
+    """ Derivative of the quality of the mixture whose property name
+    (h or s) is y w.r.t. pressure, from a saturation bundle"""
+    yfg = sat[name + 'g'] - sat[name + 'f']
+    dyfgdP = sat['d' + name + 'gdP'] - sat['d' + name + 'fdP']
+
+    return (dyfgdP * (sat[name + 'f'] - y) - sat['d' + name + 'fdP'] * yfg) / yfg**2
+def _derivatives(P, y, name):
+    """ Derivatives of g, v, u, s, h and T of the mixture whose property
+    name (h or s) is y, w.r.t. pressure at constant y and w.r.t. y at
+    constant pressure, from one saturation bundle"""
+    sat, x = _mixture(P, y, name)
+    dxdP = _dxdP(sat, y, name)
+    yfg = sat[name + 'g'] - sat[name + 'f']
+
+    jacobian = {'dTdP_' + name: sat['dTsdP'], 'dTd' + name + '_' + name: 0.0}
+    for X in ['g', 'v', 'u', 's', 'h']:
+        Xfg = sat[X + 'g'] - sat[X + 'f']
+        jacobian['d' + X + 'dP_' + name] = x * sat['d' + X + 'gdP'] + (1 - x) * sat['d' + X + 'fdP'] + Xfg * dxdP
+        jacobian['d' + X + 'd' + name + '_' + name] = Xfg / yfg
+    return jacobian
+
 ###########################################################
 #####     Pressure Only (Saturation) Formulation      #####
 ###########################################################
@@ -87,247 +305,252 @@ def gf(P):
     """ Specific gibbs free energy [kJ / kg]
     of saturated liquid"""
 
-    return region1.g(P, satT(P))
+    return _bundle(P)['gf']
 def vf(P):
     """ Specific volume [m^3 / kg]
     of saturated liquid"""
 
-    return region1.v(P, satT(P))
+    return _bundle(P)['vf']
 def uf(P):
     """ Specific internal energy [kJ / kg]
     of saturated liquid"""
 
-    return region1.u(P, satT(P))
+    return _bundle(P)['uf']
 def sf(P):
     """ Specific entropy [kJ / kg K]
     of saturated liquid"""
 
-    return region1.s(P, satT(P))
+    return _bundle(P)['sf']
 def hf(P):
     """ Specific enthalpy [kJ / kg]
     of saturated liquid"""
 
-    return region1.h(P, satT(P))
+    return _bundle(P)['hf']
 def cpf(P):
     """ Specific isobaric heat capacity [kJ / kg K]
     of saturated liquid"""
 
-    return region1.cp(P, satT(P))
+    return _bundle(P)['cpf']
 def cvf(P):
     """ Specific isochoric heat capacity [kJ / kg K]
     of saturated liquid"""
 
-    return region1.cv(P, satT(P))
+    return _bundle(P)['cvf']
 def wf(P):
     """ Speed of sound [m / s]
     of saturated liquid"""
 
-    return region1.w(P, satT(P))
+    return _bundle(P)['wf']
 def af(P):
     """Isobaric cubic expansion coefficient [1 / K]
     of saturated liquid"""
 
-    return region1.a(P, satT(P))
+    return _bundle(P)['af']
 def kf(P):
     """Isothermal compressibility [kg / kJ]
     of saturated liquid"""
 
-    return region1.k(P, satT(P))
+    return _bundle(P)['kf']
 
 #### Saturated vapor properties ####
 def gg(P):
     """ Specific gibbs free energy [kJ / kg]
     of saturated vapor"""
 
-    return region2.g(P, satT(P))
+    return _bundle(P)['gg']
 def vg(P):
     """ Specific volume [m^3 / kg]
     of saturated vapor"""
 
-    return region2.v(P, satT(P))
+    return _bundle(P)['vg']
 def ug(P):
     """ Specific internal energy [kJ / kg]
     of saturated vapor"""
     
-    return region2.u(P, satT(P))
+    return _bundle(P)['ug']
 def sg(P):
     """ Specific entropy [kJ / kg K]
     of saturated vapor"""
 
-    return region2.s(P, satT(P))
+    return _bundle(P)['sg']
 def hg(P):
     """ Specific enthalpy [kJ / kg]
     of saturated vapor"""
     
-    return region2.h(P, satT(P))
+    return _bundle(P)['hg']
 def cpg(P):
     """ Specific isobaric heat capacity [kJ / kg K]
     of saturated vapor"""
 
-    return region2.cp(P, satT(P))
+    return _bundle(P)['cpg']
 def cvg(P):
     """ Specific isochoric heat capacity [kJ / kg K]
     of saturated vapor"""
 
-    return region2.cv(P, satT(P))
+    return _bundle(P)['cvg']
 def wg(P):
     """ Speed of sound [m / s]
     of saturated vapor"""
 
-    return region2.w(P, satT(P))
+    return _bundle(P)['wg']
 def ag(P):
     """Isobaric cubic expansion coefficient [1 / K]
     of saturated vapor"""
 
-    return region2.a(P, satT(P))
+    return _bundle(P)['ag']
 def kg(P):
     """Isothermal compressibility [kg / kJ]
     of saturated vapor"""
 
-    return region2.k(P, satT(P))
+    return _bundle(P)['kg']
 
 #### delta saturation properties ####
 def gfg(P):
     """ Specific gibbs free energy; [kJ / kg]
     saturation rise of"""
+    sat = _bundle(P)
 
-    return gg(P) - gf(P)
+    return sat['gg'] - sat['gf']
 def vfg(P):
     """ Specific volume; [m^3 / kg]
     saturation rise of"""
+    sat = _bundle(P)
 
-    return vg(P) - vf(P)
+    return sat['vg'] - sat['vf']
 def ufg(P):
     """ Specific internal energy; [kJ / kg]
     saturation rise of"""
+    sat = _bundle(P)
 
-    return ug(P) - uf(P)
+    return sat['ug'] - sat['uf']
 def sfg(P):
     """ Specific entropy; [kJ / kg K]
     saturation rise of"""
+    sat = _bundle(P)
 
-    return sg(P) - sf(P)
+    return sat['sg'] - sat['sf']
 def hfg(P):
     """ Specific enthalpy; [kJ / kg]
     saturation rise of"""
+    sat = _bundle(P)
 
-    return hg(P) - hf(P)
+    return sat['hg'] - sat['hf']
 def cpfg(P):
     """ Specific isobaric heat capacity; [kJ / kg K]
     saturation rise of"""
+    sat = _bundle(P)
 
-    return cpg(P) - cpf(P)
+    return sat['cpg'] - sat['cpf']
 def cvfg(P):
     """ Specific isochoric heat capacity; [kJ / kg K]
     saturation rise of"""
+    sat = _bundle(P)
 
-    return cvg(P) - cvf(P)
+    return sat['cvg'] - sat['cvf']
 def wfg(P):
     """ Speed of sound; [m / s]
     saturation rise of"""
+    sat = _bundle(P)
 
-    return wg(P) - wf(P)
+    return sat['wg'] - sat['wf']
 def afg(P):
     """Isobaric cubic expansion coefficient; [1 / K]
     saturation rise of"""
+    sat = _bundle(P)
 
-    return ag(P) - af(P)
+    return sat['ag'] - sat['af']
 def kfg(P):
     """Isothermal compressibility; [kg / kJ]
     saturation rise of"""
+    sat = _bundle(P)
 
-    return kg(P) - kf(P)
+    return sat['kg'] - sat['kf']
 
 #### Saturated liquid derivatives ####
 def dgfdP(P):
     """ Derivative of Specific gibbs free energy [kJ m^3 / kg kJ]
     of saturated liquid w.r.t. pressure"""
-    T = satT(P)
 
-    return region1.dgdP(P, T) + region1.dgdT(P, T) * dTsdP(P)
+    return _bundle(P)['dgfdP']
 def dvfdP(P):
     """ Derivative of Specific volume [m^3 m^3 / kg kJ]
     of saturated liquid w.r.t. pressure"""
-    T = satT(P)
 
-    return region1.dvdP(P, T) + region1.dvdT(P, T) * dTsdP(P)
+    return _bundle(P)['dvfdP']
 def dufdP(P):
     """ Derivative of Specific internal energy [kJ m^3 / kg kJ]
     of saturated liquid w.r.t. pressure"""
-    T = satT(P)
 
-    return region1.dudP(P, T) + region1.dudT(P, T) * dTsdP(P)
+    return _bundle(P)['dufdP']
 def dsfdP(P):
     """ Derivative of Specific entropy [kJ m^3 / kg K kJ]
     of saturated liquid w.r.t. pressure"""
-    T = satT(P)
 
-    return region1.dsdP(P, T) + region1.dsdT(P, T) * dTsdP(P)
+    return _bundle(P)['dsfdP']
 def dhfdP(P):
     """ Derivative of Specific enthalpy [kJ m^3 / kg kJ]
     of saturated liquid w.r.t. pressure"""
-    T = satT(P)
 
-    return region1.dhdP(P, T) + region1.dhdT(P, T) * dTsdP(P)
+    return _bundle(P)['dhfdP']
 
 #### Saturated vapor derivatives ####
 def dggdP(P):
     """ Derivative of Specific gibbs free energy [kJ m^3 / kg kJ]
     of saturated vapor w.r.t. pressure"""
-    T = satT(P)
 
-    return region2.dgdP(P, T) + region2.dgdT(P, T) * dTsdP(P)
+    return _bundle(P)['dggdP']
 def dvgdP(P):
     """ Derivative of Specific volume [m^3 m^3 / kg kJ]
     of saturated vapor w.r.t. pressure"""
-    T = satT(P)
 
-    return region2.dvdP(P, T) + region2.dvdT(P, T) * dTsdP(P)
+    return _bundle(P)['dvgdP']
 def dugdP(P):
     """ Derivative of Specific internal energy [kJ m^3 / kg kJ]
     of saturated vapor w.r.t. pressure"""
-    T = satT(P)
 
-    return region2.dudP(P, T) + region2.dudT(P, T) * dTsdP(P)
+    return _bundle(P)['dugdP']
 def dsgdP(P):
     """ Derivative of Specific entropy [kJ m^3 / kg K kJ]
     of saturated vapor w.r.t. pressure"""
-    T = satT(P)
 
-    return region2.dsdP(P, T) + region2.dsdT(P, T) * dTsdP(P)
+    return _bundle(P)['dsgdP']
 def dhgdP(P):
     """ Derivative of Specific enthalpy [kJ m^3 / kg kJ]
     of saturated vapor w.r.t. pressure"""
-    T = satT(P)
 
-    return region2.dhdP(P, T) + region2.dhdT(P, T) * dTsdP(P)
+    return _bundle(P)['dhgdP']
 
 #### Delta saturation derivatives ####
 def dgfgdP(P):
     """ Derivative of Specific gibbs free energy [kJ m^3 / kg kJ]
     w.r.t. pressure; saturation rise of"""
+    sat = _bundle(P)
 
-    return dggdP(P) - dgfdP(P)
+    return sat['dggdP'] - sat['dgfdP']
 def dvfgdP(P):
     """ Derivative of Specific volume [m^3 m^3 / kg kJ]
     w.r.t. pressure; saturation rise of"""
+    sat = _bundle(P)
 
-    return dvgdP(P) - dvfdP(P)
+    return sat['dvgdP'] - sat['dvfdP']
 def dufgdP(P):
     """ Derivative of Specific internal energy [kJ m^3 / kg kJ]
     w.r.t. pressure; saturation rise of"""
+    sat = _bundle(P)
 
-    return dugdP(P) - dufdP(P)
+    return sat['dugdP'] - sat['dufdP']
 def dsfgdP(P):
     """ Derivative of Specific entropy [kJ m^3 / kg K kJ]
     w.r.t. pressure; saturation rise of"""
+    sat = _bundle(P)
 
-    return dsgdP(P) - dsfdP(P)
+    return sat['dsgdP'] - sat['dsfdP']
 def dhfgdP(P):
     """ Derivative of Specific enthalpy [kJ m^3 / kg kJ]
     w.r.t. pressure; saturation rise of"""
+    sat = _bundle(P)
 
-    return dhgdP(P) - dhfdP(P)
+    return sat['dhgdP'] - sat['dhfdP']
 
 ###########################################################
 ###    Two-phase Mixture (Saturation) Formulation(P,h)  ###
@@ -336,121 +559,135 @@ def dhfgdP(P):
 #### equilibrium quantities ####
 def g_h(P, h):
     """ Equilibrium specific gibbs free energy [kJ / kg]"""
-    x = x_h(P, h)
+    sat, x = _mixture(P, h, 'h')
 
-    return x * gg(P) + (1 - x) * gf(P)
+    return x * sat['gg'] + (1 - x) * sat['gf']
 def v_h(P, h):
     """ Equilibrium specific volume [m^3 / kg]"""
-    x = x_h(P, h)
+    sat, x = _mixture(P, h, 'h')
 
-    return x * vg(P) + (1 - x) * vf(P)
+    return x * sat['vg'] + (1 - x) * sat['vf']
 def u_h(P, h):
     """ Equilibrium specific internal energy [kJ / kg]"""
-    x = x_h(P, h)
+    sat, x = _mixture(P, h, 'h')
 
-    return x * ug(P) + (1 - x) * uf(P)
+    return x * sat['ug'] + (1 - x) * sat['uf']
 def s_h(P, h):
     """ Equilibrium specific entropy [kJ / kg K]"""
-    x = x_h(P, h)
+    sat, x = _mixture(P, h, 'h')
 
-    return x * sg(P) + (1 - x) * sf(P)
+    return x * sat['sg'] + (1 - x) * sat['sf']
 def h_h(P, x):
     """ Equilibrium specific enthaply [kJ / kg]"""
 
-    return x * hg(P) + (1 - x) * hf(P)
+    sat = _bundle(P)
+
+    return x * sat['hg'] + (1 - x) * sat['hf']
 def cp_h(P, h):
     """ Equilibrium specific isobaric heat capacity [kJ / kg K]"""
-    x = x_h(P, h)
+    sat, x = _mixture(P, h, 'h')
 
-    return x * cpg(P) + (1 - x) * cpf(P)
+    return x * sat['cpg'] + (1 - x) * sat['cpf']
 def cv_h(P, h):
     """ Equilibrium specific isochoric heat capacity [kJ / kg K]"""
-    x = x_h(P, h)
+    sat, x = _mixture(P, h, 'h')
 
-    return x * cvg(P) + (1 - x) * cvf(P)
+    return x * sat['cvg'] + (1 - x) * sat['cvf']
 def w_h(P, h):
     """ Equilibrium speed of sound [m / s]"""
-    x = x_h(P, h)
+    sat, x = _mixture(P, h, 'h')
 
-    return x * wg(P) + (1 - x) * wf(P)
+    return x * sat['wg'] + (1 - x) * sat['wf']
 def a_h(P, h):
     """ Equilibrium Isobaric cubic expansion coefficient [1 / K]"""
-    x = x_h(P, h)
+    sat, x = _mixture(P, h, 'h')
 
-    return x * ag(P) + (1 - x) * af(P)
+    return x * sat['ag'] + (1 - x) * sat['af']
 def k_h(P, h):
     """ Equilibrium Isothermal compressibility [kg / kJ]"""
-    x = x_h(P, h)
+    sat, x = _mixture(P, h, 'h')
 
-    return x * kg(P) + (1 - x) * kf(P)
+    return x * sat['kg'] + (1 - x) * sat['kf']
 def x_h(P, h):
     """ Equilibrium quality [-]
     as a function of P, h"""
 
-    return (h - hf(P)) / hfg(P)
+    return _mixture(P, h, 'h')[1]
+def properties_h(P, h):
+    """ Every equilibrium property above, mixed from the saturated
+    liquid and vapor states of the saturation bundle"""
+    P, h = asarray(P), asarray(h)
+    sat, x = _mixture(P, h, 'h')
+
+    props = dict((name, x * sat[name + 'g'] + (1 - x) * sat[name + 'f']) for name in ('g', 'v', 'u', 's', 'h', 'cp', 'cv', 'w', 'a', 'k'))
+    props.update(P = P, T = sat['satT'], x = x)
+    return props
 
 #### equilibrium derivatives ####
 def dgdP_h(P, h):
     """ Derivative of equilibrium specific gibbs free energy [kJ m^3 / kg kJ]
     w.r.t. pressure @ a given equilibrium enthalpy"""
-    x = x_h(P, h)
 
-    return x * dggdP(P) + (1 - x) * dgfdP(P) + gfg(P) * dxdP_h(P, h)
+    return derivatives_h(P, h)['dgdP_h']
 def dvdP_h(P, h):
     """ Derivative of equilibrium specific volume [m^3 m^3 / kg kJ]
     w.r.t. pressure @ a given equilibrium enthalpy"""
-    x = x_h(P, h)
 
-    return x * dvgdP(P) + (1 - x) * dvfdP(P) + vfg(P) * dxdP_h(P, h)
+    return derivatives_h(P, h)['dvdP_h']
 def dudP_h(P, h):
     """ Equilibrium specific internal energy [kJ m^3 / kg kJ]
     w.r.t. pressure @ a given equilibrium enthalpy"""
-    x = x_h(P, h)
 
-    return x * dugdP(P) + (1 - x) * dufdP(P) + ufg(P) * dxdP_h(P, h)
+    return derivatives_h(P, h)['dudP_h']
 def dsdP_h(P, h):
     """ Derivative of equilibrium specific entropy [kJ m^3 / kg K kJ]
     w.r.t. pressure @ a given equilibrium enthalpy"""
-    x = x_h(P, h)
 
-    return x * dsgdP(P) + (1 - x) * dsfdP(P) + sfg(P) * dxdP_h(P, h)
+    return derivatives_h(P, h)['dsdP_h']
 def dhdP_h(P, h):
     """ Derivative of equilibrium specific enthalpy [kJ m^3 / kg kJ]
     w.r.t. pressure @ a given equilibrium enthalpy"""
-    x = x_h(P, h)
 
-    return x * dhgdP(P) + (1 - x) * dhfdP(P) + dxdP_h(P, h) * dhfgdP(P)
+    return derivatives_h(P, h)['dhdP_h']
 def dxdP_h(P, h):
     """ Derivative of equilibrium quality [m^3 / kJ]
     w.r.t. pressure"""
 
-    return (dhfgdP(P) * (hf(P) - h) - dhfdP(P) * hfg(P)) / hfg(P)**2
+    return _dxdP(_bundle(P), h, 'h')
 
 def dgdh_h(P, h):
     """ Derivative of equilibrium specific gibbs free energy [kJ kg / kg kJ]
     w.r.t. equilibrium enthalpy @ a given pressure"""
 
-    return gfg(P) * dxdh_h(P)
+    return derivatives_h(P, h)['dgdh_h']
 def dvdh_h(P, h):
     """ Derivative of equilibrium specific volume [m^3 kg / kg kJ]
     w.r.t. equilibrium enthalpy @ a given pressure"""
 
-    return vfg(P) * dxdh_h(P)
+    return derivatives_h(P, h)['dvdh_h']
 def dudh_h(P, h):
     """ Equilibrium specific internal energy [kJ kg / kg kJ]
     w.r.t. equilibrium enthalpy @ a given pressure"""
 
-    return ufg(P) * dxdh_h(P)
+    return derivatives_h(P, h)['dudh_h']
 def dsdh_h(P, h):
     """ Derivative of equilibrium specific entropy [kJ kg / kg K kJ]
     w.r.t. equilibrium enthalpy @ a given pressure"""
 
-    return sfg(P) * dxdh_h(P)
+    return derivatives_h(P, h)['dsdh_h']
 def dxdh_h(P):
     """ Derivative of equilibrium quality [kg / kJ]
     w.r.t. equilibrium enthalpy @ a given pressure"""
+    sat = _bundle(P)
+
+    return 1 / (sat['hg'] - sat['hf'])
+def derivatives_h(P, h):
+    """ Derivatives of g, v, u, s, h and T w.r.t. pressure at constant
+    enthalpy and w.r.t. enthalpy at constant pressure, from one saturation
+    bundle; returned as a dict keyed on the function names"""
+    P, h = asarray(P), asarray(h)
 
-    return 1 / hfg(P)
+    return _derivatives(P, h, 'h')
 
 ###########################################################
 ###    Two-phase Mixture (Saturation) Formulation(P,s)  ###
@@ -459,117 +696,131 @@ def dxdh_h(P):
 #### equilibrium quantities ####
 def g_s(P, s):
     """ Equilibrium specific gibbs free energy [kJ / kg]"""
-    x = x_s(P, s)
+    sat, x = _mixture(P, s, 's')
 
-    return x * gg(P) + (1 - x) * gf(P)
+    return x * sat['gg'] + (1 - x) * sat['gf']
 def v_s(P, s):
     """ Equilibrium specific volume [m^3 / kg]"""
-    x = x_s(P, s)
+    sat, x = _mixture(P, s, 's')
 
-    return x * vg(P) + (1 - x) * vf(P)
+    return x * sat['vg'] + (1 - x) * sat['vf']
 def u_s(P, s):
     """ Equilibrium specific internal energy [kJ / kg]"""
-    x = x_s(P, s)
+    sat, x = _mixture(P, s, 's')
 
-    return x * ug(P) + (1 - x) * uf(P)
+    return x * sat['ug'] + (1 - x) * sat['uf']
 def s_s(P, x):
     """ Equilibrium specific entropy [kJ / kg K]"""
 
-    return x * sg(P) + (1 - x) * sf(P)
+    sat = _bundle(P)
+
+    return x * sat['sg'] + (1 - x) * sat['sf']
 def h_s(P, s):
     """ Equilibrium specific enthaply [kJ / kg]"""
-    x = x_s(P, s)
+    sat, x = _mixture(P, s, 's')
 
-    return x * hg(P) + (1 - x) * hf(P)
+    return x * sat['hg'] + (1 - x) * sat['hf']
 def cp_s(P, s):
     """ Equilibrium specific isobaric heat capacity [kJ / kg K]"""
-    x = x_s(P, s)
+    sat, x = _mixture(P, s, 's')
 
-    return x * cpg(P) + (1 - x) * cpf(P)
+    return x * sat['cpg'] + (1 - x) * sat['cpf']
 def cv_s(P, s):
     """ Equilibrium specific isochoric heat capacity [kJ / kg K]"""
-    x = x_s(P, s)
+    sat, x = _mixture(P, s, 's')
 
-    return x * cvg(P) + (1 - x) * cvf(P)
+    return x * sat['cvg'] + (1 - x) * sat['cvf']
 def w_s(P, s):
     """ Equilibrium speed of sound [m / s]"""
-    x = x_s(P, s)
+    sat, x = _mixture(P, s, 's')
 
-    return x * wg(P) + (1 - x) * wf(P)
+    return x * sat['wg'] + (1 - x) * sat['wf']
 def a_s(P, s):
     """ Equilibrium Isobaric cubic expansion coefficient [1 / K]"""
-    x = x_s(P, s)
+    sat, x = _mixture(P, s, 's')
 
-    return x * ag(P) + (1 - x) * af(P)
+    return x * sat['ag'] + (1 - x) * sat['af']
 def k_s(P, s):
     """ Equilibrium Isothermal compressibility [kg / kJ]"""
-    x = x_s(P, s)
+    sat, x = _mixture(P, s, 's')
 
-    return x * kg(P) + (1 - x) * kf(P)
+    return x * sat['kg'] + (1 - x) * sat['kf']
 def x_s(P, s):
     """ Equilibrium quality [-]"""
 
-    return (s - sf(P)) / sfg(P)
+    return _mixture(P, s, 's')[1]
+def properties_s(P, s):
+    """ Every equilibrium property above, mixed from the saturated
+    liquid and vapor states of the saturation bundle"""
+    P, s = asarray(P), asarray(s)
+    sat, x = _mixture(P, s, 's')
+
+    props = dict((name, x * sat[name + 'g'] + (1 - x) * sat[name + 'f']) for name in ('g', 'v', 'u', 's', 'h', 'cp', 'cv', 'w', 'a', 'k'))
+    props.update(P = P, T = sat['satT'], x = x)
+    return props
 
 #### equilibrium derivatives ####
 def dgdP_s(P, s):
     """ Derivative of equilibrium specific gibbs free energy [kJ m^3 / kg kJ]
     w.r.t. pressure @ a given equilibrium entropy"""
-    x = x_s(P, s)
 
-    return x * dggdP(P) + (1 - x) * dgfdP(P) + gfg(P) * dxdP_s(P, s)
+    return derivatives_s(P, s)['dgdP_s']
 def dvdP_s(P, s):
     """ Derivative of equilibrium specific volume [m^3 m^3 / kg kJ]
     w.r.t. pressure @ a given equilibrium entropy"""
-    x = x_s(P, s)
 
-    return x * dvgdP(P) + (1 - x) * dvfdP(P) + vfg(P) * dxdP_s(P, s)
+    return derivatives_s(P, s)['dvdP_s']
 def dudP_s(P, s):
     """ Equilibrium specific internal energy [kJ m^3 / kg kJ]
     w.r.t. pressure @ a given equilibrium entropy"""
-    x = x_s(P, s)
 
-    return x * dugdP(P) + (1 - x) * dufdP(P) + ufg(P) * dxdP_s(P, s)
+    return derivatives_s(P, s)['dudP_s']
 def dsdP_s(P, s):
     """ Derivative of equilibrium specific entropy [kJ m^3 / kg K kJ]
     w.r.t. pressure @ a given equilibrium entropy"""
-    x = x_s(P, s)
 
-    return x * dsgdP(P) + (1 - x) * dsfdP(P) + dxdP_s(P, s) * dsfgdP(P)
+    return derivatives_s(P, s)['dsdP_s']
 def dhdP_s(P, s):
     """ Derivative of equilibrium specific enthalpy [kJ m^3 / kg kJ]
     w.r.t. pressure @ a given equilibrium entropy"""
-    x = x_s(P, s)
 
-    return x * dhgdP(P) + (1 - x) * dhfdP(P) + hfg(P) * dxdP_s(P, s)
+    return derivatives_s(P, s)['dhdP_s']
 def dxdP_s(P, s):
     """ Derivative of equilibrium quality [m^3 / kJ]
     w.r.t. pressure"""
 
-    return (dsfgdP(P) * (sf(P) - s) - dsfdP(P) * sfg(P)) / sfg(P)**2
+    return _dxdP(_bundle(P), s, 's')
 
 def dgds_s(P, s):
     """ Derivative of equilibrium specific gibbs free energy [kJ kg K / kg kJ]
     w.r.t. equilibrium entropy @ a given pressure"""
 
-    return gfg(P) * dxds_s(P)
+    return derivatives_s(P, s)['dgds_s']
 def dvds_s(P, s):
     """ Derivative of equilibrium specific volume [m^3 kg K / kg kJ]
     w.r.t. equilibrium entropy @ a given pressure"""
 
-    return vfg(P) * dxds_s(P)
+    return derivatives_s(P, s)['dvds_s']
 def duds_s(P, s):
     """ Equilibrium specific internal energy [kJ kg K / kg kJ]
     w.r.t. equilibrium entropy @ a given pressure"""
 
-    return ufg(P) * dxds_s(P)
+    return derivatives_s(P, s)['duds_s']
 def dhds_s(P, s):
     """ Derivative of equilibrium specific enthalpy [kJ kg K / kg kJ]
     w.r.t. equilibrium entropy @ a given pressure"""
 
-    return hfg(P) * dxds_s(P)
+    return derivatives_s(P, s)['dhds_s']
 def dxds_s(P):
     """ Derivative of equilibrium quality [kg K / kJ]
     w.r.t. equilibrium entropy @ a given pressure"""
+    sat = _bundle(P)
+
+    return 1 / (sat['sg'] - sat['sf'])
+def derivatives_s(P, s):
+    """ Derivatives of g, v, u, s, h and T w.r.t. pressure at constant
+    entropy and w.r.t. entropy at constant pressure, from one saturation
+    bundle; returned as a dict keyed on the function names"""
+    P, s = asarray(P), asarray(s)
 
-    return 1 / sfg(P)
\ No newline at end of file
+    return _derivatives(P, s, 's')
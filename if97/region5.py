@@ -0,0 +1,557 @@
+from if97.common import asarray, evaluator, exp, log
+
+###########################################################
+#####       Constants and Dimensionless Functions     #####
+###########################################################
+
+# constants and non-dimenionalization;
+# Region 5, forwards equations for (P, T)
+J0 = [0, 1, -3, -2, -1, 2]
+n0 = [-0.13179983674201e2,  0.68540841634434e1, -0.24805148933466e-1, 0.36901534980333, -0.31161318213925e1, -0.32961626538917]
+Ir = [1, 1, 1, 2, 2, 3]
+Jr = [1, 2, 3, 3, 9, 7]
+nr = [ 0.15736404855259e-2, 0.90153761673944e-3, -0.50270077677648e-2, 0.22440037409485e-5, -0.41163275453471e-5, 0.37919454822955e-7]
+Ps = 1.0        #[Mpa]
+Ts = 1000.0     #[K]
+R  = 0.461526   #[kJ / kg K]
+
+# boundaries defining Region 5
+Tbnd25 = 1073.15    #[K]
+Tbnd5  = 2273.15    #[K]
+Pbnd0  = 1.0e-6     #[MPa]
+Pbnd5  = 50.0       #[MPa]
+
+# Newton steps inverting h(P, T) and s(P, T); from the middle of the
+# temperature range they reach round-off anywhere in the region
+NEWTON = 4
+
+# term evaluators of the forward equations;
+# the ideal-gas part is a series in tau alone
+gamma0_series = evaluator([0] * len(J0), J0, n0)
+gammaR_series = evaluator(Ir, Jr, nr)
+
+#### dimensionless functions ####
+def gamma(pi, tau):
+    """ Dimensionless form for the specific Gibbs free energy"""
+    sum = log(pi)
+    for Ji, ni in zip(J0, n0):
+        sum += ni * tau**Ji
+
+    for Ii, Ji, ni in zip(Ir, Jr, nr):
+        sum += ni * pi**Ii * tau**Ji
+    return sum
+def gamma_pi(pi, tau):
+    """ Derivative of dimensionless form for the 
+        specific Gibbs free energy w.r.t. dimensionless 
+        pressure (pi)"""
+    sum = 1 / pi
+
+    for Ii, Ji, ni in zip(Ir, Jr, nr):
+        sum += ni * Ii * pi**(Ii - 1) * tau**Ji
+    return sum
+def gamma_pipi(pi, tau):
+    """ Derivative (second) of dimensionless form for the 
+        specific Gibbs free energy w.r.t. dimensionless 
+        pressure (pi)"""   
+    sum = -1 / pi**2
+
+    for Ii, Ji, ni in zip(Ir, Jr, nr):
+        sum += ni * Ii * (Ii - 1) * pi**(Ii - 2) * tau**Ji
+    return sum
+def gamma_tau(pi, tau):
+    """ Derivative of dimensionless form for the 
+        specific Gibbs free energy w.r.t. dimensionless 
+        temperature (tau)"""
+    sum = 0 
+    for Ji, ni in zip(J0, n0):
+        sum += ni * Ji * tau**(Ji - 1)
+
+    for Ii, Ji, ni in zip(Ir, Jr, nr):
+        sum += ni * pi**Ii * Ji * tau**(Ji - 1)
+    return sum
+def gamma_tautau(pi, tau):
+    """ Derivative (second) of dimensionless form for the 
+        specific Gibbs free energy w.r.t. dimensionless 
+        temperature (tau)"""
+    sum = 0 
+    for Ji, ni in zip(J0, n0):
+        sum += ni * Ji * (Ji - 1) * tau**(Ji - 2)
+
+    for Ii, Ji, ni in zip(Ir, Jr, nr):
+        sum += ni * pi**Ii * Ji * (Ji - 1) * tau**(Ji - 2)
+    return sum
+def gamma_pitau(pi, tau):
+    """ Derivative (second) of dimensionless form for the 
+        specific Gibbs free energy w.r.t. dimensionless 
+        pressure (pi) and temperature (tau)"""
+    sum = 0
+
+    for Ii, Ji, ni in zip(Ir, Jr, nr):
+        sum += ni * Ii * pi**(Ii - 1) * Ji * tau**(Ji - 1)
+    return sum
+def gammaR_pi(pi, tau):
+    """ Derivative of dimensionless form for the 
+        specific Gibbs free energy w.r.t. dimensionless 
+        pressure (pi); residual part"""
+    sum = 0
+
+    for Ii, Ji, ni in zip(Ir, Jr, nr):
+        sum += ni * Ii * pi**(Ii - 1) * tau**Ji
+    return sum
+def gammaR_pipi(pi, tau):
+    """ Derivative (second) of dimensionless form for the 
+        specific Gibbs free energy w.r.t. dimensionless 
+        pressure (pi); residual part"""   
+    sum = 0
+
+    for Ii, Ji, ni in zip(Ir, Jr, nr):
+        sum += ni * Ii * (Ii - 1) * pi**(Ii - 2) * tau**Ji
+    return sum
+def gammaR_pitau(pi, tau):
+    """ Derivative of dimensionless form for the 
+        specific Gibbs free energy w.r.t. dimensionless 
+        pressure (pi); residual part"""
+    sum = 0
+
+    for Ii, Ji, ni in zip(Ir, Jr, nr):
+        sum += ni * Ii * pi**(Ii - 1) * Ji * tau**(Ji - 1)
+    return sum
+def gammas(pi, tau):
+    """ Dimensionless form for the specific Gibbs free energy and
+        its first and second derivatives w.r.t. dimensionless 
+        pressure (pi) and temperature (tau), evaluated together 
+        from shared powers of the ideal-gas and residual terms;
+        returns gamma, gamma_pi, gamma_pipi, gamma_tau, gamma_tautau, gamma_pitau,
+        and the residual parts gammaR_pi, gammaR_pipi, gammaR_pitau"""
+    G0, G0_x, G0_xx, G0_tau, G0_tautau, G0_xtau = gamma0_series(1.0, tau)
+    GR, GR_pi, GR_pipi, GR_tau, GR_tautau, GR_pitau = gammaR_series(pi, tau)
+    G0 += log(pi)
+
+    return G0 + GR, 1 / pi + GR_pi, -1 / pi**2 + GR_pipi, G0_tau + GR_tau, G0_tautau + GR_tautau, GR_pitau, \
+           GR_pi, GR_pipi, GR_pitau
+
+#### inverse functions ####
+def _T(P, Y, name):
+    """ Temperature [K] where the property name (h or s) equals Y,
+    from Newton steps on the forward equation (in ln T for s)"""
+    P, Y = asarray(P), asarray(Y)
+    pi = P / Ps
+    T = (Tbnd25 + Tbnd5) / 2
+
+    for i in range(NEWTON):
+        tau = Ts / T
+        G, G_pi, G_pipi, G_tau, G_tautau, G_pitau, GR_pi, GR_pipi, GR_pitau = gammas(pi, tau)
+        cp = -tau**2 * G_tautau * R
+        if name == 'h':
+            T = T - (tau * G_tau * R * T - Y) / cp
+        else:
+            T = T * exp(((tau * G_tau - G) * R - Y) / -cp)
+    return T
+
+###########################################################
+#####          Pressure-Temperature Formulation       #####
+###########################################################
+
+#### region 5 properties ####
+def g(P, T):
+    """ Specific Gibbs free energy [kJ / kg]"""
+    P, T = asarray(P), asarray(T)
+    pi = P / Ps
+    tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau, GR_pi, GR_pipi, GR_pitau = gammas(pi, tau)
+
+    return G * R * T
+def v(P, T):
+    """ Specific volume [m^3 / kg]"""
+    P, T = asarray(P), asarray(T)
+    pi = P / Ps
+    tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau, GR_pi, GR_pipi, GR_pitau = gammas(pi, tau)
+
+    return pi * G_pi * R * T / (P * 10**6 / 1000)
+def u(P, T):
+    """ Specific internal energy [kJ / kg]"""
+    P, T = asarray(P), asarray(T)
+    pi = P / Ps
+    tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau, GR_pi, GR_pipi, GR_pitau = gammas(pi, tau)
+
+    return (tau * G_tau - pi * G_pi) * R * T
+def s(P, T):
+    """ Specific entropy [kJ / kg K]"""
+    P, T = asarray(P), asarray(T)
+    pi = P / Ps
+    tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau, GR_pi, GR_pipi, GR_pitau = gammas(pi, tau)
+
+    return (tau * G_tau - G) * R
+def h(P, T):
+    """ Specific enthalpy [kJ / kg]"""
+    P, T = asarray(P), asarray(T)
+    pi = P / Ps
+    tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau, GR_pi, GR_pipi, GR_pitau = gammas(pi, tau)
+
+    return tau * G_tau * R * T
+def cp(P, T):
+    """ Specific isobaric heat capacity [kJ / kg K]"""
+    P, T = asarray(P), asarray(T)
+    pi = P / Ps
+    tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau, GR_pi, GR_pipi, GR_pitau = gammas(pi, tau)
+
+    return -tau**2 * G_tautau * R
+def cv(P, T):
+    """ Specific isochoric heat capacity [kJ / kg K]"""
+    P, T = asarray(P), asarray(T)
+    pi = P / Ps
+    tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau, GR_pi, GR_pipi, GR_pitau = gammas(pi, tau)
+
+    return (-tau**2 * G_tautau - (1 + pi * GR_pi - tau * pi * GR_pitau)**2 / (1 - pi**2 * GR_pipi)) * R
+def w(P, T):
+    """ Speed of sound [m / s]"""
+    P, T = asarray(P), asarray(T)
+    pi = P / Ps
+    tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau, GR_pi, GR_pipi, GR_pitau = gammas(pi, tau)
+
+    return (R * T * 1000 * (1 + 2 * pi * GR_pi + pi**2 * GR_pi**2) / ((1 - pi**2 * GR_pipi) + (1 + pi * GR_pi - tau * pi * G_pitau)**2 / (tau**2 * G_tautau)))**0.5
+def a(P, T):
+    """Isobaric cubic expansion coefficient [1 / K]"""
+    P, T = asarray(P), asarray(T)
+    pi = P / Ps
+    tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau, GR_pi, GR_pipi, GR_pitau = gammas(pi, tau)
+
+    return ((1 + pi * GR_pi - tau * pi * GR_pitau) / (1 + pi * GR_pi)) / T
+def k(P, T):
+    """Isothermal compressibility [kg / kJ]"""
+    P, T = asarray(P), asarray(T)
+    pi = P / Ps
+    tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau, GR_pi, GR_pipi, GR_pitau = gammas(pi, tau)
+
+    return ((1 - pi**2 * GR_pipi) / (1 + pi * GR_pi)) / (P * 10**6 / 1000)
+def properties(P, T):
+    """ Every property above evaluated from a single sweep of
+    gamma; returned as a dict keyed on the property names"""
+    P, T = asarray(P), asarray(T)
+    pi = P / Ps
+    tau = Ts / T
+    G, G_pi, G_pipi, G_tau, G_tautau, G_pitau, GR_pi, GR_pipi, GR_pitau = gammas(pi, tau)
+
+    return {'P': P, 'T': T,
+            'g': G * R * T,
+            'v': pi * G_pi * R * T / (P * 10**6 / 1000),
+            'u': (tau * G_tau - pi * G_pi) * R * T,
+            's': (tau * G_tau - G) * R,
+            'h': tau * G_tau * R * T,
+            'cp': -tau**2 * G_tautau * R,
+            'cv': (-tau**2 * G_tautau - (1 + pi * GR_pi - tau * pi * GR_pitau)**2 / (1 - pi**2 * GR_pipi)) * R,
+            'w': (R * T * 1000 * (1 + 2 * pi * GR_pi + pi**2 * GR_pi**2) / ((1 - pi**2 * GR_pipi) + (1 + pi * GR_pi - tau * pi * G_pitau)**2 / (tau**2 * G_tautau)))**0.5,
+            'a': ((1 + pi * GR_pi - tau * pi * GR_pitau) / (1 + pi * GR_pi)) / T,
+            'k': ((1 - pi**2 * GR_pipi) / (1 + pi * GR_pi)) / (P * 10**6 / 1000)}
+
+#### region 5 property derivatives ####
+def dgdP(P, T):
+    """ Derivative of specific gibbs free energy [kJ m^3 / kg kJ]
+    w.r.t pressure at constant temperature"""
+
+    return v(P, T)
+def dvdP(P, T):
+    """ Derivative of specific volume [m^3 m^3 / kg kJ]
+    w.r.t pressure at constant temperature"""
+
+    return -v(P, T) * k(P, T)
+def dudP(P, T):
+    """ Derivative of specific internal energy [kJ m^3 / kg kJ]
+    w.r.t pressure at constant temperature"""
+    P, T = asarray(P), asarray(T)
+
+    return v(P, T) * ((P * 10**6 / 1000) * k(P, T) - T * a(P, T))
+def dsdP(P, T):
+    """ Derivative of specific entropy [kJ m^3 / kg K kJ]
+    w.r.t pressure at constant temperature"""
+
+    return -v(P, T) * a(P, T)
+def dhdP(P, T):
+    """ Derivative of specific enthalpy [kJ m^3 / kg kJ]
+    w.r.t pressure at constant temperature"""
+    P, T = asarray(P), asarray(T)
+
+    return v(P, T) * (1 - T * a(P, T))
+
+def dgdT(P, T):
+    """ Derivative of specific gibbs free energy [kJ / kg K]
+    w.r.t temperature at constant pressure"""
+
+    return -s(P, T)
+def dvdT(P, T):
+    """ Derivative of specific volume [m^3 / kg K]
+    w.r.t temperature at constant pressure"""
+
+    return v(P, T) * a(P, T)
+def dudT(P, T):
+    """ Derivative of specific internal energy [kJ / kg K]
+    w.r.t temperature at constant pressure"""
+    P, T = asarray(P), asarray(T)
+
+    return cp(P, T) - (P * 10**6 / 1000) * v(P, T) * a(P, T)
+def dsdT(P, T):
+    """ Derivative of specific entropy [kJ / kg K K]
+    w.r.t temperature at constant pressure"""
+    P, T = asarray(P), asarray(T)
+
+    return cp(P, T) / T
+def dhdT(P, T):
+    """ Derivative of specific enthalpy [kJ / kg K]
+    w.r.t temperature at constant pressure"""
+
+    return cp(P, T)
+def derivatives(P, T):
+    """ Every derivative above, and those of temperature, from a single
+    sweep of gamma; returned as a dict keyed on the function names"""
+    props = properties(P, T)
+    P, T = props['P'], props['T']
+    v, s, cp, a, k = props['v'], props['s'], props['cp'], props['a'], props['k']
+    Pk = P * 10**6 / 1000
+
+    return {'dgdP': v,                     'dgdT': -s,
+            'dvdP': -v * k,                'dvdT': v * a,
+            'dudP': v * (Pk * k - T * a),  'dudT': cp - Pk * v * a,
+            'dsdP': -v * a,                'dsdT': cp / T,
+            'dhdP': v * (1 - T * a),       'dhdT': cp,
+            'dTdP': 0.0,                   'dTdT': 1.0}
+
+###########################################################
+#####          Pressure-Enthalpy Formulation          #####
+###########################################################
+
+#### region 5 properties ####
+def g_h(P, h):
+    """ Specific gibbs free energy [kJ / kg]"""
+
+    return g(P, T_h(P, h))
+def v_h(P, h):
+    """ Specific volume [m^3 / kg]"""
+
+    return v(P, T_h(P, h))
+def u_h(P, h):
+    """ Specific internal energy [kJ / kg]"""
+
+    return u(P, T_h(P, h))
+def s_h(P, h):
+    """ Specific entropy [kJ / kg K]"""
+
+    return s(P, T_h(P, h))
+def T_h(P, h):
+    """ Temperature [K]"""
+
+    return _T(P, h, 'h')
+def cp_h(P, h):
+    """ Specific isobaric heat capacity [kJ / kg K]"""
+
+    return cp(P, T_h(P, h))
+def cv_h(P, h):
+    """ Specific isochoric heat capacity [kJ / kg K]"""
+
+    return cv(P, T_h(P, h))
+def w_h(P, h):
+    """ Speed of sound [m / s]"""
+
+    return w(P, T_h(P, h))
+def a_h(P, h):
+    """Isobaric cubic expansion coefficient [1 / K]"""
+
+    return a(P, T_h(P, h))
+def k_h(P, h):
+    """Isothermal compressibility [kg / kJ]"""
+
+    return k(P, T_h(P, h))
+def properties_h(P, h):
+    """ Every property above evaluated from a single sweep of gamma"""
+
+    return properties(P, T_h(P, h))
+
+#### region 5 property derivatives ####
+def dgdP_h(P, h):
+    """ Derivative of specific gibbs free energy [kJ m^3 / kg kJ]
+    w.r.t pressure at constant specific enthalpy"""
+
+    return derivatives_h(P, h)['dgdP_h']
+def dvdP_h(P, h):
+    """ Derivative of specific volume [m^3 m^3 / kg kJ]
+    w.r.t pressure at constant specific enthalpy"""
+
+    return derivatives_h(P, h)['dvdP_h']
+def dudP_h(P, h):
+    """ Derivative of specific internal energy [kJ m^3 / kg kJ]
+    w.r.t pressure at constant specific enthalpy"""
+
+    return derivatives_h(P, h)['dudP_h']
+def dsdP_h(P, h):
+    """ Derivative of specific entropy [kJ m^3 / kg K kJ]
+    w.r.t pressure at constant specific enthalpy"""
+
+    return derivatives_h(P, h)['dsdP_h']
+def dTdP_h(P, h):
+    """ Derivative of Temperature [K m^3 / kJ]
+    w.r.t pressure at constant specific enthalpy"""
+
+    return derivatives_h(P, h)['dTdP_h']
+
+def dgdh_h(P, h):
+    """ Derivative of specific gibbs free energy [kJ kg / kg kJ]
+    w.r.t specific enthalpy at constant pressure"""
+
+    return derivatives_h(P, h)['dgdh_h']
+def dvdh_h(P, h):
+    """ Derivative of specific volume [m^3 kg / kg kJ]
+    w.r.t specific enthalpy at constant pressure"""
+
+    return derivatives_h(P, h)['dvdh_h']
+def dudh_h(P, h):
+    """ Derivative of specific internal energy [kJ kg / kg kJ]
+    w.r.t specific enthalpy at constant pressure"""
+
+    return derivatives_h(P, h)['dudh_h']
+def dsdh_h(P, h):
+    """ Derivative of specific entropy [kJ kg / kg K kJ]
+    w.r.t specific enthalpy at constant pressure"""
+
+    return derivatives_h(P, h)['dsdh_h']
+def dTdh_h(P, h):
+    """ Derivative of Temperature [K kg / kJ]
+    w.r.t specific enthalpy at constant pressure"""
+
+    return derivatives_h(P, h)['dTdh_h']
+def derivatives_h(P, h):
+    """ Derivatives of g, v, u, s, h and T w.r.t. pressure at constant
+    enthalpy and w.r.t. enthalpy at constant pressure, from one
+    backward temperature and one derivatives sweep; returned as a
+    dict keyed on the function names"""
+    P, h = asarray(P), asarray(h)
+    d = derivatives(P, T_h(P, h))
+
+    jacobian = {}
+    for X in ['g', 'v', 'u', 's', 'h', 'T']:
+        jacobian['d' + X + 'dP_h'] = (d['d' + X + 'dP'] * d['dhdT'] - d['d' + X + 'dT'] * d['dhdP']) / d['dhdT']
+        jacobian['d' + X + 'dh_h'] = d['d' + X + 'dT'] / d['dhdT']
+    return jacobian
+
+###########################################################
+#####           Pressure-Entropy Formulation          #####
+###########################################################
+
+#### region 5 properties ####
+def g_s(P, s):
+    """ Specific gibbs free energy [kJ / kg]"""
+
+    return g(P, T_s(P, s))
+def v_s(P, s):
+    """ Specific volume [m^3 / kg]"""
+
+    return v(P, T_s(P, s))
+def u_s(P, s):
+    """ Specific internal energy [kJ / kg]"""
+
+    return u(P, T_s(P, s))
+def T_s(P, s):
+    """ Temperature [K]"""
+
+    return _T(P, s, 's')
+def h_s(P, s):
+    """ Specific enthalpy [kJ / kg]"""
+
+    return h(P, T_s(P, s))
+def cp_s(P, s):
+    """ Specific isobaric heat capacity [kJ / kg K]"""
+
+    return cp(P, T_s(P, s))
+def cv_s(P, s):
+    """ Specific isochoric heat capacity [kJ / kg K]"""
+
+    return cv(P, T_s(P, s))
+def w_s(P, s):
+    """ Speed of sound [m / s]"""
+
+    return w(P, T_s(P, s))
+def a_s(P, s):
+    """Isobaric cubic expansion coefficient [1 / K]"""
+
+    return a(P, T_s(P, s))
+def k_s(P, s):
+    """Isothermal compressibility [kg / kJ]"""
+
+    return k(P, T_s(P, s))
+def properties_s(P, s):
+    """ Every property above evaluated from a single sweep of gamma"""
+
+    return properties(P, T_s(P, s))
+
+#### region 5 property derivatives ####
+def dgdP_s(P, s):
+    """ Derivative of specific gibbs free energy [kJ m^3 / kg kJ]
+    w.r.t pressure at constant specific entropy"""
+
+    return derivatives_s(P, s)['dgdP_s']
+def dvdP_s(P, s):
+    """ Derivative of specific volume [m^3 m^3 / kg kJ]
+    w.r.t pressure at constant specific entropy"""
+
+    return derivatives_s(P, s)['dvdP_s']
+def dudP_s(P, s):
+    """ Derivative of specific internal energy [kJ m^3 / kg kJ]
+    w.r.t pressure at constant specific entropy"""
+
+    return derivatives_s(P, s)['dudP_s']
+def dTdP_s(P, s):
+    """ Derivative of Temperature [K m^3 / kJ]
+    w.r.t pressure at constant specific entropy"""
+
+    return derivatives_s(P, s)['dTdP_s']
+def dhdP_s(P, s):
+    """ Derivative of specific entropy [kJ m^3 / kg kJ]
+    w.r.t pressure at constant specific entropy"""
+
+    return derivatives_s(P, s)['dhdP_s']
+
+def dgds_s(P, s):
+    """ Derivative of specific gibbs free energy [kJ kg K / kg kJ]
+    w.r.t specific entropy at constant pressure"""
+
+    return derivatives_s(P, s)['dgds_s']
+def dvds_s(P, s):
+    """ Derivative of specific volume [m^3 kg K/ kg kJ]
+    w.r.t specific entropy at constant pressure"""
+
+    return derivatives_s(P, s)['dvds_s']
+def duds_s(P, s):
+    """ Derivative of specific internal energy [kJ kg K/ kg kJ]
+    w.r.t specific entropy at constant pressure"""
+
+    return derivatives_s(P, s)['duds_s']
+def dTds_s(P, s):
+    """ Derivative of Temperature [K kg K / kJ]
+    w.r.t specific entropy at constant pressure"""
+
+    return derivatives_s(P, s)['dTds_s']
+def dhds_s(P, s):
+    """ Derivative of specific enthalpy [kJ kg K / kg kJ]
+    w.r.t specific entropy at constant pressure"""
+
+    return derivatives_s(P, s)['dhds_s']
+def derivatives_s(P, s):
+    """ Derivatives of g, v, u, s, h and T w.r.t. pressure at constant
+    entropy and w.r.t. entropy at constant pressure, from one
+    backward temperature and one derivatives sweep; returned as a
+    dict keyed on the function names"""
+    P, s = asarray(P), asarray(s)
+    d = derivatives(P, T_s(P, s))
+
+    jacobian = {}
+    for X in ['g', 'v', 'u', 's', 'h', 'T']:
+        jacobian['d' + X + 'dP_s'] = (d['d' + X + 'dP'] * d['dsdT'] - d['d' + X + 'dT'] * d['dsdP']) / d['dsdT']
+        jacobian['d' + X + 'ds_s'] = d['d' + X + 'dT'] / d['dsdT']
+    return jacobian
@@ -1,5 +1,5 @@
 import unittest
-from if97 import region1, region2, region3, region4, h2o, moody
+from if97 import region1, region2, region3, region4, region5, h2o, moody, common
 import numpy
 import matplotlib
 from matplotlib import pyplot, cm, patches, lines
@@ -29,6 +29,13 @@ class test_ThermodynamicProperty(unittest.TestCase):
         self.assertEqual(round(region1.cp(3, 500), 8), 0.465580682e1,   'Failed specific heat capacity,   state 3, region 1!')
         self.assertEqual(round(region1.cv(3, 500), 8), 0.322139223e1,   'Failed specific heat capacity,   state 3, region 1!')
         self.assertEqual(round(region1.w(3, 500), 5),  0.124071337e4,   'Failed speed of sound,           state 3, region 1!')
+    def test_ThermodynamicProperty_Region1_Fused(self):
+        kernels = [region1.gamma, region1.gamma_pi, region1.gamma_pipi, region1.gamma_tau, region1.gamma_tautau, region1.gamma_pitau]
+        for k, (P, T) in enumerate([(3, 300), (80, 300), (3, 500)]):
+            pi  = P / region1.Ps
+            tau = region1.Ts / T
+            for kernel, fused in zip(kernels, region1.gammas(pi, tau)):
+                self.assertAlmostEqual(fused / kernel(pi, tau), 1.000, places=12, msg='Failed fused '+kernel.__name__+', state '+str(k+1)+', region 1!')
     def test_ThermodynamicProperty_Region2(self):
         self.assertEqual(round(region2.v(0.0035, 300), 7),  0.394913866e2, 'Failed specific volume,          state 1, region 2!')
         self.assertEqual(round(region2.u(0.0035, 300), 5),  0.241169160e4, 'Failed specific internal energy, state 1, region 2!')
@@ -50,6 +57,17 @@ class test_ThermodynamicProperty(unittest.TestCase):
         self.assertEqual(round(region2.h(30, 700), 5),  0.263149474e4,     'Failed specific enthalpy,        state 3, region 2!')
         self.assertEqual(round(region2.cp(30, 700), 7), 0.103505092e2,     'Failed specific heat capacity,   state 3, region 2!')
         self.assertEqual(round(region2.w(30, 700), 6),  0.480386523e3,     'Failed speed of sound,           state 3, region 2!')
+    def test_ThermodynamicProperty_Region2_Fused(self):
+        kernels = [region2.gamma, region2.gamma_pi, region2.gamma_pipi, region2.gamma_tau, region2.gamma_tautau, region2.gamma_pitau,
+                   region2.gammaR_pi, region2.gammaR_pipi, region2.gammaR_pitau]
+        for k, (P, T) in enumerate([(0.0035, 300), (0.0035, 700), (30, 700)]):
+            pi  = P / region2.Ps
+            tau = region2.Ts / T
+            for kernel, fused in zip(kernels, region2.gammas(pi, tau)):
+                self.assertAlmostEqual(fused / kernel(pi, tau), 1.000, places=12, msg='Failed fused '+kernel.__name__+', state '+str(k+1)+', region 2!')
+
+            cv = region2.cp(P, T) - T * region2.v(P, T) * region2.a(P, T)**2 / region2.k(P, T)
+            self.assertAlmostEqual(region2.cv(P, T) / cv, 1.000, places=12, msg='Failed specific heat capacity, state '+str(k+1)+', region 2!')
     def test_ThermodynamicProperty_Region3_bnd23(self):
         self.assertEqual(round(region3.bnd23T(0.165291643e2), 6), 0.623150000e3, 'Failed boundary equation, region 23 by T!')
         self.assertEqual(round(region3.bnd23P(0.623150000e3), 7), 0.165291643e2, 'Failed boundary equation, region 23 by P!') 
@@ -74,6 +92,13 @@ class test_ThermodynamicProperty(unittest.TestCase):
         self.assertEqual(round(region3.h(1 / 500, 750), 5),  0.225868845e4, 'Failed specific enthalpy,        state 3, region 3!')
         self.assertEqual(round(region3.cp(1 / 500, 750), 8), 0.634165359e1, 'Failed specific heat capacity,   state 3, region 3!')
         self.assertEqual(round(region3.w(1 / 500, 750), 6),  0.760696041e3, 'Failed speed of sound,           state 3, region 3!')
+    def test_ThermodynamicProperty_Region3_Fused(self):
+        kernels = [region3.phi, region3.phi_delta, region3.phi_deltadelta, region3.phi_tau, region3.phi_tautau, region3.phi_deltatau]
+        for k, (nu, T) in enumerate([(1 / 500, 650), (1 / 200, 650), (1 / 500, 750)]):
+            delta = 1 / nu / region3.rhos
+            tau   = region3.Ts / T
+            for kernel, fused in zip(kernels, region3.phis(delta, tau)):
+                self.assertAlmostEqual(fused / kernel(delta, tau), 1.000, places=12, msg='Failed fused '+kernel.__name__+', state '+str(k+1)+', region 3!')
     def test_ThermodynamicProperty_Region4_satP(self):
         self.assertEqual(round(region4.satP(300), 11), 0.353658941e-2, 'Failed satuation pressure, 300K!') 
         self.assertEqual(round(region4.satP(500), 8),  0.263889776e1,  'Failed satuation pressure, 500K!') 
@@ -82,6 +107,485 @@ class test_ThermodynamicProperty(unittest.TestCase):
         self.assertEqual(round(region4.satT(0.10), 6), 0.372755919e3,  'Failed satuation pressure, 0.1 MPa!') 
         self.assertEqual(round(region4.satT(1.00), 6), 0.453035632e3,  'Failed satuation pressure, 1.0 MPa!') 
         self.assertEqual(round(region4.satT(10.0), 6), 0.584149488e3,  'Failed satuation pressure, 10  MPa!') 
+    def test_ThermodynamicProperty_Region4_sat3(self):
+        states_h = [(1700, 17.24175718), (2000, 21.93442957), (2400, 20.18090839)]
+        states_s = [(3.8, 16.87755057), (4.2, 21.64451789), (5.2, 16.68968482)]
+        states_hs = [(1800, 5.3, 346.8475498), (2400, 6.0, 425.1373305), (2500, 5.5, 522.5579013)]
+        for i, (h, P) in enumerate(states_h):
+            self.assertAlmostEqual(region4.p3sat_h(h) / P, 1.000, places=8, msg='Failed saturation pressure, state '+str(i+1)+', region 3 (h)!')
+        for i, (s, P) in enumerate(states_s):
+            self.assertAlmostEqual(region4.p3sat_s(s) / P, 1.000, places=8, msg='Failed saturation pressure, state '+str(i+1)+', region 3 (s)!')
+        for i, (h, s, T) in enumerate(states_hs):
+            self.assertAlmostEqual(region4.Tsat_hs(h, s) / T, 1.000, places=8, msg='Failed saturation temperature, state '+str(i+1)+', region 4 (h, s)!')
+
+        h = numpy.array([h for h, P in states_h])
+        s = numpy.array([s for s, P in states_s])
+        hs = numpy.array([h for h, s, T in states_hs]), numpy.array([s for h, s, T in states_hs])
+        for i, (Ph, Ps, T) in enumerate(zip(region4.p3sat_h(h), region4.p3sat_s(s), region4.Tsat_hs(*hs))):
+            self.assertAlmostEqual(Ph / states_h[i][1], 1.000, places=8, msg='Failed vectorized saturation pressure, state '+str(i+1)+', region 3 (h)!')
+            self.assertAlmostEqual(Ps / states_s[i][1], 1.000, places=8, msg='Failed vectorized saturation pressure, state '+str(i+1)+', region 3 (s)!')
+            self.assertAlmostEqual(T / states_hs[i][2], 1.000, places=8, msg='Failed vectorized saturation temperature, state '+str(i+1)+', region 4 (h, s)!')
+    def test_ThermodynamicProperty_Region4_dome(self):
+        # the saturated states of region 3 are monotone up to the critical point
+        P = numpy.linspace(21.93, 22.063, 200)
+        hf, hg, sf, sg = region4.hf(P), region4.hg(P), region4.sf(P), region4.sg(P)
+        self.assertTrue((numpy.diff(hf) > 0).all() and (numpy.diff(hg) < 0).all(), 'Failed monotone saturated enthalpy, region 3!')
+        self.assertTrue((numpy.diff(sf) > 0).all() and (numpy.diff(sg) < 0).all(), 'Failed monotone saturated entropy, region 3!')
+
+        # and are states of region 3 at P and satT(P), in phase equilibrium
+        for P in [18, 20, 21.95, 22.0, 22.05, 22.06]:
+            T = region4.satT(P)
+            for phase in 'fg':
+                v = getattr(region4, 'v' + phase)(P)
+                self.assertAlmostEqual(region3.P(v, T) / P, 1.000, places=12, msg='Failed saturated pressure, '+str(P)+' MPa, region 3!')
+                self.assertAlmostEqual(getattr(region4, 'h' + phase)(P) / region3.h(v, T), 1.000, places=12, msg='Failed saturated enthalpy, '+str(P)+' MPa, region 3!')
+                self.assertAlmostEqual(getattr(region4, 's' + phase)(P) / region3.s(v, T), 1.000, places=12, msg='Failed saturated entropy, '+str(P)+' MPa, region 3!')
+            self.assertAlmostEqual(region4.gf(P) - region4.gg(P), 0.000, places=2, msg='Failed phase equilibrium, '+str(P)+' MPa, region 3!')
+
+        # they join those of regions 1 and 2 continuously at 623.15 K
+        P = region4.satP(623.15)
+        for name in ['hf', 'sf', 'vf', 'cpf', 'hg', 'sg', 'vg', 'cpg', 'dhfdP', 'dvfdP', 'dhgdP', 'dsgdP']:
+            func = getattr(region4, name)
+            self.assertAlmostEqual(func(P * (1 + 1e-9)) / func(P * (1 - 1e-9)), 1.000, places=7, msg='Failed continuous '+name+' at 623.15 K!')
+
+        # h2o mixes the states within the dome with a quality between 0 and 1
+        for P in [17, 20, 21.95, 22.0, 22.05, 22.063]:
+            for name, Y, side in [('h', region4.hf(P), 1), ('h', region4.hg(P), -1), ('s', region4.sf(P), 1), ('s', region4.sg(P), -1)]:
+                idRegion, state = (h2o.idRegion_h, h2o.state_h) if name == 'h' else (h2o.idRegion_s, h2o.state_s)
+                self.assertEqual(idRegion(P, Y * (1 - side * 1e-9)), 3, 'Failed single-phase identification, '+str(P)+' MPa, region 3 (P, '+name+')!')
+                self.assertEqual(idRegion(P, Y * (1 + side * 1e-9)), 4, 'Failed two-phase identification, '+str(P)+' MPa, region 3 (P, '+name+')!')
+                self.assertTrue(0 <= state(P, Y * (1 + side * 1e-9)).x <= 1, 'Failed quality, '+str(P)+' MPa, region 3 (P, '+name+')!')
+        for P, h in [(22.046, 2050), (22.062, 2100)]:
+            self.assertTrue(0 <= h2o.state_h(P, h).x <= 1, 'Failed quality, '+str(P)+' MPa, region 3 (P, h)!')
+
+        # the derivatives along saturation follow the saturated states
+        for P in [16.6, 17, 20, 21.95, 22.0, 22.05, 22.06]:
+            for X in ['g', 'v', 'u', 's', 'h']:
+                for phase in 'fg':
+                    func, deriv = getattr(region4, X + phase), getattr(region4, 'd' + X + phase + 'dP')
+                    fd = (func(P + 1e-5) - func(P - 1e-5)) / (2e-5 * 1e3)
+                    self.assertAlmostEqual(deriv(P) / fd, 1.000, places=3, msg='Failed d'+X+phase+'dP, '+str(P)+' MPa, region 3!')
+
+    def test_ThermodynamicProperty_Region5(self):
+        self.assertEqual(round(region5.v(0.5, 1500), 8),  0.138455090e1, 'Failed specific volume,          state 1, region 5!')
+        self.assertEqual(round(region5.u(0.5, 1500), 5),  0.452749310e4, 'Failed specific internal energy, state 1, region 5!')
+        self.assertEqual(round(region5.s(0.5, 1500), 8),  0.965408875e1, 'Failed specific entropy,         state 1, region 5!')
+        self.assertEqual(round(region5.h(0.5, 1500), 5),  0.521976855e4, 'Failed specific enthalpy,        state 1, region 5!')
+        self.assertEqual(round(region5.cp(0.5, 1500), 8), 0.261609445e1, 'Failed specific heat capacity,   state 1, region 5!')
+        self.assertEqual(round(region5.w(0.5, 1500), 6),  0.917068690e3, 'Failed speed of sound,           state 1, region 5!')
+
+        self.assertEqual(round(region5.v(30, 1500), 10), 0.230761299e-1, 'Failed specific volume,          state 2, region 5!')
+        self.assertEqual(round(region5.u(30, 1500), 5),  0.447495124e4, 'Failed specific internal energy, state 2, region 5!')
+        self.assertEqual(round(region5.s(30, 1500), 8),  0.772970133e1, 'Failed specific entropy,         state 2, region 5!')
+        self.assertEqual(round(region5.h(30, 1500), 5),  0.516723514e4, 'Failed specific enthalpy,        state 2, region 5!')
+        self.assertEqual(round(region5.cp(30, 1500), 8), 0.272724317e1, 'Failed specific heat capacity,   state 2, region 5!')
+        self.assertEqual(round(region5.w(30, 1500), 6),  0.928548002e3, 'Failed speed of sound,           state 2, region 5!')
+
+        self.assertEqual(round(region5.v(30, 2000), 10), 0.311385219e-1, 'Failed specific volume,          state 3, region 5!')
+        self.assertEqual(round(region5.u(30, 2000), 5),  0.563707038e4, 'Failed specific internal energy, state 3, region 5!')
+        self.assertEqual(round(region5.s(30, 2000), 8),  0.853640523e1, 'Failed specific entropy,         state 3, region 5!')
+        self.assertEqual(round(region5.h(30, 2000), 5),  0.657122604e4, 'Failed specific enthalpy,        state 3, region 5!')
+        self.assertEqual(round(region5.cp(30, 2000), 8), 0.288569882e1, 'Failed specific heat capacity,   state 3, region 5!')
+        self.assertEqual(round(region5.w(30, 2000), 5),  0.106736948e4, 'Failed speed of sound,           state 3, region 5!')
+    def test_ThermodynamicProperty_Region5_Fused(self):
+        kernels = [region5.gamma, region5.gamma_pi, region5.gamma_pipi, region5.gamma_tau, region5.gamma_tautau, region5.gamma_pitau,
+                   region5.gammaR_pi, region5.gammaR_pipi, region5.gammaR_pitau]
+        for k, (P, T) in enumerate([(0.5, 1500), (30, 1500), (30, 2000)]):
+            pi  = P / region5.Ps
+            tau = region5.Ts / T
+            for kernel, fused in zip(kernels, region5.gammas(pi, tau)):
+                self.assertAlmostEqual(fused / kernel(pi, tau), 1.000, places=10, msg='Failed fused '+kernel.__name__+', state '+str(k+1)+', region 5!')
+
+            props = region5.properties(P, T)
+            for prop in [region5.g, region5.v, region5.u, region5.s, region5.h, region5.cp, region5.cv, region5.w, region5.a, region5.k]:
+                self.assertAlmostEqual(props[prop.__name__] / prop(P, T), 1.000, places=12, msg='Failed fused '+prop.__name__+', state '+str(k+1)+', region 5!')
+
+class test_ThermodynamicVectorized(unittest.TestCase):
+    def test_ThermodynamicVectorized_Region1(self):
+        P = numpy.array([3, 80, 3])
+        T = numpy.array([300, 300, 500])
+
+        for prop in [region1.g, region1.v, region1.u, region1.s, region1.h, region1.cp, region1.cv, region1.w, region1.a, region1.k,
+                     region1.dvdP, region1.dudP, region1.dhdP, region1.dvdT, region1.dudT, region1.dsdT]:
+            vector = prop(P, T)
+            listed = prop(list(P), list(T))
+            for i in range(len(P)):
+                scalar = prop(float(P[i]), float(T[i]))
+                self.assertAlmostEqual(vector[i] / scalar, 1.000, places=12, msg='Failed vectorized '+prop.__name__+', state '+str(i+1)+', region 1!')
+                self.assertEqual(listed[i], vector[i], 'Failed listed '+prop.__name__+', state '+str(i+1)+', region 1!')
+
+        self.assertEqual([round(x, d) for x, d in zip(region1.v(P, T), [11, 12, 11])], [0.100215168e-2, 0.971180894e-3, 0.120241800e-2], 'Failed specific volume, region 1!')
+        self.assertEqual(list(numpy.round(region1.w(P, T), 5)),  [0.150773921e4, 0.163469054e4, 0.124071337e4], 'Failed speed of sound, region 1!')
+        self.assertEqual(list(numpy.round(region1.T_h([3, 80, 80], [500, 500, 1500]), 6)), [0.391798509e3, 0.378108626e3, 0.611041229e3], 'Failed backward temperature, region 1!')
+        self.assertEqual(list(numpy.round(region1.T_s([3, 80, 80], [0.5, 0.5, 3.0]), 6)), [0.307842258e3, 0.309979785e3, 0.565899909e3], 'Failed backward temperature, region 1!')
+
+    def test_ThermodynamicVectorized_Region2(self):
+        P = numpy.array([0.0035, 0.0035, 30])
+        T = numpy.array([300, 700, 700])
+
+        for prop in [region2.g, region2.v, region2.u, region2.s, region2.h, region2.cp, region2.cv, region2.w, region2.a, region2.k,
+                     region2.dvdP, region2.dudP, region2.dhdP, region2.dvdT, region2.dudT, region2.dsdT]:
+            vector = prop(P, T)
+            for i in range(len(P)):
+                scalar = prop(float(P[i]), float(T[i]))
+                self.assertAlmostEqual(vector[i] / scalar, 1.000, places=12, msg='Failed vectorized '+prop.__name__+', state '+str(i+1)+', region 2!')
+
+        self.assertEqual([round(x, 6) for x in region2.w(P, T)], [0.427920172e3, 0.644289068e3, 0.480386523e3], 'Failed speed of sound, region 2!')
+    def test_ThermodynamicVectorized_Region3(self):
+        nu = numpy.array([1 / 500, 1 / 200, 1 / 500])
+        T  = numpy.array([650, 650, 750])
+
+        for prop in [region3.f, region3.P, region3.u, region3.s, region3.h, region3.cp, region3.cv, region3.w, region3.a, region3.b,
+                     region3.dfdv, region3.dPdv, region3.dudv, region3.dsdv, region3.dhdv,
+                     region3.dfdT, region3.dPdT, region3.dudT, region3.dsdT, region3.dhdT]:
+            vector = prop(nu, T)
+            for i in range(len(nu)):
+                scalar = prop(float(nu[i]), float(T[i]))
+                self.assertAlmostEqual(vector[i] / scalar, 1.000, places=12, msg='Failed vectorized '+prop.__name__+', state '+str(i+1)+', region 3!')
+
+        self.assertEqual([round(x, 7) for x in region3.P(nu, T)], [0.255837018e2, 0.222930643e2, 0.783095639e2], 'Failed pressure, region 3!')
+        self.assertEqual([round(x, 6) for x in region3.w(list(nu), list(T))], [0.502005554e3, 0.383444594e3, 0.760696041e3], 'Failed speed of sound, region 3!')
+    def test_ThermodynamicVectorized_Backwards(self):
+        P = numpy.array([40, 0.001, 5, 60, 3, 25, 5, 3, 60])
+        h = numpy.array([2700, 3000, 3500, 2700, 4000, 3500, 4000, 3000, 3200])
+
+        self.assertEqual(list(region2.idRegion_h(P, h)), [3, 1, 2, 3, 1, 2, 2, 1, 3], 'Failed vectorized subregion identification by h, region 2!')
+        for i in range(len(P)):
+            self.assertAlmostEqual(region2.T_h(P, h)[i] / region2.T_h(float(P[i]), float(h[i])), 1.000, places=12, msg='Failed vectorized backward temperature by h, state '+str(i+1)+', region 2!')
+        self.assertEqual(round(region2.bnd2b2c([0.100e3, 0.100e3])[1], 6), 0.3516004323e4, 'Failed vectorized boundary equation, region 2b-2c!')
+
+        P = numpy.array([80, 0.1, 8.0, 20, 0.1, 90, 2.5, 8.0, 80])
+        s = numpy.array([5.25, 7.5, 6.0, 5.75, 8.0, 6.0, 8.0, 7.5, 5.75])
+
+        self.assertEqual(list(region2.idRegion_s(P, s)), [3, 1, 2, 3, 1, 2, 1, 2, 3], 'Failed vectorized subregion identification by s, region 2!')
+        for i in range(len(P)):
+            self.assertAlmostEqual(region2.T_s(P, s)[i] / region2.T_s(float(P[i]), float(s[i])), 1.000, places=12, msg='Failed vectorized backward temperature by s, state '+str(i+1)+', region 2!')
+    def test_ThermodynamicVectorized_Region4(self):
+        P = numpy.array([0.1, 1.0, 10.0])
+        T = numpy.array([300, 500, 600])
+
+        self.assertEqual([round(x, 6) for x in region4.satT(P)], [0.372755919e3, 0.453035632e3, 0.584149488e3], 'Failed vectorized saturation temperature!')
+        self.assertEqual([round(x, d) for x, d in zip(region4.satP(list(T)), [11, 8, 7])], [0.353658941e-2, 0.263889776e1, 0.123443146e2], 'Failed vectorized saturation pressure!')
+
+        for prop in [region4.satT, region4.dTsdP, region4.gf, region4.vf, region4.hf, region4.cpf, region4.sg, region4.wg, region4.kg,
+                     region4.vfg, region4.hfg, region4.sfg, region4.dvfdP, region4.dhgdP, region4.dhfgdP, region4.dsfgdP]:
+            vector = prop(P)
+            for i in range(len(P)):
+                scalar = prop(float(P[i]))
+                self.assertAlmostEqual(vector[i] / scalar, 1.000, places=12, msg='Failed vectorized '+prop.__name__+', state '+str(i+1)+', region 4!')
+        for prop in [region4.satP, region4.dPsdT]:
+            vector = prop(T)
+            for i in range(len(T)):
+                scalar = prop(float(T[i]))
+                self.assertAlmostEqual(vector[i] / scalar, 1.000, places=12, msg='Failed vectorized '+prop.__name__+', state '+str(i+1)+', region 4!')
+
+    def test_TermEvaluator(self):
+        I = [-1.5, 0, 0, 1, 3, 3]
+        J = [-4, 0, 2, 7, -1, 12]
+        n = [0.5, -1.25, 2.0, 0.75, -3.0, 1.5e-3]
+        x, y = 1.3, 0.8
+
+        sums = [sum(ni * x**Ii * y**Ji for Ii, Ji, ni in zip(I, J, n)),
+                sum(ni * Ii * x**(Ii - 1) * y**Ji for Ii, Ji, ni in zip(I, J, n)),
+                sum(ni * Ii * (Ii - 1) * x**(Ii - 2) * y**Ji for Ii, Ji, ni in zip(I, J, n)),
+                sum(ni * Ji * x**Ii * y**(Ji - 1) for Ii, Ji, ni in zip(I, J, n)),
+                sum(ni * Ji * (Ji - 1) * x**Ii * y**(Ji - 2) for Ii, Ji, ni in zip(I, J, n)),
+                sum(ni * Ii * Ji * x**(Ii - 1) * y**(Ji - 1) for Ii, Ji, ni in zip(I, J, n))]
+        for k, (value, expected) in enumerate(zip(common.evaluator(I, J, n)(x, y), sums)):
+            self.assertAlmostEqual(value / expected, 1.000, places=12, msg='Failed term evaluator, derivative '+str(k)+'!')
+        self.assertAlmostEqual(common.evaluator(I, J, n, order = 0)(x, y) / sums[0], 1.000, places=12, msg='Failed term evaluator, sum!')
+
+        X = numpy.full(2 * common.BLOCK + 1, x)
+        for value, expected in zip(common.evaluator(I, J, n)(X, y), sums):
+            self.assertEqual(value.shape, X.shape, 'Failed blockwise term evaluator shape!')
+            self.assertAlmostEqual(value[-1] / expected, 1.000, places=12, msg='Failed blockwise term evaluator!')
+        self.assertAlmostEqual(region2.h(numpy.full(2 * common.BLOCK + 1, 0.1), 900)[-1] / region2.h(0.1, 900), 1.000, places=12, msg='Failed blockwise constant sums!')
+    def test_ThermodynamicJacobian(self):
+        for region, P, T in [(region1, numpy.array([3, 80, 3]), numpy.array([300, 300, 500])),
+                             (region2, numpy.array([0.0035, 0.0035, 30]), numpy.array([300, 700, 700]))]:
+            h, s = region.h(P, T), region.s(P, T)
+            for Y, y, jacobian in [('h', h, region.derivatives_h), ('s', s, region.derivatives_s)]:
+                vector = jacobian(P, y)
+                self.assertEqual(len(vector), 12, 'Failed jacobian size, '+region.__name__+'!')
+                for i in range(len(P)):
+                    scalar = jacobian(float(P[i]), float(y[i]))
+                    Ti = region.T_h(float(P[i]), float(y[i])) if Y == 'h' else region.T_s(float(P[i]), float(y[i]))
+                    dYdP, dYdT = getattr(region, 'd'+Y+'dP')(float(P[i]), Ti), getattr(region, 'd'+Y+'dT')(float(P[i]), Ti)
+                    for X in ['g', 'v', 'u', 's']:
+                        dXdP, dXdT = getattr(region, 'd'+X+'dP')(float(P[i]), Ti), getattr(region, 'd'+X+'dT')(float(P[i]), Ti)
+                        if X != Y:
+                            self.assertAlmostEqual(scalar['d'+X+'dP_'+Y] / ((dXdP * dYdT - dXdT * dYdP) / dYdT), 1.000, places=12, msg='Failed jacobian d'+X+'dP_'+Y+', state '+str(i+1)+', '+region.__name__+'!')
+                        self.assertAlmostEqual(scalar['d'+X+'d'+Y+'_'+Y] / (dXdT / dYdT), 1.000, places=12, msg='Failed jacobian d'+X+'d'+Y+'_'+Y+', state '+str(i+1)+', '+region.__name__+'!')
+                    self.assertEqual(scalar['d'+Y+'dP_'+Y], 0.000, 'Failed jacobian d'+Y+'dP_'+Y+', '+region.__name__+'!')
+                    self.assertAlmostEqual(scalar['d'+Y+'d'+Y+'_'+Y], 1.000, places=12, msg='Failed jacobian d'+Y+'d'+Y+'_'+Y+', '+region.__name__+'!')
+                    self.assertAlmostEqual(scalar['dTdP_'+Y] / (-dYdP / dYdT), 1.000, places=12, msg='Failed jacobian dTdP_'+Y+', '+region.__name__+'!')
+                    for name in scalar:
+                        if scalar[name] != 0.0:
+                            self.assertAlmostEqual(vector[name][i] / scalar[name], 1.000, places=12, msg='Failed vectorized jacobian '+name+', state '+str(i+1)+', '+region.__name__+'!')
+    def test_ThermodynamicJacobian_Region4(self):
+        P = numpy.array([0.1, 1.0, 10.0])
+        for Y, y, jacobian in [('h', numpy.array([1500, 2000, 2500]), region4.derivatives_h),
+                               ('s', numpy.array([4.0, 5.0, 5.5]), region4.derivatives_s)]:
+            vector = jacobian(P, y)
+            self.assertEqual(len(vector), 12, 'Failed jacobian size, region 4!')
+            for i in range(len(P)):
+                Pi, yi = float(P[i]), float(y[i])
+                scalar = jacobian(Pi, yi)
+                self.assertAlmostEqual(scalar['d'+Y+'dP_'+Y], 0.000, places=9, msg='Failed jacobian d'+Y+'dP_'+Y+', region 4!')
+                self.assertAlmostEqual(scalar['d'+Y+'d'+Y+'_'+Y], 1.000, places=12, msg='Failed jacobian d'+Y+'d'+Y+'_'+Y+', region 4!')
+                self.assertEqual(scalar['dTdP_'+Y], region4.dTsdP(Pi), 'Failed jacobian dTdP_'+Y+', region 4!')
+                for X in ['g', 'v', 'u', 's', 'h']:
+                    if X != Y:
+                        self.assertAlmostEqual(scalar['d'+X+'dP_'+Y] / getattr(region4, 'd'+X+'dP_'+Y)(Pi, yi), 1.000, places=12, msg='Failed jacobian d'+X+'dP_'+Y+', state '+str(i+1)+', region 4!')
+                        self.assertAlmostEqual(scalar['d'+X+'d'+Y+'_'+Y] / getattr(region4, 'd'+X+'d'+Y+'_'+Y)(Pi, yi), 1.000, places=12, msg='Failed jacobian d'+X+'d'+Y+'_'+Y+', state '+str(i+1)+', region 4!')
+                    self.assertAlmostEqual(vector['d'+X+'d'+Y+'_'+Y][i] / scalar['d'+X+'d'+Y+'_'+Y], 1.000, places=12, msg='Failed vectorized jacobian d'+X+'d'+Y+'_'+Y+', state '+str(i+1)+', region 4!')
+
+        P = numpy.array([3, 0.0035, 0.1, 10.0])
+        h = numpy.array([500, 2600, 1500, 3500])
+        vector = h2o.derivatives_h(P, h)
+        for i in range(len(P)):
+            scalar = h2o.derivatives_h(float(P[i]), float(h[i]))
+            for name in ['dvdP_h', 'dTdP_h', 'dsdh_h', 'dTdh_h']:
+                self.assertAlmostEqual(vector[name][i] - scalar[name], 0.000, places=12, msg='Failed vectorized h2o jacobian '+name+', state '+str(i+1)+'!')
+            self.assertEqual(scalar['dvdP_h'], h2o.dvdP_h(float(P[i]), float(h[i])), 'Failed h2o jacobian dvdP_h, state '+str(i+1)+'!')
+        self.assertEqual(h2o.derivatives_s(0.1, 4.0)['dTds_s'], 0.000, 'Failed h2o jacobian dTds_s, region 4!')
+    def test_ThermodynamicVectorized_h2o(self):
+        P = numpy.array([3, 80, 0.0035, 30, 0.1, 1.0, 10.0])
+        T = numpy.array([300, 500, 300, 700, 400, 453, 800])
+        h = numpy.array([500, 1500, 2600, 3000, 1500, 2000, 3500])
+        s = numpy.array([1.0, 3.0, 7.0, 6.0, 4.0, 6.5, 6.8])
+
+        self.assertEqual(list(h2o.idRegion(P, T)),   [1, 1, 2, 2, 2, 1, 2], 'Failed vectorized region identification by T!')
+        self.assertEqual(list(h2o.idRegion_h(P, h)), [1, 1, 2, 2, 4, 4, 2], 'Failed vectorized region identification by h!')
+        self.assertEqual(list(h2o.idRegion_s(P, s)), [1, 1, 4, 2, 4, 4, 2], 'Failed vectorized region identification by s!')
+
+        for X, Y, props in [(P, T, [h2o.v, h2o.h, h2o.cp, h2o.w, h2o.dvdP, h2o.dhdT]),
+                            (P, h, [h2o.v_h, h2o.T_h, h2o.s_h, h2o.cp_h, h2o.dTdP_h, h2o.dvdh_h]),
+                            (P, s, [h2o.v_s, h2o.T_s, h2o.h_s, h2o.cp_s, h2o.dTdP_s, h2o.dhds_s])]:
+            for prop in props:
+                vector = prop(X, Y)
+                for i in range(len(X)):
+                    scalar = prop(float(X[i]), float(Y[i]))
+                    self.assertAlmostEqual(vector[i] / scalar, 1.000, places=12, msg='Failed vectorized '+prop.__name__+', state '+str(i+1)+'!')
+
+        self.assertEqual(round(h2o.T_h(list(P), list(h))[0], 6), 0.391798509e3, 'Failed vectorized backward temperature from list!')
+        self.assertEqual(h2o.v(P, T, region = 1)[0], region1.v(3, 300), 'Failed vectorized region override!')
+
+    def test_ThermodynamicBatch(self):
+        P = numpy.array([3, 200, 25, 0.1, numpy.nan])
+        T = numpy.array([300, 300, 650, 400, 300])
+
+        self.assertRaises(AssertionError, h2o.idRegion, P, T)
+        self.assertEqual(list(h2o.idRegion(P, T, strict = False)), [1, 0, 3, 2, 0], 'Failed non-strict region identification!')
+        self.assertEqual(h2o.idRegion_h(200, 1500, strict = False), 0, 'Failed non-strict region identification by h!')
+
+        v, region = h2o.batch(h2o.v, P, T)
+        self.assertEqual(list(region), [1, 0, 3, 2, 0], 'Failed batch region!')
+        self.assertEqual(list(numpy.isnan(v)), [False, True, False, False, True], 'Failed batch NaN mask!')
+        self.assertEqual([v[0], v[3]], [h2o.v(3, 300), h2o.v(0.1, 400)], 'Failed batch values!')
+
+        T, region = h2o.batch_h(h2o.T_h, [0.1, 200, 3], [1500, 1500, 500])
+        self.assertEqual(list(region), [4, 0, 1], 'Failed batch region by h!')
+        self.assertTrue(numpy.isnan(T[1]), 'Failed batch NaN by h!')
+        self.assertEqual(T[2], h2o.T_h(3, 500), 'Failed batch value by h!')
+
+        state, region = h2o.batch_s(h2o.state_s, [0.1, 200], [4.0, 4.0])
+        self.assertEqual(list(region), [4, 0], 'Failed batch region by s!')
+        self.assertEqual([state.x[0], numpy.isnan(state.h[1])], [h2o.state_s(0.1, 4.0).x, True], 'Failed batch state by s!')
+        self.assertEqual(h2o.batch(h2o.h, 200, 300)[1], 0, 'Failed scalar batch region!')
+        self.assertTrue(numpy.isnan(h2o.batch(h2o.h, 200, 300)[0]), 'Failed scalar batch NaN!')
+
+        # states outside every region are NaN without batch as well
+        self.assertTrue(numpy.isnan(h2o.h(200, 300, region = 6)), 'Failed scalar NaN dispatch!')
+        self.assertEqual(list(numpy.isnan(h2o.v(P, [300, 300, 650, 400, 300], region = numpy.array([1, 0, 3, 2, 0])))), [False, True, False, False, True], 'Failed NaN dispatch!')
+    def test_BoundaryCache(self):
+        cache = common.Cache(maxsize = 2)
+        for key in [1, 2, 1, 3]:
+            cache.lookup(key, lambda key: key**2)
+        self.assertEqual(cache.info(), {'hits': 1, 'misses': 3, 'evictions': 1, 'size': 2, 'maxsize': 2}, 'Failed cache counters!')
+        self.assertEqual(list(cache.entries.items()), [(1, 1), (3, 9)], 'Failed least recently used eviction!')
+
+        cache = common.Cache(maxsize = 0)
+        for key in [1, 1]:
+            self.assertEqual(cache.lookup(key, lambda key: key**2), 1, 'Failed zero-size cache value!')
+        self.assertEqual(cache.info(), {'hits': 0, 'misses': 2, 'evictions': 0, 'size': 0, 'maxsize': 0}, 'Failed zero-size cache counters!')
+
+        h2o.boundary_cache_h.clear()
+        h2o.boundary_cache_s.clear()
+        for i in range(3):
+            self.assertEqual(h2o.idRegion_h(3, 500), 1, 'Failed interpolated region identification by h!')
+            self.assertEqual(h2o.idRegion_h(0.1, region4.hf(0.1)), 1, 'Failed cached region identification by h!')
+            self.assertEqual(h2o.idRegion_s(0.1, region4.sg(0.1)), 2, 'Failed cached region identification by s!')
+        self.assertEqual([h2o.boundary_cache_h.hits, h2o.boundary_cache_h.misses], [2, 1], 'Failed boundary cache by h!')
+        self.assertEqual([h2o.boundary_cache_s.hits, h2o.boundary_cache_s.misses], [2, 1], 'Failed boundary cache by s!')
+        self.assertEqual(h2o.boundary_cache_h.lookup(3, h2o._boundaries_h)[0], region1.h(3, region1.Tbnd13), 'Failed cached boundary value!')
+
+        h2o.boundary_cache_h.clear()
+        self.assertEqual(h2o.boundary_cache_h.info()['size'], 0, 'Failed boundary cache clear!')
+
+        bnd = h2o.boundary_constants()
+        self.assertIs(bnd, h2o.boundary_constants(), 'Failed boundary constants table reuse!')
+        self.assertEqual(bnd['hbnd01'], region1.h(region4.satP(273.16), 273.16), 'Failed boundary constant, h at 273.16 K!')
+        self.assertEqual(bnd['hbnd25'], region2.h(1e-6, 1073.15), 'Failed boundary constant, h at 1073.15 K!')
+        self.assertEqual(round(bnd['Pbndh1'], 6), 16.529164, 'Failed boundary constant, saturation pressure at 623.15 K!')
+    def test_BoundaryInterpolation(self):
+        rs = numpy.random.RandomState(97)
+        P = numpy.exp(rs.uniform(numpy.log(1e-6), numpy.log(100), 20000))
+        for compute, cache, Y in [(h2o._boundaries_h, h2o.boundary_cache_h, rs.uniform(-10, 4200, P.size)),
+                                  (h2o._boundaries_s, h2o.boundary_cache_s, rs.uniform(-0.1, 12, P.size))]:
+            for k, (exact, fast) in enumerate(zip(compute(P), h2o._boundaries(P, Y, compute, cache))):
+                self.assertTrue(((Y <= exact) == (Y <= fast)).all() and ((Y >= exact) == (Y >= fast)).all(), 'Failed interpolated boundary '+str(k)+', '+compute.__name__+'!')
+            for i in range(0, P.size, 2000):
+                self.assertEqual(h2o._boundaries(float(P[i]), float(Y[i]), compute, cache)[0] <= Y[i], compute(float(P[i]))[0] <= Y[i], 'Failed scalar interpolated boundary, '+compute.__name__+'!')
+
+        h = numpy.array([region4.hf(1.0), region4.hg(1.0), 1500, 2000])
+        self.assertEqual(list(h2o.idRegion_h(1.0, h)), [1, 2, 4, 4], 'Failed region identification on the saturation lines!')
+    def test_SaturationBundle(self):
+        region4.saturation_cache.clear()
+        P = 1.0
+        T = region4.satT(P)
+
+        sat = region4.saturation(P)
+        self.assertEqual(sat, region4.saturation(P), 'Failed cached saturation bundle!')
+        self.assertEqual([region4.saturation_cache.hits, region4.saturation_cache.misses], [1, 1], 'Failed saturation cache counters!')
+        region4.saturation(P)['hf'] = 0.0
+        self.assertEqual(region4.hf(P), sat['hf'], 'Failed private cached saturation bundle!')
+        for name, expected in [('satT', T), ('hf', region1.h(P, T)), ('vg', region2.v(P, T)), ('cvf', region1.cv(P, T)),
+                               ('dhfdP', region1.dhdP(P, T) + region1.dhdT(P, T) * region4.dTsdP(P)),
+                               ('dugdP', region2.dudP(P, T) + region2.dudT(P, T) * region4.dTsdP(P)),
+                               ('dsgdP', region2.dsdP(P, T) + region2.dsdT(P, T) * region4.dTsdP(P))]:
+            self.assertAlmostEqual(sat[name] / expected, 1.000, places=12, msg='Failed saturation bundle, '+name+'!')
+
+        x = region4.x_h(P, 1500)
+        self.assertAlmostEqual(x, (1500 - region1.h(P, T)) / (region2.h(P, T) - region1.h(P, T)), places=12, msg='Failed bundle quality!')
+        self.assertAlmostEqual(region4.v_h(P, 1500) / (x * region2.v(P, T) + (1 - x) * region1.v(P, T)), 1.000, places=12, msg='Failed bundle mixing!')
+        self.assertAlmostEqual(region4.dhdP_h(P, 1500), 0.000, places=9, msg='Failed dhdP_h, region 4!')
+        self.assertAlmostEqual(region4.dsdP_s(P, 4.0), 0.000, places=9, msg='Failed dsdP_s, region 4!')
+        self.assertEqual(region4.saturation_cache.misses, 1, 'Failed saturation cache reuse!')
+    def test_RegionHints(self):
+        rs = numpy.random.RandomState(19)
+        P = numpy.exp(rs.uniform(numpy.log(1e-6), numpy.log(100), 20000))
+        for idRegion, resolve, Y in [(h2o.idRegion, h2o.resolve, rs.uniform(270, 1080, P.size)),
+                                     (h2o.idRegion_h, h2o.resolve_h, rs.uniform(-10, 4200, P.size)),
+                                     (h2o.idRegion_s, h2o.resolve_s, rs.uniform(-0.1, 12, P.size))]:
+            region = idRegion(P, Y, strict = False)
+            for hint in [region, 1, 2, 4, rs.choice([0, 1, 2, 4], P.size)]:
+                self.assertTrue((resolve(P, Y, hint, strict = False) == region).all(), 'Failed region hints, '+resolve.__name__+'!')
+            for i in range(0, P.size, 500):
+                for hint in [0, 1, 2, 4]:
+                    self.assertEqual(resolve(float(P[i]), float(Y[i]), hint, strict = False), region[i], 'Failed scalar region hint '+str(hint)+', '+resolve.__name__+'!')
+
+        self.assertEqual([h2o.resolve_h(1.0, region4.hf(1.0), 4), h2o.resolve_h(1.0, region4.hg(1.0), 4)], [1, 2], 'Failed region hint on the saturation lines!')
+        self.assertRaises(AssertionError, h2o.resolve, 200, 300, 1)
+
+        v, region = h2o.hinted_h(h2o.v_h, [3, 0.1, 0.0035], [500, 1500, 2600], [1, 1, 2])
+        self.assertEqual(list(region), [1, 4, 2], 'Failed hinted regions by h!')
+        self.assertEqual(list(v), [h2o.v_h(3, 500), h2o.v_h(0.1, 1500), h2o.v_h(0.0035, 2600)], 'Failed hinted values by h!')
+        self.assertEqual(h2o.hinted_s(h2o.T_s, 0.1, 4.0, 4), (region4.satT(0.1), 4), 'Failed scalar hinted value by s!')
+        self.assertEqual(h2o.hinted(h2o.h, 30, 700, 1), (h2o.h(30, 700), 2), 'Failed wrong hint by T!')
+    def test_Sweep(self):
+        T = numpy.sort(numpy.append(numpy.linspace(273.16, 1073.15, 5001), [region4.satT(3.0), 623.15]))
+        h = numpy.sort(numpy.append(numpy.linspace(4000, 1, 5001), [region4.hf(1.0), region4.hg(1.0)]))[::-1]
+        s = numpy.sort(numpy.append(numpy.linspace(0.1, 10, 5001), [region4.sf(0.01), region4.sg(0.01)]))
+        for sweep, idRegion, prop, X, Y in [(h2o.sweep, h2o.idRegion, h2o.h, 3.0, T),
+                                            (h2o.sweep, h2o.idRegion, h2o.v, 16.529164252604478, T[T < 630]),
+                                            (h2o.sweep, h2o.idRegion, h2o.cp, numpy.linspace(16, 1e-6, 5001), 623.15),
+                                            (h2o.sweep, h2o.idRegion, h2o.h, numpy.linspace(1e-6, 100, 5001), 500.0),
+                                            (h2o.sweep, h2o.idRegion, h2o.h, 30.0, T),
+                                            (h2o.sweep, h2o.idRegion, h2o.v, numpy.linspace(1e-6, 100, 5001), 700.0),
+                                            (h2o.sweep_h, h2o.idRegion_h, h2o.T_h, 1.0, h),
+                                            (h2o.sweep_h, h2o.idRegion_h, h2o.v_h, 30.0, h[h < 1500]),
+                                            (h2o.sweep_h, h2o.idRegion_h, h2o.T_h, numpy.linspace(0.01, 10, 5001), 2500.0),
+                                            (h2o.sweep_s, h2o.idRegion_s, h2o.T_s, 0.01, s),
+                                            (h2o.sweep, h2o.idRegion, h2o.h, numpy.array([3, 0.1, 10]), 500.0)]:
+            values, region = sweep(prop, X, Y)
+            self.assertTrue((region == idRegion(X, Y)).all(), 'Failed sweep regions, '+prop.__name__+'!')
+            self.assertTrue((values == prop(X, Y)).all(), 'Failed sweep values, '+prop.__name__+'!')
+
+        state, region = h2o.sweep_h(h2o.state_h, 1.0, h)
+        self.assertTrue((state.T == h2o.T_h(1.0, h)).all(), 'Failed sweep state!')
+        self.assertRaises(AssertionError, h2o.sweep, h2o.h, 110.0, T)
+    def test_Memoization(self):
+        h2o.clear_memo()
+        h2o.h(3, 300)
+        self.assertEqual(h2o.memo_info()['PT']['misses'], 0, 'Failed memoization off by default!')
+
+        with h2o.memoize(maxsize = 2):
+            for i in range(3):
+                self.assertEqual(h2o.h(3, 300), region1.h(3, 300), 'Failed exact memoized value!')
+                self.assertEqual(h2o.T_h(0.1, 1500), region4.satT(0.1), 'Failed exact memoized value by h!')
+            self.assertEqual(h2o.satT(1.0), region4.satT(1.0), 'Failed memoized saturation value!')
+            self.assertEqual([h2o.memo_info()['PT']['hits'], h2o.memo_info()['PT']['misses']], [2, 1], 'Failed memo counters!')
+            self.assertEqual(h2o.memo_info()['Ph']['hits'], 2, 'Failed memo counters by h!')
+            self.assertEqual(h2o.memo_info()['sat']['misses'], 1, 'Failed memo counters of saturation!')
+
+            h2o.v(3, 300), h2o.v(3, 301)
+            self.assertEqual(h2o.memo_info()['PT']['evictions'], 1, 'Failed memo eviction!')
+            self.assertEqual(list(h2o.v(3, numpy.array([300, 301]))), [region1.v(3, 300), region1.v(3, 301)], 'Failed memo bypass for arrays!')
+
+            jacobian = h2o.derivatives_h(3, 500)
+            jacobian['dvdP_h'] = 0.000
+            self.assertNotEqual(h2o.derivatives_h(3, 500)['dvdP_h'], 0.000, 'Failed memo copy of dict values!')
+
+        with h2o.memoize(rtol = 1e-9):
+            self.assertAlmostEqual(h2o.h(3, 300) / region1.h(3, 300), 1.000, places=7, msg='Failed quantized memo value!')
+            self.assertEqual(h2o.h(3, 300 * (1 + 1e-12)), h2o.h(3, 300), 'Failed quantized memo lookup!')
+            self.assertEqual(h2o.memo_info()['PT']['hits'], 2, 'Failed quantized memo counters!')
+        self.assertEqual(h2o.memo_info()['PT']['size'], 0, 'Failed memo cleanup on exit!')
+        self.assertEqual(h2o.h(3, 300), region1.h(3, 300), 'Failed exact value after memoization!')
+
+        with h2o.memoize(maxsize = 0):
+            for i in range(2):
+                self.assertEqual(h2o.h(3, 300), region1.h(3, 300), 'Failed zero-size memoized value!')
+            self.assertEqual([h2o.memo_info()['PT']['misses'], h2o.memo_info()['PT']['size']], [2, 0], 'Failed zero-size memo counters!')
+
+        # a nested block restores the outer settings, including the cache size
+        h2o.enable_memo(maxsize = 64, rtol = 1e-9)
+        with h2o.memoize(maxsize = 2):
+            pass
+        self.assertEqual([h2o._memo['enabled'], h2o._memo['rtol'], h2o.memo_info()['PT']['maxsize']], [True, 1e-9, 64], 'Failed memo settings restored on exit!')
+        h2o.disable_memo()
+        with h2o.memoize(maxsize = 2):
+            pass
+        self.assertEqual([h2o._memo['enabled'], h2o.memo_info()['PT']['maxsize']], [False, 64], 'Failed memo settings restored on exit when disabled!')
+
+        # turning memoization off from within a memoized evaluation sticks
+        disabling = h2o._memoized(lambda P, T: h2o.disable_memo() or h2o.h(P, T), 'PT', 2)
+        with h2o.memoize():
+            self.assertEqual(disabling(3, 300), region1.h(3, 300), 'Failed nested memoized value!')
+            self.assertFalse(h2o._memo['enabled'], 'Failed memo disabled while evaluating!')
+    def test_ThermodynamicState(self):
+        names = ['g', 'v', 'u', 's', 'h', 'cp', 'cv', 'w', 'a', 'k']
+        P = numpy.array([3, 80, 0.0035, 30, 0.1, 1.0, 10.0])
+        T = numpy.array([300, 500, 300, 700, 400, 453, 800])
+        h = numpy.array([500, 1500, 2600, 3000, 1500, 2000, 3500])
+        s = numpy.array([1.0, 3.0, 7.0, 6.0, 4.0, 6.5, 6.8])
+
+        for X, Y, state, suffix in [(P, T, h2o.state, ''), (P, h, h2o.state_h, '_h'), (P, s, h2o.state_s, '_s')]:
+            vector = state(X, Y)
+            for i in range(len(X)):
+                scalar = state(float(X[i]), float(Y[i]))
+                self.assertEqual(scalar.region, vector.region[i], 'Failed state'+suffix+' region, state '+str(i+1)+'!')
+                for name in [name for name in names if name + suffix not in ['h_h', 's_s']]:
+                    prop = getattr(h2o, name + suffix)(float(X[i]), float(Y[i]))
+                    self.assertAlmostEqual(getattr(scalar, name) / prop, 1.000, places=12, msg='Failed state'+suffix+' '+name+', state '+str(i+1)+'!')
+                    self.assertAlmostEqual(getattr(vector, name)[i] / prop, 1.000, places=12, msg='Failed vectorized state'+suffix+' '+name+', state '+str(i+1)+'!')
+
+        state = h2o.state(3, 300)
+        self.assertEqual(round(state.v, 11), 0.100215168e-2, 'Failed state specific volume, region 1!')
+        self.assertEqual(round(state.w, 5),  0.150773921e4, 'Failed state speed of sound, region 1!')
+        self.assertEqual(round(h2o.state_h(0.1, 1500).x / region4.x_h(0.1, 1500), 12), 1.000, 'Failed state quality, region 4!')
+        self.assertRaises(AttributeError, setattr, state, 'rho', 1000)
+
+        for X, Y, props, suffix in [(P, T, h2o.props, ''), (P, h, h2o.props_h, '_h'), (P, s, h2o.props_s, '_s')]:
+            for i in range(len(X)):
+                values = props(float(X[i]), float(Y[i]), names = ['v', 'T', 'cp', 'w'])
+                self.assertEqual(sorted(values), ['T', 'cp', 'v', 'w'], 'Failed props'+suffix+' names!')
+                for name in ['v', 'cp', 'w'] + ([] if suffix == '' else ['T']):
+                    prop = getattr(h2o, name + suffix)(float(X[i]), float(Y[i]))
+                    self.assertAlmostEqual(values[name] / prop, 1.000, places=12, msg='Failed props'+suffix+' '+name+', state '+str(i+1)+'!')
+        self.assertEqual(h2o.props_h(list(P), list(h))['T'][4], h2o.T_h(0.1, 1500), 'Failed vectorized props_h, region 4!')
+        self.assertEqual(len(h2o.props_s(0.1, 4.0)), 13, 'Failed props_s default names!')
 
 class test_ThermodynamicPropertyBackwards(unittest.TestCase):
     def test_ThermodynamicProperty_Region1_Ph(self):
@@ -233,6 +737,141 @@ class test_ThermodynamicPropertyBackwards(unittest.TestCase):
         self.assertAlmostEqual(region2.w(30, 700)  / region2.w_s(30,  region2.s(30, 700)), 1.000, places=2, msg='Failed w consistancy,  state 3, region 2!')
         self.assertAlmostEqual(region2.a(30, 700)  / region2.a_s(30,  region2.s(30, 700)), 1.000, places=2, msg='Failed a consistancy,  state 3, region 2!')
         self.assertAlmostEqual(region2.k(30, 700)  / region2.k_s(30,  region2.s(30, 700)), 1.000, places=2, msg='Failed k consistancy,  state 3, region 2!')
+    def test_ThermodynamicProperty_Region3_PT(self):
+        states = [('a', 50, 630, 0.1470853100e-2), ('a', 80, 670, 0.1503831359e-2), ('b', 50, 710, 0.2204728587e-2), ('b', 80, 750, 0.1973692940e-2),
+                  ('c', 20, 630, 0.1761696406e-2), ('c', 30, 650, 0.1819560617e-2), ('d', 26, 656, 0.2245587720e-2), ('d', 30, 670, 0.2506897702e-2),
+                  ('e', 26, 661, 0.2970225962e-2), ('e', 30, 675, 0.3004627086e-2), ('f', 26, 671, 0.5019029401e-2), ('f', 30, 690, 0.4656470142e-2),
+                  ('g', 23.6, 649, 0.2163198378e-2), ('g', 24, 650, 0.2166044161e-2), ('h', 23.6, 652, 0.2651081407e-2), ('h', 24, 654, 0.2967802335e-2),
+                  ('i', 23.6, 653, 0.3273916816e-2), ('i', 24, 655, 0.3550329864e-2), ('j', 23.5, 655, 0.4545001142e-2), ('j', 24, 660, 0.5100267704e-2),
+                  ('k', 23, 660, 0.6109525997e-2), ('k', 24, 670, 0.6427325645e-2), ('l', 22.6, 646, 0.2117860851e-2), ('l', 23, 646, 0.2062374674e-2),
+                  ('m', 22.6, 648.6, 0.2533063780e-2), ('m', 22.8, 649.3, 0.2572971781e-2), ('n', 22.6, 649.0, 0.2923432711e-2), ('n', 22.8, 649.7, 0.2913311494e-2),
+                  ('o', 22.6, 649.1, 0.3131208996e-2), ('o', 22.8, 649.9, 0.3221160278e-2), ('p', 22.6, 649.4, 0.3715596186e-2), ('p', 22.8, 650.2, 0.3664754790e-2),
+                  ('q', 21.1, 640, 0.1970999272e-2), ('q', 21.8, 643, 0.2043919161e-2), ('r', 21.1, 644, 0.5251009921e-2), ('r', 21.8, 648, 0.5256844741e-2),
+                  ('s', 19.1, 635, 0.1932829079e-2), ('s', 20, 638, 0.1985387227e-2), ('t', 17, 626, 0.8483262001e-2), ('t', 20, 640, 0.6227528101e-2),
+                  ('u', 21.5, 644.6, 0.2268366647e-2), ('u', 22, 646.1, 0.2296350553e-2), ('v', 22.5, 648.6, 0.2832373260e-2), ('v', 22.3, 647.9, 0.2811424405e-2),
+                  ('w', 22.15, 647.5, 0.3694032281e-2), ('w', 22.3, 648.1, 0.3622226305e-2), ('x', 22.11, 648, 0.4528072649e-2), ('y', 22, 646.84, 0.2698354719e-2),
+                  ('y', 22.064, 647.05, 0.2717655648e-2), ('z', 22, 646.89, 0.3798732962e-2), ('z', 22.064, 647.15, 0.3701940010e-2)]
+        for key, P, T, v in states:
+            self.assertEqual(region3.subregion(P, T), key, 'Failed subregion identification, region 3'+key+'!')
+            self.assertAlmostEqual(region3.v_T(P, T) / v, 1.000, places=9, msg='Failed backward specific volume, ('+str(P)+', '+str(T)+'), region 3'+key+'!')
+            self.assertAlmostEqual(region3.P(region3.v_T(P, T), T) / P, 1.000, places=3, msg='Failed P consistancy, ('+str(P)+', '+str(T)+'), region 3'+key+'!')
+
+        P = numpy.array([key_P for key, key_P, key_T, v in states])
+        T = numpy.array([key_T for key, key_P, key_T, v in states])
+        self.assertEqual(list(region3.subregion(P, T)), [key for key, key_P, key_T, v in states], 'Failed vectorized subregion identification, region 3!')
+        for i, nu in enumerate(region3.v_T(P, T)):
+            self.assertAlmostEqual(nu / region3.v_T(float(P[i]), float(T[i])), 1.000, places=12, msg='Failed vectorized backward specific volume, state '+str(i+1)+', region 3!')
+
+        props = region3.properties_T(25, 650)
+        for prop in [region3.g_T, region3.v_T, region3.u_T, region3.s_T, region3.h_T, region3.cp_T, region3.cv_T, region3.w_T, region3.a_T, region3.k_T]:
+            self.assertAlmostEqual(props[prop.__name__[:-2]] / prop(25, 650), 1.000, places=12, msg='Failed fused '+prop.__name__+', region 3!')
+            self.assertAlmostEqual(getattr(h2o, prop.__name__[:-2])(25, 650) / prop(25, 650), 1.000, places=12, msg='Failed h2o '+prop.__name__+', region 3!')
+        self.assertEqual(h2o.idRegion(25, 650), 3, 'Failed region identification, region 3!')
+        self.assertAlmostEqual(region3.h(1 / 500, 650) / h2o.h(region3.P(1 / 500, 650), 650), 1.000, places=5, msg='Failed h consistancy, region 3!')
+
+    def test_ThermodynamicProperty_Region3_Ph_Ps(self):
+        self.assertAlmostEqual(region3.bnd3a3b(25) / 2.095936454e3, 1.000, places=9, msg='Failed 3a-3b boundary, region 3!')
+
+        states_h = [(1, 20, 1700, 629.3083892, 1.749903962e-3), (1, 50, 2000, 690.5718338, 1.908139035e-3), (1, 100, 2100, 733.6163014, 1.676229776e-3),
+                    (2, 20, 2500, 641.8418053, 6.670547043e-3), (2, 50, 2400, 735.1848618, 2.801244590e-3), (2, 100, 2700, 842.0460876, 2.404234998e-3)]
+        for i, (key, P, h, T, v) in enumerate(states_h):
+            self.assertEqual(region3.idRegion_h(P, h), key, 'Failed subregion identification, state '+str(i+1)+', region 3 (P, h)!')
+            self.assertAlmostEqual(region3.T_h(P, h) / T, 1.000, places=9, msg='Failed backward temperature, state '+str(i+1)+', region 3 (P, h)!')
+            self.assertAlmostEqual(region3.v_h(P, h) / v, 1.000, places=9, msg='Failed backward specific volume, state '+str(i+1)+', region 3 (P, h)!')
+            self.assertEqual(h2o.idRegion_h(P, h), 3, 'Failed region identification, state '+str(i+1)+', region 3 (P, h)!')
+            self.assertAlmostEqual(h2o.T_h(P, h) / T, 1.000, places=9, msg='Failed h2o temperature, state '+str(i+1)+', region 3 (P, h)!')
+
+        states_s = [(1, 20, 3.8, 628.2959869, 1.733791463e-3), (1, 50, 3.6, 629.7158726, 1.469680170e-3), (1, 100, 4.0, 705.6880237, 1.555893131e-3),
+                    (2, 20, 5.0, 640.1176443, 6.262101987e-3), (2, 50, 4.5, 716.3687517, 2.332634294e-3), (2, 100, 5.0, 847.4332825, 2.449610757e-3)]
+        for i, (key, P, s, T, v) in enumerate(states_s):
+            self.assertEqual(region3.idRegion_s(P, s), key, 'Failed subregion identification, state '+str(i+1)+', region 3 (P, s)!')
+            self.assertAlmostEqual(region3.T_s(P, s) / T, 1.000, places=9, msg='Failed backward temperature, state '+str(i+1)+', region 3 (P, s)!')
+            self.assertAlmostEqual(region3.v_s(P, s) / v, 1.000, places=9, msg='Failed backward specific volume, state '+str(i+1)+', region 3 (P, s)!')
+            self.assertEqual(h2o.idRegion_s(P, s), 3, 'Failed region identification, state '+str(i+1)+', region 3 (P, s)!')
+            self.assertAlmostEqual(h2o.v_s(P, s) / v, 1.000, places=9, msg='Failed h2o specific volume, state '+str(i+1)+', region 3 (P, s)!')
+
+        P = numpy.array([P for key, P, h, T, v in states_h])
+        h = numpy.array([h for key, P, h, T, v in states_h])
+        s = numpy.array([s for key, P, s, T, v in states_s])
+        for i, (T_h, T_s) in enumerate(zip(region3.T_h(P, h), region3.T_s(P, s))):
+            self.assertAlmostEqual(T_h / region3.T_h(float(P[i]), float(h[i])), 1.000, places=12, msg='Failed vectorized temperature, state '+str(i+1)+', region 3 (P, h)!')
+            self.assertAlmostEqual(T_s / region3.T_s(float(P[i]), float(s[i])), 1.000, places=12, msg='Failed vectorized temperature, state '+str(i+1)+', region 3 (P, s)!')
+
+        # the two-phase dome below the critical point is region 4, mixed
+        # from the saturated states of region 3
+        self.assertEqual(h2o.idRegion_h(20, 2000), 4, 'Failed two-phase identification, region 3 (P, h)!')
+        self.assertEqual(h2o.idRegion_s(20, 4.4), 4, 'Failed two-phase identification, region 3 (P, s)!')
+        self.assertEqual(list(h2o.idRegion_h(numpy.array([20, 20, 20, 22.0]), numpy.array([1800, 2000, 2420, 2000]))), [3, 4, 3, 3], 'Failed vectorized two-phase identification, region 3 (P, h)!')
+        self.assertEqual(list(h2o.idRegion_s(numpy.array([20, 20, 20, 22.1]), numpy.array([4.0, 4.4, 4.95, 4.4]))), [3, 4, 3, 3], 'Failed vectorized two-phase identification, region 3 (P, s)!')
+        for P in [17, 20, 21.5]:
+            hf, hg = region4.hf(P), region4.hg(P)
+            self.assertAlmostEqual(region4.p3sat_h(hf) / P, 1.000, places=3, msg='Failed saturated liquid pressure, '+str(P)+' MPa, region 3 (h)!')
+            self.assertAlmostEqual(region4.p3sat_h(hg) / P, 1.000, places=3, msg='Failed saturated vapor pressure, '+str(P)+' MPa, region 3 (h)!')
+            self.assertAlmostEqual(region3.P(region4.vf(P), region4.satT(P)) / P, 1.000, places=3, msg='Failed saturated liquid volume, '+str(P)+' MPa, region 3!')
+            self.assertAlmostEqual(region3.P(region4.vg(P), region4.satT(P)) / P, 1.000, places=3, msg='Failed saturated vapor volume, '+str(P)+' MPa, region 3!')
+            self.assertAlmostEqual(h2o.state_h(P, (hf + hg) / 2).x / 0.5, 1.000, places=9, msg='Failed h2o quality, '+str(P)+' MPa, region 3 (P, h)!')
+            self.assertAlmostEqual(h2o.T_h(P, (hf + hg) / 2) / region4.satT(P), 1.000, places=12, msg='Failed h2o temperature, '+str(P)+' MPa, region 3 (P, h)!')
+
+    def test_ThermodynamicProperty_Region12_hs(self):
+        states = [(region1, 0, 0.001, 0, 9.800980612e-4), (region1, 0, 90, 0, 91.92954727), (region1, 0, 1500, 3.4, 58.68294423),
+                  (region2, 1, 2800, 6.5, 1.371012767), (region2, 1, 2800, 9.5, 1.879743844e-3), (region2, 1, 4100, 9.5, 1.024788997e-1),
+                  (region2, 2, 2800, 6.0, 4.793911442), (region2, 2, 3600, 6.0, 83.95519209), (region2, 2, 3600, 7.0, 7.527161441),
+                  (region2, 3, 2800, 5.1, 94.39202060), (region2, 3, 2800, 5.8, 8.414574124), (region2, 3, 3400, 5.8, 83.76903879)]
+        for i, (module, key, h, s, P) in enumerate(states):
+            if key:
+                self.assertEqual(region2.idRegion_hs(h, s), key, 'Failed subregion identification, state '+str(i+1)+', region 2 (h, s)!')
+            self.assertAlmostEqual(module.P_hs(h, s) / P, 1.000, places=9, msg='Failed backward pressure, state '+str(i+1)+', (h, s)!')
+        self.assertAlmostEqual(region2.bnd2a2b_hs(7) / 3376.437884, 1.000, places=9, msg='Failed 2a-2b boundary, region 2 (h, s)!')
+
+        h = numpy.array([h for module, key, h, s, P in states[3:]])
+        s = numpy.array([s for module, key, h, s, P in states[3:]])
+        for i, P in enumerate(region2.P_hs(h, s)):
+            self.assertAlmostEqual(P / states[i + 3][4], 1.000, places=9, msg='Failed vectorized backward pressure, state '+str(i+4)+', region 2 (h, s)!')
+
+        # h2o identifies the forward states and recovers their pressure and temperature
+        P = numpy.array([3, 80, 3, 0.0035, 0.0035, 30])
+        T = numpy.array([300, 300, 500, 300, 700, 700])
+        h, s = h2o.h(P, T), h2o.s(P, T)
+        self.assertEqual(list(h2o.idRegion_hs(h, s)), [1, 1, 1, 2, 2, 2], 'Failed vectorized region identification, (h, s)!')
+        for i, (Pi, Ti) in enumerate(zip(h2o.P_hs(h, s), h2o.T_hs(h, s))):
+            self.assertEqual(h2o.idRegion_hs(float(h[i]), float(s[i])), h2o.idRegion(float(P[i]), float(T[i])), 'Failed region identification, state '+str(i+1)+', (h, s)!')
+            self.assertAlmostEqual(Pi / P[i], 1.000, places=2, msg='Failed h2o pressure, state '+str(i+1)+', (h, s)!')
+            self.assertAlmostEqual(Ti / T[i], 1.000, places=3, msg='Failed h2o temperature, state '+str(i+1)+', (h, s)!')
+            self.assertAlmostEqual(h2o.P_hs(float(h[i]), float(s[i])) / Pi, 1.000, places=12, msg='Failed h2o scalar pressure, state '+str(i+1)+', (h, s)!')
+        state = h2o.state_hs(3600, 7.0)
+        self.assertEqual(state.region, 2, 'Failed state region, (h, s)!')
+        self.assertAlmostEqual(state.P / 7.527161441, 1.000, places=9, msg='Failed state pressure, (h, s)!')
+
+        # two-phase states are neither region 1 nor 2
+        self.assertEqual(h2o.idRegion_hs(h2o.hf(1) + 0.5 * h2o.hfg(1), h2o.sf(1) + 0.5 * h2o.sfg(1), strict=False), 0, 'Failed two-phase identification, (h, s)!')
+        values, region = h2o.batch_hs(h2o.P_hs, numpy.array([2800, 2000]), numpy.array([6.5, 4.5]))
+        self.assertEqual(list(region), [2, 0], 'Failed batch identification, (h, s)!')
+        self.assertTrue(numpy.isnan(values[1]), 'Failed batch two-phase state, (h, s)!')
+
+    def test_ThermodynamicProperty_Region5_Ph_Ps(self):
+        states = [(0.5, 1500), (30, 1500), (30, 2000), (1e-6, 1073.5), (50, 2273.15)]
+        for i, (P, T) in enumerate(states):
+            h, s = region5.h(P, T), region5.s(P, T)
+            self.assertAlmostEqual(region5.T_h(P, h) / T, 1.000, places=12, msg='Failed inverse temperature, state '+str(i+1)+', region 5 (P, h)!')
+            self.assertAlmostEqual(region5.T_s(P, s) / T, 1.000, places=12, msg='Failed inverse temperature, state '+str(i+1)+', region 5 (P, s)!')
+            self.assertEqual(h2o.idRegion(P, T), 5, 'Failed region identification, state '+str(i+1)+', region 5!')
+            self.assertEqual(h2o.idRegion_h(P, h), 5, 'Failed region identification, state '+str(i+1)+', region 5 (P, h)!')
+            self.assertEqual(h2o.idRegion_s(P, s), 5, 'Failed region identification, state '+str(i+1)+', region 5 (P, s)!')
+            self.assertAlmostEqual(h2o.v_h(P, h) / region5.v(P, T), 1.000, places=12, msg='Failed h2o specific volume, state '+str(i+1)+', region 5 (P, h)!')
+            self.assertAlmostEqual(h2o.h_s(P, s) / h, 1.000, places=12, msg='Failed h2o specific enthalpy, state '+str(i+1)+', region 5 (P, s)!')
+
+        P = numpy.array([P for P, T in states])
+        T = numpy.array([T for P, T in states])
+        h = region5.h(P, T)
+        for i, Ti in enumerate(region5.T_h(P, h)):
+            self.assertAlmostEqual(Ti / T[i], 1.000, places=12, msg='Failed vectorized inverse temperature, state '+str(i+1)+', region 5 (P, h)!')
+        self.assertEqual(list(h2o.idRegion(P, T)), [5] * len(states), 'Failed vectorized region identification, region 5!')
+        self.assertEqual(list(h2o.idRegion_h(P, h)), [5] * len(states), 'Failed vectorized region identification, region 5 (P, h)!')
+
+        # region 5 only reaches 50 MPa, and the 1073.15 K isotherm stays in region 2
+        self.assertEqual(list(h2o.idRegion([60, 30, 30], [1500, 1073.15, 2300], strict=False)), [0, 2, 0], 'Failed region 5 boundaries!')
+        self.assertEqual(h2o.idRegion_h(60, region5.h(50, 1500), strict=False), 0, 'Failed region 5 boundaries (P, h)!')
+        self.assertEqual(h2o.idRegion_h(30, region2.h(30, 1073.15)), 2, 'Failed region 2 boundary (P, h)!')
 
 class test_ThermodynamicDerivative(unittest.TestCase):
     def test_ThermodynamicDerivative_Region1(self):
@@ -27,7 +27,7 @@ setup(
         ],
     keywords = 'water steam properties industrial formulation 97 IAPWS',
     packages=['if97'],
-    install_requirments = [ ],
+    install_requires = ['numpy'],
     entry_points = { },
     include_package_data = True,
     zip_safe = False